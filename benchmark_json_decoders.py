@@ -0,0 +1,155 @@
+# benchmark_json_decoders.py
+# Measures how fast each installed JSON decoder (see pulse_json.py) reads and decodes
+# the Pulse quarter files, in files per second.
+#
+# By default a synthetic Pulse tree (same layout and record shapes as the PhonePe
+# Pulse repository) is generated in a temporary directory; pass --path to time an
+# existing tree instead, e.g.:
+#   python benchmark_json_decoders.py
+#   python benchmark_json_decoders.py --path pulse/data --repeat 5
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from extraction_engine import list_quarter_files, read_quarter_file
+from pulse_json import available_decoders, get_decoder
+
+
+# --- Synthetic Pulse Tree ---
+
+TRANSACTION_TYPES = ['Recharge & bill payments', 'Peer-to-peer payments', 'Merchant payments',
+                     'Financial Services', 'Others']
+BRANDS = ['Xiaomi', 'Samsung', 'Vivo', 'Oppo', 'OnePlus', 'Realme', 'Apple', 'Motorola', 'Lenovo', 'Huawei']
+
+
+def _metric(rng):
+    return {'type': 'TOTAL', 'count': rng.randint(1, 10**8), 'amount': rng.uniform(1, 10**11)}
+
+
+def _district_names(state, count):
+    return [f"{state} district {i}" for i in range(count)]
+
+
+def _synthetic_documents(rng, state):
+    # Tree (under pulse/data) -> document of one quarter file
+    districts = _district_names(state, 20)
+    return {
+        'aggregated/transaction': {'data': {'transactionData': [
+            {'name': name, 'paymentInstruments': [_metric(rng)]} for name in TRANSACTION_TYPES]}},
+        'aggregated/user': {'data': {
+            'aggregated': {'registeredUsers': rng.randint(1, 10**8), 'appOpens': rng.randint(0, 10**9)},
+            'usersByDevice': [{'brand': brand, 'count': rng.randint(1, 10**7), 'percentage': rng.random()}
+                              for brand in BRANDS]}},
+        'aggregated/insurance': {'data': {'transactionData': [
+            {'name': 'Insurance', 'paymentInstruments': [_metric(rng)]}]}},
+        'map/transaction/hover': {'data': {'hoverDataList': [
+            {'name': district, 'metric': [_metric(rng)]} for district in districts]}},
+        'map/user/hover': {'data': {'hoverData': {
+            district: {'registeredUsers': rng.randint(1, 10**7), 'appOpens': rng.randint(0, 10**8)}
+            for district in districts}}},
+        'map/insurance/hover': {'data': {'hoverDataList': [
+            {'name': district, 'metric': [_metric(rng)]} for district in districts]}},
+        'top/transaction': {'data': {
+            'districts': [{'entityName': district, 'metric': _metric(rng)} for district in districts[:10]],
+            'pincodes': [{'entityName': str(rng.randint(110000, 859999)), 'metric': _metric(rng)} for _ in range(10)]}},
+        'top/user': {'data': {
+            'districts': [{'name': district, 'registeredUsers': rng.randint(1, 10**7)} for district in districts[:10]],
+            'pincodes': [{'name': str(rng.randint(110000, 859999)), 'registeredUsers': rng.randint(1, 10**6)}
+                         for _ in range(10)]}},
+        'top/insurance': {'data': {
+            'pincodes': [{'entityName': str(rng.randint(110000, 859999)), 'metric': _metric(rng)} for _ in range(10)]}},
+    }
+
+
+def write_synthetic_tree(root, states=36, years=7, seed=0):
+    """Writes a synthetic Pulse tree under root. Returns the 'state' directories (one per dataset tree)."""
+    rng = random.Random(seed)
+    state_dirs = set()
+    for state_index in range(states):
+        state = f"state-{state_index:02d}"
+        for year in range(2018, 2018 + years):
+            for quarter in range(1, 5):
+                for tree, document in _synthetic_documents(rng, state).items():
+                    state_dir = os.path.join(root, tree, 'country', 'india', 'state')
+                    year_dir = os.path.join(state_dir, state, str(year))
+                    os.makedirs(year_dir, exist_ok=True)
+                    with open(os.path.join(year_dir, f"{quarter}.json"), 'w', encoding='utf-8') as f:
+                        json.dump({'success': True, 'code': 'SUCCESS', **document}, f)
+                    state_dirs.add(state_dir)
+    return sorted(state_dirs)
+
+
+def find_state_dirs(data_root):
+    """Every '.../country/india/state' directory under a Pulse data directory."""
+    return sorted(dirpath for dirpath, _, _ in os.walk(data_root)
+                  if dirpath.replace(os.sep, '/').endswith('country/india/state'))
+
+
+# --- Benchmark ---
+
+def time_decoder(quarter_paths, decode, repeat):
+    """Best wall time (seconds) over repeat passes of reading and decoding every file."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for quarter_path in quarter_paths:
+            read_quarter_file(quarter_path, decode=decode)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(quarter_paths, repeat=3):
+    """Prints files/second and MB/second for each installed decoder, and the speedup over stdlib json."""
+    total_mb = sum(os.path.getsize(path) for path in quarter_paths) / 2**20
+    print(f"Benchmarking {len(quarter_paths):,} files ({total_mb:.1f} MB), best of {repeat} passes")
+
+    reference = None
+    results = []
+    for name in available_decoders():
+        _, decode = get_decoder(name)
+        # Every decoder must give the same documents as the standard library
+        sample = [read_quarter_file(path, decode=decode)[1] for path in quarter_paths[:200]]
+        if reference is None:
+            reference = [read_quarter_file(path, decode=get_decoder('json')[1])[1] for path in quarter_paths[:200]]
+        if sample != reference:
+            print(f"Warning: {name} decoded some files differently from json")
+        results.append((name, time_decoder(quarter_paths, decode, repeat)))
+
+    json_seconds = dict(results)['json']
+    print(f"{'decoder':<10} {'seconds':>8} {'files/s':>10} {'MB/s':>8} {'speedup':>8}")
+    for name, seconds in results:
+        print(f"{name:<10} {seconds:>8.3f} {len(quarter_paths) / seconds:>10,.0f} {total_mb / seconds:>8.1f} "
+              f"{json_seconds / seconds:>7.2f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Files/second of each installed JSON decoder on a Pulse tree.")
+    parser.add_argument('--path', help="Existing Pulse data directory (e.g. pulse/data). Default: a synthetic tree.")
+    parser.add_argument('--states', type=int, default=36, help="States in the synthetic tree (default 36)")
+    parser.add_argument('--years', type=int, default=7, help="Years in the synthetic tree (default 7)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes per decoder; the best is reported (default 3)")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    try:
+        if args.path:
+            state_dirs = find_state_dirs(args.path)
+        else:
+            tmp_dir = tempfile.mkdtemp(prefix='pulse_benchmark_')
+            print(f"Writing a synthetic Pulse tree ({args.states} states x {args.years} years) to {tmp_dir}...")
+            state_dirs = write_synthetic_tree(tmp_dir, args.states, args.years)
+        quarter_paths = [quarter_path for state_dir in state_dirs
+                         for _, _, _, quarter_path in list_quarter_files(state_dir)]
+        if not quarter_paths:
+            print("No quarter files found.")
+        else:
+            run_benchmark(quarter_paths, args.repeat)
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,79 @@
+# benchmark_startup.py
+# Measures the cold-start import cost of the dashboard: each scenario is imported in a
+# fresh Python process (after streamlit, which the server has loaded anyway), so the
+# times are what a newly started replica pays before it can render a page.
+#
+#   python benchmark_startup.py
+#   python benchmark_startup.py --repeat 10
+#
+# The in-app timings of a running server (first render included) are printed to its
+# log, see startup_report.py.
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+# Libraries the pages import on first use (see startup_report.lazy_import)
+LAZY_LIBRARIES = ['matplotlib.figure', 'plotly.express', 'seaborn', 'mysql.connector']
+
+PAGE_MODULES = ['page_home', 'page_transaction_analysis', 'page_transaction_dynamics',
+                'page_device_analysis', 'page_insurance_analysis', 'page_market_expansion']
+
+# Scenario name -> modules imported together in one fresh process
+SCENARIOS = {
+    'dashboard_core': ['dashboard_core'],
+    'Home page (module only)': ['dashboard_core', 'page_home'],
+    'Home page (with its chart libraries)': ['dashboard_core', 'page_home', 'matplotlib.figure', 'plotly.express'],
+    **{f"library {name}": [name] for name in LAZY_LIBRARIES},
+    # What a single-script dashboard imported on every cold start
+    'everything (eager)': ['dashboard_core'] + PAGE_MODULES + LAZY_LIBRARIES,
+}
+
+# Runs in the child process: prints the seconds taken to import the modules given as arguments
+CHILD_SCRIPT = """
+import importlib, sys, time
+import streamlit
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(modules, repeat):
+    """Best time (seconds) over repeat fresh processes to import modules, or None if the import failed."""
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', CHILD_SCRIPT, *modules], cwd=repo_dir,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"Warning: importing {', '.join(modules)} failed: {result.stderr.strip().splitlines()[-1:]}")
+            return None
+        seconds = float(result.stdout.strip().splitlines()[-1])
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def run_benchmark(repeat=5):
+    """Prints the cold import time of every scenario, and of the eager import set relative to the Home page's."""
+    print(f"Cold import times (after streamlit), best of {repeat} fresh processes")
+    results = {}
+    for name, modules in SCENARIOS.items():
+        results[name] = time_import(modules, repeat)
+        shown = f"{results[name] * 1000:>8.0f} ms" if results[name] is not None else f"{'failed':>11}"
+        print(f"{name:<40} {shown}")
+
+    eager, home = results['everything (eager)'], results['Home page (with its chart libraries)']
+    if eager and home:
+        print(f"Home page cold start imports {home / eager:.0%} of the eager import time "
+              f"({(eager - home) * 1000:.0f} ms saved)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Cold-start import cost of the dashboard modules and libraries.")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh processes per scenario; the best is reported (default 5)")
+    args = parser.parse_args()
+    run_benchmark(args.repeat)
@@ -0,0 +1,181 @@
+# bulk_loader.py
+# Fast paths for pushing DataFrames into MySQL.
+#
+# Methods (selectable per call):
+#   'infile'      - CSV chunks + LOAD DATA LOCAL INFILE (needs local_infile=ON on the server)
+#   'executemany' - chunked multi-row INSERTs through the DB-API cursor
+#   'to_sql'      - plain DataFrame.to_sql (the old, slow path)
+#   'auto'        - 'infile' when the server allows it, 'executemany' otherwise
+
+import csv
+import os
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine, inspect
+# Import necessary credentials including the encoded password
+from credentials import DB_USER, ENCODED_PASSWORD, DB_HOST, DB_PORT, DB_DATABASE
+
+
+LOAD_METHODS = ('auto', 'infile', 'executemany', 'to_sql')
+
+# Rows sent per LOAD DATA / executemany call
+BULK_CHUNK_ROWS = 50000
+
+
+def _quote_name(name):
+    return f"`{name}`"
+
+
+# --- Shared Engine ---
+
+_engine = None
+
+def get_engine():
+    """Returns the SQLAlchemy engine shared by all loads in this process (created on first use)."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            f"mysql+mysqlconnector://{DB_USER}:{ENCODED_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_DATABASE}",
+            connect_args={'allow_local_infile': True}, # Needed on the client side for LOAD DATA LOCAL INFILE
+            pool_pre_ping=True
+        )
+    return _engine
+
+
+def dispose_engine():
+    """Closes all pooled connections of the shared engine."""
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
+def local_infile_enabled(conn):
+    """True if the server accepts LOAD DATA LOCAL INFILE."""
+    try:
+        row = conn.exec_driver_sql("SHOW GLOBAL VARIABLES LIKE 'local_infile'").fetchone()
+    except Exception:
+        return False
+    return bool(row) and str(row[1]).upper() in ('ON', '1')
+
+
+# --- Shadow Tables ---
+
+def staging_table_name(table_name):
+    """Name of the shadow table a reload is written into before it replaces the live table."""
+    return f"{table_name}__staging"
+
+
+def swap_in_staging_table(conn, table_name):
+    """
+    Atomically replaces the live table with its fully loaded staging table.
+    A single multi-table RENAME TABLE means readers see either the old or the new table, never a missing one.
+    """
+    staging_table = staging_table_name(table_name)
+    old_table = f"{table_name}__old"
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {_quote_name(old_table)}")
+    if inspect(conn).has_table(table_name):
+        conn.exec_driver_sql(
+            f"RENAME TABLE {_quote_name(table_name)} TO {_quote_name(old_table)}, "
+            f"{_quote_name(staging_table)} TO {_quote_name(table_name)}"
+        )
+        conn.exec_driver_sql(f"DROP TABLE {_quote_name(old_table)}")
+    else:
+        conn.exec_driver_sql(f"RENAME TABLE {_quote_name(staging_table)} TO {_quote_name(table_name)}")
+
+
+# --- Load Paths ---
+
+def _iter_chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _has_backslash(column):
+    # A categorical column is checked once per category (its map() would give a categorical, without any())
+    values = column.cat.categories if isinstance(column.dtype, pd.CategoricalDtype) else column
+    return any(isinstance(value, str) and '\\' in value for value in values)
+
+
+def load_infile(conn, df, table_name, chunk_rows=BULK_CHUNK_ROWS):
+    """
+    Streams df into an existing table with LOAD DATA LOCAL INFILE.
+    mysql-connector can only send LOCAL INFILE data from a path, so each CSV chunk is spooled to a temp file.
+    """
+    column_list = ', '.join(_quote_name(col) for col in df.columns)
+    # Backslash is MySQL's escape character, so literal backslashes must be doubled (rare in Pulse data)
+    escape = lambda value: value.replace('\\', '\\\\') if isinstance(value, str) else value
+    escaped_columns = [col for col in df.columns
+                       if not pd.api.types.is_numeric_dtype(df[col]) # text and categorical columns
+                       and _has_backslash(df[col])]
+    cursor = conn.connection.cursor()
+    try:
+        for chunk in _iter_chunks(df, chunk_rows):
+            if escaped_columns:
+                chunk = chunk.copy()
+                for col in escaped_columns:
+                    chunk[col] = chunk[col].map(escape)
+            with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8', newline='') as tmp:
+                chunk.to_csv(tmp, index=False, header=False, na_rep='\\N', quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+            try:
+                cursor.execute(
+                    f"LOAD DATA LOCAL INFILE '{tmp.name.replace(os.sep, '/')}' "
+                    f"INTO TABLE {_quote_name(table_name)} CHARACTER SET utf8mb4 "
+                    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+                    f"LINES TERMINATED BY '\\n' ({column_list})"
+                )
+            finally:
+                os.remove(tmp.name)
+    finally:
+        cursor.close()
+
+
+def load_executemany(conn, df, table_name, chunk_rows=BULK_CHUNK_ROWS):
+    """Inserts df into an existing table with chunked executemany (sent as multi-row INSERTs by mysql-connector)."""
+    column_list = ', '.join(_quote_name(col) for col in df.columns)
+    placeholders = ', '.join(['%s'] * len(df.columns))
+    sql = f"INSERT INTO {_quote_name(table_name)} ({column_list}) VALUES ({placeholders})"
+    cursor = conn.connection.cursor()
+    try:
+        for chunk in _iter_chunks(df, chunk_rows):
+            # Object dtype gives plain Python values (the driver can't bind numpy scalars); NaN -> NULL
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            cursor.executemany(sql, list(chunk.itertuples(index=False, name=None)))
+    finally:
+        cursor.close()
+
+
+def bulk_append(conn, df, table_name, method='auto', chunk_rows=BULK_CHUNK_ROWS):
+    """
+    Appends df to an existing table on an open SQLAlchemy connection, using the given load method.
+    Prints the rows/second achieved and returns the method actually used.
+    """
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Unknown load method '{method}'. Expected one of {LOAD_METHODS}.")
+    if df.empty:
+        return method
+
+    if method == 'auto':
+        method = 'infile' if local_infile_enabled(conn) else 'executemany'
+
+    start_time = time.perf_counter()
+    if method == 'infile':
+        # Only the first chunk may fall back: once rows are in, a later failure must roll the transaction back
+        try:
+            load_infile(conn, df.iloc[:chunk_rows], table_name, chunk_rows)
+        except Exception as e:
+            print(f"LOAD DATA LOCAL INFILE failed for {table_name} ({e}). Falling back to executemany.")
+            method = 'executemany'
+            load_executemany(conn, df, table_name, chunk_rows)
+        else:
+            load_infile(conn, df.iloc[chunk_rows:], table_name, chunk_rows)
+    elif method == 'executemany':
+        load_executemany(conn, df, table_name, chunk_rows)
+    else:
+        df.to_sql(name=table_name, con=conn, if_exists='append', index=False)
+
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    print(f"Loaded {len(df):,} rows into {table_name} via {method} in {elapsed:.2f}s ({len(df) / elapsed:,.0f} rows/s)")
+    return method
@@ -0,0 +1,52 @@
+# chart_render.py
+# Matplotlib charts for the dashboard, rendered to image bytes without pyplot.
+#
+# pyplot keeps every figure made with plt.subplots / plt.figure in a global registry
+# until plt.close is called, and that registry is shared by every session of the
+# Streamlit server. Figures here are plain matplotlib.figure.Figure objects: they are
+# never registered, only touched by the thread that draws them, rendered to PNG/SVG
+# bytes and cleared straight away. No Streamlit here (dashboard_core.py caches the bytes).
+
+import io
+
+# matplotlib is imported when the first chart is drawn, not when the dashboard starts (see startup_report.py)
+from startup_report import lazy_import
+
+matplotlib_figure = lazy_import('matplotlib.figure')
+
+
+# Same resolution st.pyplot renders at
+DEFAULT_DPI = 200
+
+
+def new_figure(figsize=(10, 6)):
+    """A new (unregistered) figure with one axes. Returns (fig, ax)."""
+    fig = matplotlib_figure.Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def figure_bytes(fig, image_format='png', dpi=DEFAULT_DPI):
+    """The figure rendered as PNG or SVG bytes, cropped to its contents like st.pyplot does."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=image_format, dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def render_figure(draw, data, figsize=(10, 6), image_format='png', dpi=DEFAULT_DPI):
+    """
+    Calls draw(fig, ax, data) on a new figure and returns the rendered bytes.
+    The figure is cleared afterwards (also when draw fails), so nothing it drew outlives the call.
+    """
+    fig, ax = new_figure(figsize)
+    try:
+        draw(fig, ax, data)
+        return figure_bytes(fig, image_format, dpi)
+    finally:
+        fig.clear()
+
+
+def rotate_xticklabels(ax, rotation=45, ha='right'):
+    """Rotates the x tick labels of ax (what plt.xticks(rotation=..., ha=...) does, for one axes)."""
+    for label in ax.get_xticklabels():
+        label.set_rotation(rotation)
+        label.set_horizontalalignment(ha)
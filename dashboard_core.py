@@ -0,0 +1,733 @@
+# dashboard_core.py
+# Shared code of the dashboard pages (page_*.py): database connections (MySQL pool or
+# the embedded DuckDB backend), the registered SQL queries, the cached loaders, chart
+# rendering and the state geo index. Imported once per server process by app.py.
+
+import streamlit as st
+import pandas as pd
+import time # Waiting for a free pooled connection
+from contextlib import contextmanager
+import os # Import os module to check file existence
+import re # Finding the tables each query reads
+from urllib.parse import quote_plus # Import quote_plus for password encoding
+# In-memory fact tables for views that only change the year/quarter/state selection
+from fact_store import build_fact_store
+# Chunked result fetch with compact dtypes
+from result_stream import read_mysql_cursor, read_duckdb_result
+# Simplified, disk-cached state geometry for the choropleths
+from geojson_cache import load_simplified_geojson
+# Matplotlib charts drawn on unregistered figures and rendered to PNG bytes
+from chart_render import render_figure
+# States left off the map views (canonical names are resolved at load time, see pulse_states.py)
+from pulse_states import MAP_EXCLUDED_STATES
+# mysql.connector is imported on the first database connection, so the duckdb backend never loads it
+from startup_report import lazy_import
+
+mysql_connector = lazy_import('mysql.connector') # for connecting MYSQL
+mysql_pooling = lazy_import('mysql.connector.pooling') # Connection pool shared by all sessions
+
+# Import credentials from the separate file
+try:
+    from credentials import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_DATABASE#, ENCODED_PASSWORD # ENCODED_PASSWORD is not used by mysql.connector
+except ImportError:
+    st.error("Error: credentials.py not found.")
+    st.stop() # App stops if credentials are not available
+
+# --- Database Configuration ---
+# Number of pooled MySQL connections shared by all sessions of this server process.
+# Override with the PHONEPE_DB_POOL_SIZE environment variable (mysql.connector allows at most 32).
+DB_POOL_SIZE = int(os.environ.get('PHONEPE_DB_POOL_SIZE', 5))
+# Seconds to wait for a free pooled connection before giving up
+DB_POOL_TIMEOUT = float(os.environ.get('PHONEPE_DB_POOL_TIMEOUT', 10))
+
+@st.cache_resource # One pool per server process, shared by every session and rerun
+def get_connection_pool():
+    # Creating the connection pool using credentials imported from credentials.py.
+    # Errors are raised (not returned) so a failed attempt is not cached and the next call retries.
+    return mysql_pooling.MySQLConnectionPool(
+        pool_name="phonepe_pool",
+        pool_size=DB_POOL_SIZE,
+        pool_reset_session=True, # Clears session state when a connection goes back to the pool
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_DATABASE,
+        port=DB_PORT
+    )
+
+def get_db_connection():
+    # Borrowing a connection from the pool. conn.close() returns it to the pool instead of closing it.
+    try:
+        pool = get_connection_pool()
+        deadline = time.monotonic() + DB_POOL_TIMEOUT
+        while True:
+            try:
+                conn = pool.get_connection()
+                break
+            except mysql_connector.errors.PoolError:
+                # Every pooled connection is in use by other sessions - wait for one to come back
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+        # Health check: reconnects a pooled connection the server has dropped (e.g. after wait_timeout)
+        conn.ping(reconnect=True, attempts=2, delay=0)
+        return conn
+    except mysql_connector.Error as e:
+        st.error(f"Error connecting to the MySQL database: {e}")
+        st.error(f"Please check your credentials in credentials.py and ensure the MySQL server is running.")
+        return None
+
+# --- Query Backend ---
+# 'mysql' (default): the MySQL database loaded by data_extraction.py.
+# 'duckdb': an embedded, in-process DuckDB database over the Parquet snapshots written by data_extraction.py
+#           (no database server needed, e.g. on a laptop or in CI). Set with the PHONEPE_QUERY_BACKEND environment variable.
+QUERY_BACKEND = os.environ.get('PHONEPE_QUERY_BACKEND', 'mysql').lower()
+
+@st.cache_resource(max_entries=1) # One embedded database per snapshot version, shared by every session
+def get_snapshot_database(snapshot_version):
+    from duckdb_backend import open_snapshot_database # Only imported when the duckdb backend is used
+    return open_snapshot_database()
+
+def get_duckdb_connection():
+    # Cursor (a per-thread handle) on the embedded database. A new snapshot builds a new database
+    # (noticed within GENERATION_CHECK_SECONDS, see load_snapshot_version).
+    try:
+        return get_snapshot_database(load_snapshot_version()).cursor()
+    except Exception as e:
+        st.error(f"Error opening the embedded DuckDB database: {e}")
+        st.error("Please check that duckdb is installed and data_extraction.py has written the Parquet snapshots.")
+        return None
+
+@contextmanager
+def db_connection():
+    """Borrows a connection for the configured backend (None if unavailable) and always gives it back, even if the query fails."""
+    conn = get_duckdb_connection() if QUERY_BACKEND == 'duckdb' else get_db_connection()
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            conn.close()
+
+# --- SQL Queries ---
+# The tables store surrogate keys (state_id, district_id, brand_id, transaction_type_id, see pulse_dimensions.py);
+# the queries join the dimension tables (dim_state, dim_district, ...) for the names shown in the dashboard.
+
+# Query for overall transaction trends by type
+SQL_QUERY_AGGREGATED_TRANSACTION = """
+SELECT
+    s.year,
+    s.quarter,
+    t.transactiontype,
+    s.total_transaction_volume,
+    s.total_transaction_value
+FROM
+    summary_transaction_by_period_type s -- Pre-aggregated by data_extraction.py (see summary_tables.py)
+JOIN
+    dim_transaction_type t ON t.transaction_type_id = s.transaction_type_id
+ORDER BY
+    s.year,
+    s.quarter,
+    t.transactiontype;
+"""
+
+# Query for the per-state volume and value totals of a specific period.
+# Highest/lowest states for both metrics are ranked from this one result (see fact_store.rank_extremes).
+SQL_QUERY_STATE_TOTALS_BY_PERIOD = """
+SELECT
+    d.state,
+    s.total_volume,
+    s.total_value
+FROM
+    summary_transaction_by_state_period s -- Per-state totals for each quarter
+JOIN
+    dim_state d ON d.state_id = s.state_id
+WHERE
+    s.year = %s
+    AND s.quarter = %s;
+"""
+
+# Query for district vs state comparison: every district of a state for one period, joined once to the
+# state's totals (pre-aggregated per state, year and quarter), with each district's share of the state
+SQL_QUERY_DISTRICT_VS_STATE = """
+SELECT
+    ds.state,
+    dd.district,
+    mt.transactioncount AS district_total_volume,
+    mt.transactionamount AS district_total_value,
+    st.total_volume AS state_total_volume,
+    st.total_value AS state_total_value,
+    mt.transactioncount / NULLIF(st.total_volume, 0) AS volume_share,
+    mt.transactionamount / NULLIF(st.total_value, 0) AS value_share
+FROM
+    map_transactions mt
+JOIN
+    summary_transaction_by_state_period st ON st.state_id = mt.state_id
+                                           AND st.year = mt.year
+                                           AND st.quarter = mt.quarter
+JOIN
+    dim_state ds ON ds.state_id = mt.state_id
+JOIN
+    dim_district dd ON dd.district_id = mt.district_id
+WHERE
+    mt.year = %s
+    AND mt.quarter = %s
+    AND ds.state = %s
+ORDER BY
+    district_total_volume DESC;
+"""
+
+# Query for top 10 states by registered users
+SQL_QUERY_TOP_10_USERS = """
+SELECT
+    d.state,
+    s.total_registered_users
+FROM
+    summary_users_by_state s
+JOIN
+    dim_state d ON d.state_id = s.state_id
+ORDER BY
+    s.total_registered_users DESC
+LIMIT 10;
+"""
+
+# Query for variations in transaction behavior across states (aggregated across all years/quarters)
+SQL_QUERY_STATE_VARIATIONS = """
+SELECT
+    d.state_id,
+    d.state_name AS state, -- Canonical name (as in the GeoJSON)
+    s.sumOfTransCount,
+    s.sumOfTransAmount
+FROM
+    summary_map_transaction_by_state s -- map_transactions totals per state
+JOIN
+    dim_state d ON d.state_id = s.state_id
+ORDER BY
+    d.state_id;
+"""
+
+# State dimension: key, slug and canonical name of every state (built at load time, see pulse_dimensions.py)
+SQL_QUERY_DIM_STATE = """
+SELECT
+    state_id,
+    state,
+    state_name
+FROM
+    dim_state
+ORDER BY
+    state_id;
+"""
+
+# Query to get every dropdown value (years, quarters, states, transaction types, districts) in one round trip.
+# summary_dimension_values is written by data_extraction.py (see summary_tables.py).
+SQL_QUERY_DIMENSION_VALUES = """
+SELECT
+    dimension,
+    state,
+    value
+FROM
+    summary_dimension_values;
+"""
+
+# Queries for the fact tables held in memory by the fact store (see fact_store.py), keys only
+SQL_QUERY_FACT_TRANSACTIONS = """
+SELECT state_id, year, quarter, transactioncount, transactionamount FROM aggregated_transaction;
+"""
+SQL_QUERY_FACT_DISTRICT_TRANSACTIONS = """
+SELECT state_id, year, quarter, district_id, transactioncount, transactionamount FROM map_transactions;
+"""
+SQL_QUERY_FACT_INSURANCE = """
+SELECT state_id, year, quarter, insurancecount FROM aggregated_insurance;
+"""
+# District dimension, for the district names of the fact store
+SQL_QUERY_DIM_DISTRICT = """
+SELECT district_id, state_id, district FROM dim_district;
+"""
+
+# Query for the load generation of every table (bumped by data_extraction.py each time a table is reloaded)
+SQL_QUERY_LOAD_GENERATIONS = """
+SELECT
+    table_name,
+    generation
+FROM
+    etl_load_generations;
+"""
+
+# SQL Query for Growth Potential Analysis (from the user's selection)
+SQL_QUERY_GROWTH_POTENTIAL = """
+SELECT
+    a.year,
+    a.quarter,
+    d.state,
+    t.transactiontype,
+    a.transactioncount AS total_volume, -- (state_id, year, quarter, transaction_type_id) is the primary key, so no GROUP BY is needed
+    a.transactionamount AS total_value
+FROM
+    aggregated_transaction a
+JOIN
+    dim_state d ON d.state_id = a.state_id
+JOIN
+    dim_transaction_type t ON t.transaction_type_id = a.transaction_type_id
+ORDER BY
+    d.state,
+    t.transactiontype,
+    a.year,
+    a.quarter;
+"""
+
+# SQL Query for Registered Users by State and Brand
+SQL_QUERY_REGISTERED_USERS_BY_BRAND = """
+SELECT
+    d.state,
+    b.brand,
+    SUM(a.registeredusers) AS total_registered_users
+FROM
+    aggregated_user a -- Assuming 'aggregated_user' table contains state_id, brand_id, and registeredusers
+JOIN
+    dim_state d ON d.state_id = a.state_id
+JOIN
+    dim_brand b ON b.brand_id = a.brand_id
+GROUP BY
+    d.state, b.brand
+ORDER BY
+    d.state, total_registered_users DESC;
+"""
+
+# SQL Query for Total Registered Users by Brand (for new bar chart)
+SQL_QUERY_TOTAL_REGISTERED_USERS_BY_BRAND = """
+SELECT
+    b.brand,
+    s.total_registered_users
+FROM
+    summary_users_by_brand s
+JOIN
+    dim_brand b ON b.brand_id = s.brand_id
+ORDER BY
+    s.total_registered_users DESC;
+"""
+
+# SQL Query for PIN codes having the highest insurance transaction (using top_insurance_pincode)
+SQL_QUERY_TOP_INSURANCE_PINCODE = """
+SELECT
+    pincode,
+    SUM(InsuranceCount) AS total_insurance_volume, -- Using column name from provided schema
+    SUM(InsuranceAmount) AS total_insurance_value -- Using column name from provided schema
+FROM
+    top_insurance_pincode -- Using top_insurance_pincode table from schema
+GROUP BY
+    pincode
+ORDER BY
+    total_insurance_volume DESC;
+"""
+#states recorded the highest number of insurance transactions in the selected year-quarter
+SQL_QUERY_TOP_INSURANCE_STATES_BY_YEAR_QUARTER="""
+SELECT
+    d.state,
+    SUM(a.Insurancecount) AS total_insurance_transactions
+FROM
+    aggregated_insurance a
+JOIN
+    dim_state d ON d.state_id = a.state_id
+WHERE
+    a.year = %s
+    AND a.quarter = %s
+GROUP BY
+    d.state
+ORDER BY
+    total_insurance_transactions DESC;
+"""
+
+
+#states where insurance transactions 
+
+SQL_QUERY_YEARLY_INSURANCE_COUNT_BY_STATE = """
+SELECT
+    d.state,
+    s.year,
+    s.total_year_volume
+FROM
+    summary_insurance_by_state_year s
+JOIN
+    dim_state d ON d.state_id = s.state_id
+ORDER BY
+    d.state, s.year;
+"""
+# SQL Query for Top 10 States by Quarterly Transaction Volume
+SQL_QUERY_TOP_10_STATES_QUARTERLY_VOLUME = """
+SELECT
+    d.state,
+    s.year,
+    s.quarter,
+    s.total_volume AS quarterly_transaction_volume -- Transaction count for each state, year, and quarter
+FROM
+    summary_transaction_by_state_period s
+JOIN
+    dim_state d ON d.state_id = s.state_id
+ORDER BY
+    quarterly_transaction_volume desc
+    limit 30;
+"""
+SQL_QUERY_LOWEST_BRANDS = """
+select b.brand, s.total_registered_users as TotalUsers
+from summary_users_by_brand s
+join dim_brand b on b.brand_id = s.brand_id
+order by TotalUsers asc
+limit 10;
+"""
+# App open rate of every state; the highest/lowest 5 are picked in-process with rank_extremes
+SQL_QUERY_APP_OPEN_RATES = """
+SELECT
+    d.state,
+    SUM(e.registered_users) AS total_registered_users,
+    SUM(e.app_opens) AS total_app_opens,
+    SUM(e.app_opens) / NULLIF(SUM(e.registered_users), 0) AS app_open_rate_per_user
+FROM
+    summary_state_engagement e -- Engagement metrics per state and quarter, built by data_extraction.py
+JOIN
+    dim_state d ON d.state_id = e.state_id
+GROUP BY
+    d.state
+HAVING
+    SUM(e.registered_users) > 0;
+"""
+# Transaction-to-user ratio of every state; the highest/lowest 5 are picked in-process with rank_extremes
+SQL_QUERY_USER_RATIOS = """
+SELECT
+    d.state, -- State name
+    SUM(e.registered_users) AS total_registered_users, -- Total registered users for the state
+    SUM(e.transaction_count) AS total_transaction_count, -- Total transaction count for the state
+    SUM(e.transaction_count) / NULLIF(SUM(e.registered_users), 0) AS transaction_to_user_ratio
+FROM
+    summary_state_engagement e -- One row per state and quarter, so nothing is counted twice
+JOIN
+    dim_state d ON d.state_id = e.state_id
+WHERE
+    e.transaction_count IS NOT NULL -- Ensure transaction data is present
+GROUP BY
+    d.state -- Group by state to aggregate data for each state
+HAVING
+    SUM(e.registered_users) > 0;
+"""
+
+# --- Query Registry ---
+# Every dashboard query by id. Values for the %s placeholders are passed as bound parameters (escaped by the
+# driver, never formatted into the SQL text by the dashboard), in the order they appear. Repeated calls are
+# answered from the query cache (keyed on query id and parameters), not re-sent to the database.
+QUERIES = {
+    'aggregated_transaction': SQL_QUERY_AGGREGATED_TRANSACTION,
+    'state_totals_by_period': SQL_QUERY_STATE_TOTALS_BY_PERIOD, # (year, quarter)
+    'district_vs_state': SQL_QUERY_DISTRICT_VS_STATE,           # (year, quarter, state)
+    'top_10_users': SQL_QUERY_TOP_10_USERS,
+    'state_variations': SQL_QUERY_STATE_VARIATIONS,
+    'growth_potential': SQL_QUERY_GROWTH_POTENTIAL,
+    'registered_users_by_brand': SQL_QUERY_REGISTERED_USERS_BY_BRAND,
+    'total_registered_users_by_brand': SQL_QUERY_TOTAL_REGISTERED_USERS_BY_BRAND,
+    'top_insurance_pincode': SQL_QUERY_TOP_INSURANCE_PINCODE,
+    'top_insurance_states_by_year_quarter': SQL_QUERY_TOP_INSURANCE_STATES_BY_YEAR_QUARTER, # (year, quarter)
+    'yearly_insurance_count_by_state': SQL_QUERY_YEARLY_INSURANCE_COUNT_BY_STATE,
+    'top_10_states_quarterly_volume': SQL_QUERY_TOP_10_STATES_QUARTERLY_VOLUME,
+    'lowest_brands': SQL_QUERY_LOWEST_BRANDS,
+    'app_open_rates': SQL_QUERY_APP_OPEN_RATES,
+    'user_ratios': SQL_QUERY_USER_RATIOS,
+    'dimension_values': SQL_QUERY_DIMENSION_VALUES,
+    'dim_state': SQL_QUERY_DIM_STATE,
+    'dim_district': SQL_QUERY_DIM_DISTRICT,
+    'load_generations': SQL_QUERY_LOAD_GENERATIONS,
+    'fact_transactions': SQL_QUERY_FACT_TRANSACTIONS,
+    'fact_district_transactions': SQL_QUERY_FACT_DISTRICT_TRANSACTIONS,
+    'fact_insurance': SQL_QUERY_FACT_INSURANCE,
+}
+
+def query_tables(query_id):
+    """Tables a registered query reads, taken from its FROM/JOIN clauses (comments are ignored)."""
+    sql = re.sub(r'--[^\n]*', '', QUERIES[query_id])
+    return tuple(sorted(set(re.findall(r'\b(?:FROM|JOIN)\s+`?(\w+)', sql, re.IGNORECASE))))
+
+# query id -> tables it depends on, used to key the query cache on those tables' load generations
+QUERY_TABLES = {query_id: query_tables(query_id) for query_id in QUERIES}
+
+def execute_query(conn, query_id, params=()):
+    """
+    Runs a registered query with the given bound parameters. Returns a DataFrame.
+    Rows are streamed in chunks and stored with compact dtypes (see result_stream.py).
+    """
+    sql = QUERIES[query_id]
+    if QUERY_BACKEND == 'duckdb':
+        # DuckDB binds parameters to ? placeholders
+        return read_duckdb_result(conn.execute(sql.replace('%s', '?'), list(params)))
+    # Plain (not server-prepared) cursor: one round trip per query. A prepared statement would be deallocated
+    # when the connection goes back to the pool (pool_reset_session), so it could never be reused.
+    # Unbuffered: rows stay on the server until fetchmany() asks for the next chunk
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, tuple(params))
+        return read_mysql_cursor(cursor)
+    finally:
+        cursor.close()
+
+
+# --- GeoJSON Data for India States ---
+# Using a local file path for the GeoJSON data
+INDIA_STATES_GEOJSON_PATH = r"C:\Users\abhij\OneDrive\Documents\Anu_Guvi\Project_1\PhonePe\states_india.geojson" # Use raw string for path
+# Property holding the state name in the GeoJSON features (the only property the maps need)
+GEOJSON_STATE_KEY = 'st_nm'
+# Simplification tolerance in degrees (0.005 is about 500 m) and decimals kept per coordinate (3 is about 100 m).
+# Override with the PHONEPE_GEOJSON_TOLERANCE / PHONEPE_GEOJSON_PRECISION environment variables.
+GEOJSON_TOLERANCE = float(os.environ.get('PHONEPE_GEOJSON_TOLERANCE', 0.005))
+GEOJSON_PRECISION = int(os.environ.get('PHONEPE_GEOJSON_PRECISION', 3))
+
+def load_geojson(filepath):
+    """
+    Loading the simplified GeoJSON data (built once and cached on disk, see geojson_cache.py) for a local file path.
+    Returns None if it could not be loaded; that is not cached, so the next rerun tries again.
+    """
+    if not os.path.exists(filepath):
+        st.error(f"GeoJSON file not found at: {filepath}")
+        return None
+    try:
+        return read_geojson(filepath)
+    except Exception as e:
+        st.error(f"Error loading GeoJSON data from {filepath}: {e}")
+        return None
+
+@st.cache_data # provides cached result and do not re-reads the file every time. Errors are raised, so they are not cached.
+def read_geojson(filepath):
+    return load_simplified_geojson(filepath, GEOJSON_TOLERANCE, GEOJSON_PRECISION, keep_properties=(GEOJSON_STATE_KEY,))
+
+# --- Cache Invalidation ---
+# Seconds between checks for a new ETL load. Override with the PHONEPE_GENERATION_CHECK_SECONDS environment variable.
+GENERATION_CHECK_SECONDS = int(os.environ.get('PHONEPE_GENERATION_CHECK_SECONDS', 30))
+# Cached query results kept per function (results of older load generations are evicted first)
+QUERY_CACHE_ENTRIES = 512
+
+@st.cache_data(ttl=GENERATION_CHECK_SECONDS, show_spinner=False)
+def load_load_generations():
+    """Table name -> load generation written by data_extraction.py. Empty if the ETL has not recorded any yet."""
+    with db_connection() as conn:
+        if conn is None:
+            return {}
+        try:
+            df = execute_query(conn, 'load_generations')
+        except Exception:
+            return {} # Table not created yet (data loaded before generations were recorded)
+    return dict(zip(df['table_name'], df['generation']))
+
+@st.cache_data(ttl=GENERATION_CHECK_SECONDS, show_spinner=False)
+def load_snapshot_version():
+    """
+    Version of the Parquet snapshots read by the duckdb backend (see duckdb_backend.snapshot_versions).
+    Re-checked like the load generations, not on every connection: it stats every snapshot file.
+    """
+    from duckdb_backend import snapshot_versions # Only imported when the duckdb backend is used
+    return tuple(sorted(snapshot_versions().items()))
+
+def query_generation(query_id):
+    """Load generations of the tables a query reads. Changes whenever the ETL reloads one of them."""
+    generations = load_load_generations()
+    return tuple(int(generations.get(table, 0)) for table in QUERY_TABLES[query_id])
+
+
+# --- Data Loading Functions ---
+# Only successful results are cached: the cached functions raise on a failure (no connection, exhausted pool,
+# MySQL restart, ...) and the functions calling them show the error, so the next rerun tries again
+# instead of serving an empty result until the next ETL load.
+
+class NoConnectionError(Exception):
+    """No database connection could be borrowed (get_db_connection / get_duckdb_connection have shown why)."""
+
+def load_query(query_id, params=()):
+    """
+    General function to load data for a registered query (see QUERIES).
+    Results are cached per (query id, parameters, load generation of the tables it reads),
+    so an ETL reload only refreshes the queries that read a reloaded table.
+    Returns an empty DataFrame (not cached) if the query could not be run.
+    """
+    try:
+        return fetch_query(query_id, params)
+    except NoConnectionError:
+        return pd.DataFrame() # The reason has already been shown
+    except Exception as e:
+        st.error(f"Error executing SQL query '{query_id}' or loading data: {e}")
+        return pd.DataFrame() # Return empty DataFrame on error
+
+def fetch_query(query_id, params=()):
+    """Same result as load_query, but raises if the query could not be run (for cached functions built on it)."""
+    return load_query_for_generation(query_id, tuple(params), query_generation(query_id))
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES) # Cached per (query id, parameters, generation) instead of per rendered SQL text
+def load_query_for_generation(query_id, params, generation):
+    with db_connection() as conn:
+        if conn is None:
+            raise NoConnectionError("No database connection")
+        return execute_query(conn, query_id, params)
+
+def load_aggregated_transaction_data(query_id='aggregated_transaction'):
+    try:
+        return build_aggregated_transaction_data(query_id, query_generation(query_id))
+    except Exception as e:
+        st.error(f"Something went wrong while loading aggregated transaction data: {e}")
+        return pd.DataFrame()
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES) #decorator
+def build_aggregated_transaction_data(query_id, generation):
+    df = fetch_query(query_id)
+    if df.empty:
+        raise ValueError("the query returned no rows") # Not cached, so the next rerun tries again
+    df['period'] = df['year'].astype(str) + '-Q' + df['quarter'].astype(str)
+    # order for plotting
+    period_order = sorted(df['period'].unique())
+    df['period'] = pd.Categorical(df['period'], categories=period_order, ordered=True)
+    return df
+
+
+def load_dimension_metadata():
+    """
+    Loads every dropdown value with a single query. Returns a dict with
+    'years', 'quarters', 'states', 'transaction_types' (sorted lists) and
+    'districts_by_state' (state -> sorted list of districts). Lists are empty if loading failed.
+    """
+    try:
+        return build_dimension_metadata(query_generation('dimension_values'))
+    except Exception as e:
+        st.error(f"Error loading dropdown values: {e}")
+        return {'years': [], 'quarters': [], 'states': [], 'transaction_types': [], 'districts_by_state': {}}
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES) # Cache the data
+def build_dimension_metadata(generation):
+    metadata = {'years': [], 'quarters': [], 'states': [], 'transaction_types': [], 'districts_by_state': {}}
+    df = fetch_query('dimension_values')
+    if df.empty:
+        raise ValueError("summary_dimension_values is empty") # Not cached, so the next rerun tries again
+    for dimension, rows in df.groupby('dimension'):
+        if dimension == 'year':
+            metadata['years'] = sorted(int(value) for value in rows['value'])
+        elif dimension == 'quarter':
+            metadata['quarters'] = sorted(int(value) for value in rows['value'])
+        elif dimension == 'state':
+            metadata['states'] = sorted(rows['value'])
+        elif dimension == 'transactiontype':
+            metadata['transaction_types'] = sorted(rows['value'])
+        elif dimension == 'district':
+            for state, districts in rows.groupby('state', observed=True):
+                metadata['districts_by_state'][state] = sorted(districts['value'])
+    return metadata
+
+# Fact tables (keys only) and the dimensions giving their names
+FACT_QUERIES = ('fact_transactions', 'fact_district_transactions', 'fact_insurance', 'dim_state', 'dim_district')
+
+@st.cache_resource(max_entries=1) # One store per server process, rebuilt only when the ETL reloads a fact table
+def get_fact_store(generation):
+    # Fetched directly (not through load_query) so the fact tables are held in memory once, not twice
+    with db_connection() as conn:
+        if conn is None:
+            raise NoConnectionError("No database connection")
+        frames = [execute_query(conn, query_id) for query_id in FACT_QUERIES]
+    return build_fact_store(*frames)
+
+def load_fact_store():
+    """The shared in-memory fact store (see fact_store.py), or None (not cached) if it could not be loaded."""
+    try:
+        return get_fact_store(tuple(query_generation(query_id) for query_id in FACT_QUERIES))
+    except NoConnectionError:
+        return None # The reason has already been shown
+    except Exception as e:
+        st.error(f"Error loading the fact tables: {e}")
+        return None
+
+def get_dropdown_options():
+    metadata = load_dimension_metadata()
+    return metadata['years'], metadata['quarters'], metadata['states']
+
+def get_districts_for_state(state):
+    """Distinct districts for a given state."""
+    return load_dimension_metadata()['districts_by_state'].get(state, [])
+
+def get_transaction_types():
+    """Distinct transaction types."""
+    return load_dimension_metadata()['transaction_types']
+
+
+# --- Chart Rendering ---
+# Rendered matplotlib charts kept in the cache. Override with the PHONEPE_CHART_CACHE_ENTRIES environment variable.
+CHART_CACHE_ENTRIES = int(os.environ.get('PHONEPE_CHART_CACHE_ENTRIES', 256))
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False) # _draw and _data (leading underscore) are not part of the key
+def render_chart_image(chart_id, data_version, params, figsize, _draw, _data):
+    return render_figure(_draw, _data, figsize=figsize)
+
+def show_chart(chart_id, draw, data, data_version, params=(), figsize=(10, 6)):
+    """
+    Shows a matplotlib chart drawn by draw(fig, ax, data) (see chart_render.py).
+    The PNG is cached per (chart id, data version, params), so a rerun with the same inputs does not redraw it.
+    data_version must change whenever data does (e.g. query_generation of the query it came from),
+    and params must hold every widget value the chart depends on.
+    """
+    image = render_chart_image(chart_id, data_version, tuple(params), figsize, draw, data)
+    st.image(image, use_container_width=True)
+
+
+# --- State Geo Index ---
+# dim_state matched to the GeoJSON features once per load generation. The map views key on state_id,
+# so nothing is renamed, copied or searched in the GeoJSON while a page renders.
+
+def load_state_geo_index():
+    """
+    The cached state geo index, or None if dim_state or the GeoJSON could not be loaded. A dict with
+    'states': dim_state (state_id, state, state_name) plus an on_map column (state has a GeoJSON feature),
+    'shown_ids': state ids drawn on the map views (MAP_EXCLUDED_STATES left out),
+    'unmatched': canonical names of shown states that have no GeoJSON feature,
+    'geojson': the GeoJSON features of the matched states, each with its state_id as feature id.
+    """
+    geojson = load_geojson(INDIA_STATES_GEOJSON_PATH)
+    if geojson is None:
+        return None
+    try:
+        return build_state_geo_index(INDIA_STATES_GEOJSON_PATH, query_generation('dim_state'))
+    except Exception as e:
+        st.error(f"Error loading the state dimension: {e}")
+        return None
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES, show_spinner=False) # Rebuilt only when dim_state is reloaded
+def build_state_geo_index(geojson_path, generation):
+    dim_state = fetch_query('dim_state')
+    if dim_state.empty:
+        raise ValueError("dim_state is empty") # Not cached, so the next rerun tries again
+    geojson = read_geojson(geojson_path)
+
+    # Canonical state name -> GeoJSON feature
+    features = {}
+    for feature in geojson.get('features', []):
+        name = (feature.get('properties') or {}).get(GEOJSON_STATE_KEY)
+        if name is not None:
+            features[name] = feature
+
+    dim_state['on_map'] = dim_state['state_name'].isin(features)
+    shown = ~dim_state['state_name'].isin(MAP_EXCLUDED_STATES)
+    keyed_features = [{**features[name], 'id': int(state_id)}
+                      for state_id, name, on_map in zip(dim_state['state_id'], dim_state['state_name'], dim_state['on_map'])
+                      if on_map]
+    return {
+        'states': dim_state,
+        'shown_ids': sorted(int(state_id) for state_id in dim_state.loc[shown, 'state_id']),
+        'unmatched': sorted(dim_state.loc[shown & ~dim_state['on_map'], 'state_name']),
+        'geojson': {'type': 'FeatureCollection', 'features': keyed_features},
+    }
+
+def load_state_map_data(query_id):
+    """
+    Rows of a per-state query (state_id, canonical name as state, metrics) for the states shown on the map views.
+    Filtered once per load generation. Empty if the query or the geo index could not be loaded.
+    """
+    if load_state_geo_index() is None:
+        return pd.DataFrame()
+    try:
+        return build_state_map_data(query_id, query_generation(query_id))
+    except Exception as e:
+        st.error(f"Error executing SQL query '{query_id}' or loading data: {e}")
+        return pd.DataFrame()
+
+@st.cache_data(max_entries=QUERY_CACHE_ENTRIES, show_spinner=False)
+def build_state_map_data(query_id, generation):
+    df = fetch_query(query_id)
+    # Raises (instead of showing an error and returning None) if the geo index could not be built
+    geo_index = build_state_geo_index(INDIA_STATES_GEOJSON_PATH, query_generation('dim_state'))
+    return df[df['state_id'].isin(geo_index['shown_ids'])].reset_index(drop=True)
@@ -1,51 +1,51 @@
 # data_extraction.py
 
 # Import Libraries
-import json
 import os
 import pandas as pd
-from sqlalchemy import create_engine, types
-# Import necessary credentials including the encoded password
-from credentials import DB_USER, ENCODED_PASSWORD, DB_HOST, DB_PORT, DB_DATABASE
+from sqlalchemy import inspect, text, types
+# Shared engine, bulk-load paths (LOAD DATA LOCAL INFILE / executemany) and shadow-table swaps
+from bulk_loader import get_engine, dispose_engine, bulk_append, staging_table_name, swap_in_staging_table
+# Shared tree walker / process pool used by all the extraction functions
+from extraction_engine import EXTRACT_WORKERS, JSON_DECODER_NAME, new_batch, add_row, count_rows, columns_to_rows, extract_columns
+# Manifest of already-loaded files for incremental runs
+from etl_manifest import load_manifest, save_manifest, extract_changed_datasets
+# Declared table schemas (column types, primary keys, secondary indexes)
+from db_schema import get_table_schema, create_table_sql, add_indexes_sql, drop_duplicate_keys
+# Pre-aggregated tables read by the dashboard
+from summary_tables import SUMMARY_TABLES, summaries_to_refresh
+# Shared dtype contract (categorical dimensions, small integer year/quarter)
+from pulse_dtypes import apply_dtype_contract, frame_memory, memory_report
+# Star schema: dimension tables with surrogate keys, stored in the fact tables instead of the names
+from pulse_dimensions import DIMENSIONS, update_dimensions, encode_dimension_keys, encode_slices
+# Parquet snapshots of the extracted tables (optional, needs pyarrow)
+from pulse_snapshots import (snapshots_available, snapshot_exists, write_table_snapshot,
+                             update_table_snapshot, read_table_snapshot)
 
 
 # --- Data Extraction Functions ---
 
-def process_agg_transaction_data(path):
-    extracted_data = []
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-        if os.path.isdir(state_path):
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-                if os.path.isdir(year_path):
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-                        if quarter_file.endswith('.json'):
-                            try:
-                                quarter = int(quarter_file.split('.')[0])
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
-                                    if data and 'data' in data and 'transactionData' in data['data']:
-                                        for transaction in data['data']['transactionData']:
-                                            transaction_type = transaction['name']
-                                            for instrument in transaction['paymentInstruments']:
-                                                if instrument['type'] == 'TOTAL':
-                                                    count = instrument['count']
-                                                    amount = instrument['amount']
-                                                    extracted_data.append({
-                                                        'State': state,
-                                                        'Year': int(year),
-                                                        'Quarter': quarter,
-                                                        'TransactionType': transaction_type,
-                                                        'TransactionCount': count,
-                                                        'TransactionAmount': amount
-                                                    })
-                                    else:
-                                         print(f"Warning: Unexpected data structure in {quarter_path}")
-                            except Exception as e:
-                                print(f"Error processing file {quarter_path}: {e}")
-    return extracted_data
+def parse_agg_transaction_file(state, year, quarter_file, quarter_path, data):
+    batch = new_batch('State', 'Year', 'Quarter', 'TransactionType', 'TransactionCount', 'TransactionAmount')
+    try:
+        quarter = int(quarter_file.split('.')[0])
+        if data and 'data' in data and 'transactionData' in data['data']:
+            for transaction in data['data']['transactionData']:
+                transaction_type = transaction['name']
+                for instrument in transaction['paymentInstruments']:
+                    if instrument['type'] == 'TOTAL':
+                        count = instrument['count']
+                        amount = instrument['amount']
+                        add_row(batch, state, int(year), quarter, transaction_type, count, amount)
+        else:
+             print(f"Warning: Unexpected data structure in {quarter_path}")
+    except Exception as e:
+        print(f"Error processing file {quarter_path}: {e}")
+    return batch
+
+
+def process_agg_transaction_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_agg_transaction_file, workers))
 '''
 def process_agg_user_data(path):
     extracted_data = []
@@ -84,108 +84,75 @@ def process_agg_user_data(path):
                                 print(f"Error processing file {quarter_path}: {e}")
     return extracted_data
 '''
-def process_agg_user_data(path):
-    extracted_data = []
+def parse_agg_user_file(state_name, year_str, quarter_file, quarter_path, data):
+    batch = new_batch('state', 'year', 'quarter', 'brand', 'count', 'percentage', 'registeredUsers')
 
-    # Check if the base path exists
-    if not os.path.exists(path):
-        print(f"Error: Base path not found: {path}")
-        return extracted_data
-    if not os.path.isdir(path):
-         print(f"Error: Base path is not a directory: {path}")
-         return extracted_data
-
-
-    for state_name in os.listdir(path):
-        state_path = os.path.join(path, state_name)
-
-        # Ensure it's a directory
-        if os.path.isdir(state_path):
-            for year_str in os.listdir(state_path):
-                year_path = os.path.join(state_path, year_str)
+    # Ensure year is convertible to int
+    try:
+        year = int(year_str)
+    except ValueError:
+        # print(f"Skipping non-integer directory name: {year_str} in {quarter_path}") # Uncomment for debugging
+        return batch
 
-                # Ensure it's a directory and year is convertible to int
-                try:
-                    year = int(year_str)
-                except ValueError:
-                    # print(f"Skipping non-integer directory name: {year_str} in {state_path}") # Uncomment for debugging
-                    continue
+    # Process only JSON files with names like '1.json', '2.json', etc.
+    try:
+        # Extract quarter number from filename (e.g., '1.json' -> 1)
+        quarter_str = quarter_file.split('.')[0]
+        quarter = int(quarter_str)
+
+        # Validate quarter number
+        if not 1 <= quarter <= 4:
+             # print(f"Skipping file with invalid quarter number: {quarter_file}") # Uncomment for debugging
+             return batch
+
+        # --- Extraction Logic for Brand Data and Total Registered Users ---
+
+        # Extract total registered users safely
+        registered_users_total = data.get('data', {}).get('aggregated', {}).get('registeredUsers')
+
+        # Extract brand data list safely
+        brand_data_list = data.get('data', {}).get('usersByDevice', [])
+
+        # Ensure the extracted data is a list
+        if not isinstance(brand_data_list, list):
+            print(f"Warning: Expected 'usersByDevice' to be a list, found {type(brand_data_list)} in {quarter_path}. Skipping brand data.")
+            brand_data_list = [] # Treat as empty list if not a list
+
+        # Iterate through each brand entry in the list
+        for brand_entry in brand_data_list:
+            # Ensure the entry is a dictionary
+            if not isinstance(brand_entry, dict):
+                print(f"Warning: Expected brand entry to be a dictionary, found {type(brand_entry)} in {quarter_path}. Skipping entry.")
+                continue
+
+            # Extract brand details safely
+            brand = brand_entry.get('brand')
+            count = brand_entry.get('count')
+            percentage = brand_entry.get('percentage')
+
+            # Validate extracted brand data before appending
+            if brand is not None and count is not None and percentage is not None:
+                 try:
+                      # Ensure count and percentage are numeric types
+                      count = int(count)
+                      percentage = float(percentage)
+                      registered_users = int(registered_users_total) if registered_users_total is not None else None # Include total, convert to int if found
+
+                      # Append row including total registered users
+                      add_row(batch, state_name, year, quarter, str(brand), count, percentage, registered_users)
+                 except (ValueError, TypeError) as e:
+                      print(f"Error converting data types in {quarter_path} for brand {brand}: {e}. Skipping entry.")
+            # else:
+                # print(f"Warning: Missing 'brand', 'count', or 'percentage' in an entry in {quarter_path}. Skipping entry: {brand_entry}") # Uncomment for debugging missing keys
 
-                if os.path.isdir(year_path):
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
+    except Exception as e:
+        # Catch any other unexpected errors during file processing
+        print(f"An unexpected error occurred processing file {quarter_path}: {e}")
+    return batch
 
-                        # Process only JSON files with names like '1.json', '2.json', etc.
-                        if quarter_file.endswith('.json'):
-                            try:
-                                # Extract quarter number from filename (e.g., '1.json' -> 1)
-                                quarter_str = quarter_file.split('.')[0]
-                                quarter = int(quarter_str)
-
-                                # Validate quarter number
-                                if not 1 <= quarter <= 4:
-                                     # print(f"Skipping file with invalid quarter number: {quarter_file}") # Uncomment for debugging
-                                     continue
-
-                                with open(quarter_path, 'r', encoding='utf-8') as json_file:
-                                     data = json.load(json_file)
-
-                                # --- Extraction Logic for Brand Data and Total Registered Users ---
-
-                                # Extract total registered users safely
-                                registered_users_total = data.get('data', {}).get('aggregated', {}).get('registeredUsers')
-
-                                # Extract brand data list safely
-                                brand_data_list = data.get('data', {}).get('usersByDevice', [])
-
-                                # Ensure the extracted data is a list
-                                if not isinstance(brand_data_list, list):
-                                    print(f"Warning: Expected 'usersByDevice' to be a list, found {type(brand_data_list)} in {quarter_path}. Skipping brand data.")
-                                    brand_data_list = [] # Treat as empty list if not a list
-
-                                # Iterate through each brand entry in the list
-                                for brand_entry in brand_data_list:
-                                    # Ensure the entry is a dictionary
-                                    if not isinstance(brand_entry, dict):
-                                        print(f"Warning: Expected brand entry to be a dictionary, found {type(brand_entry)} in {quarter_path}. Skipping entry.")
-                                        continue
-
-                                    # Extract brand details safely
-                                    brand = brand_entry.get('brand')
-                                    count = brand_entry.get('count')
-                                    percentage = brand_entry.get('percentage')
-
-                                    # Validate extracted brand data before appending
-                                    if brand is not None and count is not None and percentage is not None:
-                                         try:
-                                              # Ensure count and percentage are numeric types
-                                              count = int(count)
-                                              percentage = float(percentage)
-
-                                              # Append dictionary including total registered users
-                                              extracted_data.append({
-                                                  'state': state_name,
-                                                  'year': year,
-                                                  'quarter': quarter,
-                                                  'brand': str(brand),
-                                                  'count': count,
-                                                  'percentage': percentage,
-                                                  'registeredUsers': int(registered_users_total) if registered_users_total is not None else None # Include total, convert to int if found
-                                              })
-                                         except (ValueError, TypeError) as e:
-                                              print(f"Error converting data types in {quarter_path} for brand {brand}: {e}. Skipping entry.")
-                                    # else:
-                                        # print(f"Warning: Missing 'brand', 'count', or 'percentage' in an entry in {quarter_path}. Skipping entry: {brand_entry}") # Uncomment for debugging missing keys
-
-                            except json.JSONDecodeError:
-                                print(f"Error decoding JSON file: {quarter_path}")
-                            except FileNotFoundError:
-                                # Should not happen if os.listdir is used correctly, but good practice
-                                print(f"Error: File not found: {quarter_path}")
-                            except Exception as e:
-                                # Catch any other unexpected errors during file processing
-                                print(f"An unexpected error occurred processing file {quarter_path}: {e}")
 
+def process_agg_user_data(path, workers=None):
+    extracted_data = columns_to_rows(extract_columns(path, parse_agg_user_file, workers))
     print(f"Finished processing. Extracted {len(extracted_data)} brand-level entries (including total registered users).")
     return extracted_data
 
@@ -237,87 +204,58 @@ def process_agg_insurance_data(path):
                                 print(f"Error processing file {quarter_path}: {e}")
     return extracted_data
 '''
-def process_agg_insurance_data(path):
-    extracted_data = []
-    # print(f"Starting processing for path: {path}") # Optional debug print
-
-    # Loop through each state directory
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-
-        # Ensure it's a directory before proceeding
-        if os.path.isdir(state_path):
-            # Loop through each year directory within the state
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
+def parse_agg_insurance_file(state, year, quarter_file, quarter_path, data):
+    batch = new_batch('State', 'Year', 'Quarter', 'InsuranceType', 'InsuranceCount', 'InsuranceAmount')
+    try:
+        # Extract the quarter number from the filename (e.g., '1.json' -> 1)
+        quarter = int(quarter_file.split('.')[0])
+
+
+        # --- Data Extraction Logic based on sample JSON ---
+        # The sample shows insurance is under 'transactionData', NOT 'insuranceData'
+        # Path: data -> data -> transactionData -> list of items (one of which is "Insurance")
+        if data and 'data' in data and isinstance(data['data'], dict) and \
+           'transactionData' in data['data'] and isinstance(data['data']['transactionData'], list):
+
+            # Iterate through the items found under 'transactionData'
+            for item_data in data['data']['transactionData']:
+                # Check if this specific item is the 'Insurance' entry
+                if item_data.get('name') == 'Insurance':
+                    # If it's the Insurance entry, look for its 'paymentInstruments' list
+                    payment_instruments = item_data.get('paymentInstruments')
+
+                    if isinstance(payment_instruments, list):
+                         # Iterate through the instruments to find the 'TOTAL' type
+                         for instrument in payment_instruments:
+                              if instrument.get('type') == 'TOTAL':
+                                 # Extract count and amount from the 'TOTAL' instrument
+                                 count = instrument.get('count')
+                                 amount = instrument.get('amount')
+
+                                 # Append the extracted data if count and amount are present
+                                 if count is not None and amount is not None:
+                                     add_row(batch, state, int(year), quarter, item_data.get('name'), count, amount) # InsuranceType will be "Insurance"
+                                 # Assuming only one TOTAL metric for Insurance per file, break inner loops
+                                 break # Breaks from the instrument loop
+                         break # Breaks from the item_data (transactionData list) loop
+
+            # else: No need for a warning here, as not finding 'Insurance' is expected for some items
+
+        else:
+            # This else catches files where the basic structure data.data.transactionData is missing or wrong type
+            # print(f"Warning: Unexpected data structure or missing 'data.data.transactionData' list in {quarter_path}")
+            pass # Suppress frequent warnings
 
-                # Ensure it's a directory before proceeding
-                if os.path.isdir(year_path):
-                    # Loop through each file within the year directory (quarter files)
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
 
-                        # Process only JSON files
-                        if quarter_file.endswith('.json'):
-                            try:
-                                # Extract the quarter number from the filename (e.g., '1.json' -> 1)
-                                quarter = int(quarter_file.split('.')[0])
+    except Exception as e:
+        # Catch any other unexpected errors during file processing
+        print(f"An unexpected error occurred processing file {quarter_path}: {e}")
+    return batch
 
-                                # Open and load the JSON file
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
 
-                                # --- Data Extraction Logic based on sample JSON ---
-                                # The sample shows insurance is under 'transactionData', NOT 'insuranceData'
-                                # Path: data -> data -> transactionData -> list of items (one of which is "Insurance")
-                                if data and 'data' in data and isinstance(data['data'], dict) and \
-                                   'transactionData' in data['data'] and isinstance(data['data']['transactionData'], list):
-
-                                    # Iterate through the items found under 'transactionData'
-                                    for item_data in data['data']['transactionData']:
-                                        # Check if this specific item is the 'Insurance' entry
-                                        if item_data.get('name') == 'Insurance':
-                                            # If it's the Insurance entry, look for its 'paymentInstruments' list
-                                            payment_instruments = item_data.get('paymentInstruments')
-
-                                            if isinstance(payment_instruments, list):
-                                                 # Iterate through the instruments to find the 'TOTAL' type
-                                                 for instrument in payment_instruments:
-                                                      if instrument.get('type') == 'TOTAL':
-                                                         # Extract count and amount from the 'TOTAL' instrument
-                                                         count = instrument.get('count')
-                                                         amount = instrument.get('amount')
-
-                                                         # Append the extracted data if count and amount are present
-                                                         if count is not None and amount is not None:
-                                                             extracted_data.append({
-                                                                 'State': state,
-                                                                 'Year': int(year),
-                                                                 'Quarter': quarter,
-                                                                 'InsuranceType': item_data.get('name'), # This will be "Insurance"
-                                                                 'InsuranceCount': count,
-                                                                 'InsuranceAmount': amount
-                                                             })
-                                                         # Assuming only one TOTAL metric for Insurance per file, break inner loops
-                                                         break # Breaks from the instrument loop
-                                                 break # Breaks from the item_data (transactionData list) loop
-
-                                    # else: No need for a warning here, as not finding 'Insurance' is expected for some items
-
-                                else:
-                                    # This else catches files where the basic structure data.data.transactionData is missing or wrong type
-                                    # print(f"Warning: Unexpected data structure or missing 'data.data.transactionData' list in {quarter_path}")
-                                    pass # Suppress frequent warnings
-
-
-                            except json.JSONDecodeError as e:
-                                print(f"Error decoding JSON in file {quarter_path}: {e}")
-                            except Exception as e:
-                                # Catch any other unexpected errors during file processing
-                                print(f"An unexpected error occurred processing file {quarter_path}: {e}")
+def process_agg_insurance_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_agg_insurance_file, workers))
 
-    # print(f"Finished processing for path: {path}. Extracted {len(extracted_data)} rows.") # Optional debug print
-    return extracted_data
 
 
 
@@ -327,50 +265,34 @@ def process_agg_insurance_data(path):
 
 
 
+def parse_map_transaction_file(state, year, quarter_file, quarter_path, data):
+    batch = new_batch('State', 'Year', 'Quarter', 'District', 'TransactionCount', 'TransactionAmount')
+    try:
+        quarter = int(quarter_file.split('.')[0])
+        if data and 'data' in data and 'hoverDataList' in data['data']:
+            for district_data in data['data']['hoverDataList']:
+                district = district_data['name']
+                # Ensure 'metric' key exists and is a list
+                if 'metric' in district_data and isinstance(district_data['metric'], list):
+                     for metric in district_data['metric']:
+                         if metric.get('type') == 'TOTAL': # Use .get for safe access
+                             count = metric.get('count')
+                             amount = metric.get('amount')
+                             # Only append if count and amount are present
+                             if count is not None and amount is not None:
+                                add_row(batch, state, int(year), quarter, district, count, amount)
+                         # You might need to handle other metric types if applicable
+                else:
+                     print(f"Warning: 'metric' key missing or not a list in {quarter_path} for district {district}")
+        else:
+             print(f"Warning: Unexpected data structure in {quarter_path}")
+    except Exception as e:
+        print(f"Error processing file {quarter_path}: {e}")
+    return batch
 
 
-def process_map_transaction_data(path):
-    extracted_data = []
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-        if os.path.isdir(state_path):
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-                if os.path.isdir(year_path):
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-                        if quarter_file.endswith('.json'):
-                            try:
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
-                                    quarter = int(quarter_file.split('.')[0])
-                                    if data and 'data' in data and 'hoverDataList' in data['data']:
-                                        for district_data in data['data']['hoverDataList']:
-                                            district = district_data['name']
-                                            # Ensure 'metric' key exists and is a list
-                                            if 'metric' in district_data and isinstance(district_data['metric'], list):
-                                                 for metric in district_data['metric']:
-                                                     if metric.get('type') == 'TOTAL': # Use .get for safe access
-                                                         count = metric.get('count')
-                                                         amount = metric.get('amount')
-                                                         # Only append if count and amount are present
-                                                         if count is not None and amount is not None:
-                                                            extracted_data.append({
-                                                                'State': state,
-                                                                'Year': int(year),
-                                                                'Quarter': quarter,
-                                                                'District': district,
-                                                                'TransactionCount': count,
-                                                                'TransactionAmount': amount
-                                                            })
-                                                     # You might need to handle other metric types if applicable
-                                            else:
-                                                 print(f"Warning: 'metric' key missing or not a list in {quarter_path} for district {district}")
-                                    else:
-                                         print(f"Warning: Unexpected data structure in {quarter_path}")
-                            except Exception as e:
-                                print(f"Error processing file {quarter_path}: {e}")
-    return extracted_data
+def process_map_transaction_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_map_transaction_file, workers))
 '''
 def process_map_user_data(path):
     extracted_data = []
@@ -418,99 +340,64 @@ def process_map_user_data(path):
                                 print(f"Error processing file {quarter_path}: {e}")
     return extracted_data
 '''
-def process_map_user_data(path):
+def parse_map_user_file(state, year, quarter_file, quarter_path, data):
     """
-    Extracts user data (registered users and app opens) for districts from JSON files.
+    Extracts user data (registered users and app opens) for districts from one JSON file.
     Includes debug prints to trace execution and data extraction.
 
     Assumes JSON structure: data -> hoverData -> {district_name} -> {metrics: registeredUsers, appOpens}.
     This structure is based on the provided map user sample JSON.
     """
-    extracted_data = []
-    print(f"DEBUG: Starting processing for Map User data in path: {path}") # Debug print
-
-    # Check if the base path exists
-    if not os.path.exists(path):
-        print(f"DEBUG: Error: Base path not found: {path}")
-        return extracted_data # Return empty if base path doesn't exist
-
-    # Loop through each state directory
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-        # print(f"DEBUG: Checking state path: {state_path}") # Debug print (can be noisy)
-
-        # Ensure it's a directory before proceeding
-        if os.path.isdir(state_path):
-            # Loop through each year directory within the state
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-                # print(f"DEBUG: Checking year path: {year_path}") # Debug print (can be noisy)
-
-                # Ensure it's a directory before proceeding
-                if os.path.isdir(year_path):
-                    # Loop through each file within the year directory (quarter files)
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-                        # print(f"DEBUG: Checking file: {quarter_path}") # Debug print (can be noisy)
-
-                        # Process only JSON files
-                        if quarter_file.endswith('.json'):
-                            try:
-                                # Extract the quarter number from the filename (e.g., '1.json' -> 1)
-                                # Add a check to ensure the filename is just a number before splitting
-                                base_name, ext = os.path.splitext(quarter_file)
-                                if base_name.isdigit():
-                                    quarter = int(base_name)
-                                    year_int = int(year) # Ensure year is an integer
-                                else:
-                                    print(f"DEBUG: Skipping non-numeric file name: {quarter_file}")
-                                    continue # Skip this file if name is not just a digit
-
-                                # Open and load the JSON file
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
-                                print(f"DEBUG: Successfully loaded JSON from {quarter_file}") # Debug print
-
-                                # --- Data Extraction Logic for Map User Districts (based on new structure) ---
-                                # Navigate to the 'hoverData' dictionary
-                                hover_data = data.get('data', {}).get('hoverData')
-
-                                if isinstance(hover_data, dict):
-                                    print(f"DEBUG: Found 'hoverData' dictionary ({len(hover_data)} entries) in {quarter_file}") # Debug print
-                                    # Iterate through the items in the 'hoverData' dictionary
-                                    # Each key is a district name, each value is the metrics dictionary
-                                    for district_name, metrics in hover_data.items():
-                                        # Ensure metrics is a dictionary
-                                        if isinstance(metrics, dict):
-                                            # Extracting registered users and app opens
-                                            registered_users = metrics.get('registeredUsers')
-                                            app_opens = metrics.get('appOpens') # Extract the 'appOpens' value
-
-                                            # Ensure district name and registered users count are present
-                                            # app_opens might be None, which is allowed by your schema
-                                            if district_name and registered_users is not None:
-                                                extracted_data.append({
-                                                    'State': state,
-                                                    'Year': year_int,
-                                                    'Quarter': quarter,
-                                                    'District': district_name, # Use the key as the District name
-                                                    'RegisteredUsers': registered_users,
-                                                    'AppOpens': app_opens # Include the extracted app_opens
-                                                })
-                                                # print(f"DEBUG: Extracted data for {district_name} in {quarter_file}") # Debug print per entry
-                                            else:
-                                                print(f"DEBUG: Skipping entry in {quarter_file} due to missing 'name' or 'registeredUsers': {district_name}: {metrics}") # Debug print for skipped entries
+    batch = new_batch('State', 'Year', 'Quarter', 'District', 'RegisteredUsers', 'AppOpens')
+    try:
+        # Extract the quarter number from the filename (e.g., '1.json' -> 1)
+        # Add a check to ensure the filename is just a number before splitting
+        base_name, ext = os.path.splitext(quarter_file)
+        if base_name.isdigit():
+            quarter = int(base_name)
+            year_int = int(year) # Ensure year is an integer
+        else:
+            print(f"DEBUG: Skipping non-numeric file name: {quarter_file}")
+            return batch # Skip this file if name is not just a digit
+
+        print(f"DEBUG: Successfully loaded JSON from {quarter_file}") # Debug print
+
+        # --- Data Extraction Logic for Map User Districts (based on new structure) ---
+        # Navigate to the 'hoverData' dictionary
+        hover_data = data.get('data', {}).get('hoverData')
+
+        if isinstance(hover_data, dict):
+            print(f"DEBUG: Found 'hoverData' dictionary ({len(hover_data)} entries) in {quarter_file}") # Debug print
+            # Iterate through the items in the 'hoverData' dictionary
+            # Each key is a district name, each value is the metrics dictionary
+            for district_name, metrics in hover_data.items():
+                # Ensure metrics is a dictionary
+                if isinstance(metrics, dict):
+                    # Extracting registered users and app opens
+                    registered_users = metrics.get('registeredUsers')
+                    app_opens = metrics.get('appOpens') # Extract the 'appOpens' value
+
+                    # Ensure district name and registered users count are present
+                    # app_opens might be None, which is allowed by your schema
+                    if district_name and registered_users is not None:
+                        add_row(batch, state, year_int, quarter, district_name, registered_users, app_opens) # Use the key as the District name
+                        # print(f"DEBUG: Extracted data for {district_name} in {quarter_file}") # Debug print per entry
+                    else:
+                        print(f"DEBUG: Skipping entry in {quarter_file} due to missing 'name' or 'registeredUsers': {district_name}: {metrics}") # Debug print for skipped entries
+
+        else:
+            print(f"DEBUG: 'hoverData' not found or not a dictionary in {quarter_file}. Found type: {type(hover_data)}") # Debug print if dict not found/wrong type
 
-                                else:
-                                    print(f"DEBUG: 'hoverData' not found or not a dictionary in {quarter_file}. Found type: {type(hover_data)}") # Debug print if dict not found/wrong type
 
+    except Exception as e:
+        # Catch any other unexpected errors during file processing
+        print(f"DEBUG: An unexpected error occurred processing file {quarter_path}: {e}")
+    return batch
 
-                            except json.JSONDecodeError as e:
-                                print(f"DEBUG: Error decoding JSON in file {quarter_path}: {e}")
-                            except Exception as e:
-                                # Catch any other unexpected errors during file processing
-                                print(f"DEBUG: An unexpected error occurred processing file {quarter_path}: {e}")
 
+def process_map_user_data(path, workers=None):
+    print(f"DEBUG: Starting processing for Map User data in path: {path}") # Debug print
+    extracted_data = columns_to_rows(extract_columns(path, parse_map_user_file, workers))
     print(f"DEBUG: Finished processing for Map User data. Extracted {len(extracted_data)} rows.") # Debug print
     return extracted_data
 
@@ -520,59 +407,45 @@ def process_map_user_data(path):
 
 
 # --- New Function for Map Insurance Data ---
-def process_map_insurance_data(path):
-    extracted_data = []
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-        if os.path.isdir(state_path):
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-                if os.path.isdir(year_path):
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-                        if quarter_file.endswith('.json'):
-                            try:
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
-                                    quarter = int(quarter_file.split('.')[0])
-                                    # Assuming map insurance data is structured like map transaction data
-                                    # Path: data -> hoverDataList -> list of districts
-                                    if data and 'data' in data and 'hoverDataList' in data['data'] and isinstance(data['data']['hoverDataList'], list):
-                                        for district_data in data['data']['hoverDataList']:
-                                            district = district_data.get('name') # Use .get for safe access
-                                            # Ensure 'metric' key exists and is a list
-                                            if 'metric' in district_data and isinstance(district_data['metric'], list):
-                                                 # Assuming 'metric' contains count and amount, potentially with a 'type'
-                                                 # Let's extract count and amount directly from the first item in 'metric' list
-                                                 # based on observation from similar data structures, or look for a 'TOTAL' type
-                                                 # Let's assume it's like map transactions and looks for 'TOTAL' type
-                                                for metric in district_data['metric']:
-                                                     if metric.get('type') == 'TOTAL': # Check for TOTAL type or adapt based on actual data
-                                                        count = metric.get('count')
-                                                        amount = metric.get('amount')
-                                                        # Only append if district name, count and amount are present
-                                                        if district and count is not None and amount is not None:
-                                                             extracted_data.append({
-                                                                'State': state,
-                                                                'Year': int(year),
-                                                                'Quarter': quarter,
-                                                                'District': district,
-                                                                'InsuranceCount': count, # Changed column name
-                                                                'InsuranceAmount': amount # Changed column name
-                                                             })
-                                                             break # Assuming only one relevant metric per district entry
-
-                                            # else:
-                                                # print(f"Warning: 'metric' key missing or not a list in {quarter_path} for district entry: {district_data}")
+def parse_map_insurance_file(state, year, quarter_file, quarter_path, data):
+    batch = new_batch('State', 'Year', 'Quarter', 'District', 'InsuranceCount', 'InsuranceAmount')
+    try:
+        quarter = int(quarter_file.split('.')[0])
+        # Assuming map insurance data is structured like map transaction data
+        # Path: data -> hoverDataList -> list of districts
+        if data and 'data' in data and 'hoverDataList' in data['data'] and isinstance(data['data']['hoverDataList'], list):
+            for district_data in data['data']['hoverDataList']:
+                district = district_data.get('name') # Use .get for safe access
+                # Ensure 'metric' key exists and is a list
+                if 'metric' in district_data and isinstance(district_data['metric'], list):
+                     # Assuming 'metric' contains count and amount, potentially with a 'type'
+                     # Let's extract count and amount directly from the first item in 'metric' list
+                     # based on observation from similar data structures, or look for a 'TOTAL' type
+                     # Let's assume it's like map transactions and looks for 'TOTAL' type
+                    for metric in district_data['metric']:
+                         if metric.get('type') == 'TOTAL': # Check for TOTAL type or adapt based on actual data
+                            count = metric.get('count')
+                            amount = metric.get('amount')
+                            # Only append if district name, count and amount are present
+                            if district and count is not None and amount is not None:
+                                 add_row(batch, state, int(year), quarter, district, count, amount) # InsuranceCount / InsuranceAmount columns
+                                 break # Assuming only one relevant metric per district entry
+
+                # else:
+                    # print(f"Warning: 'metric' key missing or not a list in {quarter_path} for district entry: {district_data}")
+
+
+        # else:
+            # print(f"Warning: Unexpected data structure or missing 'hoverDataList' in {quarter_path}")
+        pass # Suppress frequent warnings
 
+    except Exception as e:
+        print(f"Error processing file {quarter_path}: {e}")
+    return batch
 
-                                    # else:
-                                        # print(f"Warning: Unexpected data structure or missing 'hoverDataList' in {quarter_path}")
-                                    pass # Suppress frequent warnings
 
-                            except Exception as e:
-                                print(f"Error processing file {quarter_path}: {e}")
-    return extracted_data
+def process_map_insurance_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_map_insurance_file, workers))
 
 '''
 def process_top_transaction_data(path):
@@ -617,321 +490,208 @@ def process_top_transaction_data(path):
 '''
 
 
-def process_top_transaction_pincode_data(path):
-    extracted_data = []
-    # print(f"Starting processing for Top Transaction Pincode data in path: {path}") # Optional debug print
+def parse_top_transaction_pincode_file(state, year, quarter_file, quarter_path, data):
+    batch = new_batch('State', 'Year', 'Quarter', 'Pincode', 'TransactionCount', 'TransactionAmount')
+    entry = {} # Referenced by the ValueError message below
+    try:
+        quarter = int(quarter_file.split('.')[0])
+        year_int = int(year) # Ensure year is an integer
+
+        # Navigate to the list containing pincode data
+        # Assuming the path is data -> topTransaction -> pincodes
+        # Or maybe directly data -> pincodes as in your process_top_transaction_data
+        # Let's assume it's within data['data'] and under the key 'pincodes' as suggested by your previous code
+        pincode_list = data.get('data', {}).get('pincodes')
+
+        if isinstance(pincode_list, list):
+            for entry in pincode_list:
+                # Extracting the pincode name and metric
+                pincode_name = entry.get('entityName') # Assuming 'entityName' holds the pincode
+                metric_data = entry.get('metric') # Assuming 'metric' is a dictionary with count/amount
+
+                if pincode_name and metric_data and isinstance(metric_data, dict):
+                     count = metric_data.get('count')
+                     amount = metric_data.get('amount')
+
+                     if count is not None and amount is not None:
+                         add_row(batch, state, year_int, quarter, int(pincode_name), count, amount) # Convert pincode to INT as per DB schema
+                     # else:
+                     #    print(f"Warning: Missing count or amount in metric for pincode {pincode_name} in file {quarter_path}")
+
+        # else:
+        #     print(f"Warning: 'pincodes' key missing or not a list in file: {quarter_path}")
+
+    except ValueError as e:
+        print(f"Error converting pincode to int in file {quarter_path}: {e} - Pincode found: {entry.get('entityName')}") # More specific error for pincode conversion
+    except Exception as e:
+        print(f"An unexpected error occurred processing file {quarter_path}: {e}")
+    return batch
 
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-        if os.path.isdir(state_path):
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-                if os.path.isdir(year_path):
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-                        if quarter_file.endswith('.json'):
-                            try:
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
-                                quarter = int(quarter_file.split('.')[0])
-                                year_int = int(year) # Ensure year is an integer
-
-                                # Navigate to the list containing pincode data
-                                # Assuming the path is data -> topTransaction -> pincodes
-                                # Or maybe directly data -> pincodes as in your process_top_transaction_data
-                                # Let's assume it's within data['data'] and under the key 'pincodes' as suggested by your previous code
-                                pincode_list = data.get('data', {}).get('pincodes')
-
-                                if isinstance(pincode_list, list):
-                                    for entry in pincode_list:
-                                        # Extracting the pincode name and metric
-                                        pincode_name = entry.get('entityName') # Assuming 'entityName' holds the pincode
-                                        metric_data = entry.get('metric') # Assuming 'metric' is a dictionary with count/amount
-
-                                        if pincode_name and metric_data and isinstance(metric_data, dict):
-                                             count = metric_data.get('count')
-                                             amount = metric_data.get('amount')
-
-                                             if count is not None and amount is not None:
-                                                 extracted_data.append({
-                                                     'State': state,
-                                                     'Year': year_int,
-                                                     'Quarter': quarter,
-                                                     'Pincode': int(pincode_name), # Convert pincode to INT as per DB schema
-                                                     'TransactionCount': count,
-                                                     'TransactionAmount': amount
-                                                 })
-                                             # else:
-                                             #    print(f"Warning: Missing count or amount in metric for pincode {pincode_name} in file {quarter_path}")
-
-                                # else:
-                                #     print(f"Warning: 'pincodes' key missing or not a list in file: {quarter_path}")
-
-                            except json.JSONDecodeError as e:
-                                print(f"Error decoding JSON in file {quarter_path}: {e}")
-                            except ValueError as e:
-                                print(f"Error converting pincode to int in file {quarter_path}: {e} - Pincode found: {entry.get('entityName')}") # More specific error for pincode conversion
-                            except Exception as e:
-                                print(f"An unexpected error occurred processing file {quarter_path}: {e}")
 
-    # print(f"Finished processing for Top Transaction Pincode data. Extracted {len(extracted_data)} rows.") # Optional debug print
-    return extracted_data
+def process_top_transaction_pincode_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_top_transaction_pincode_file, workers))
 
 
 # --- New Function for Top Transaction District Data ---
-def process_top_transaction_district_data(path):
+def parse_top_transaction_district_file(state, year, quarter_file, quarter_path, data):
     """
-    Extracts transaction data for top districts from JSON files.
+    Extracts transaction data for top districts from one JSON file.
 
     Assumes JSON structure: data -> data -> ['states', 'districts', or 'entities'] -> list of items
     Each item has 'entityName' (district name) and 'metric' (dict with 'count', 'amount').
     """
-    extracted_data = []
-    # print(f"Starting processing for Top Transaction District data in path: {path}") # Optional debug print
-
-    # Loop through each state directory
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
+    batch = new_batch('State', 'Year', 'Quarter', 'District', 'TransactionCount', 'TransactionAmount')
+    try:
+        # Extract the quarter number from the filename (e.g., '1.json' -> 1)
+        quarter = int(quarter_file.split('.')[0])
+        year_int = int(year) # Ensure year is an integer
 
-        # Ensure it's a directory before proceeding
-        if os.path.isdir(state_path):
-            # Loop through each year directory within the state
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
 
-                # Ensure it's a directory before proceeding
-                if os.path.isdir(year_path):
-                    # Loop through each file within the year directory (quarter files)
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
+        # --- Data Extraction Logic for Top Transaction Districts ---
+        # Look for the list of top entities. Trying common keys.
+        # If the actual JSON structure uses a different key, this needs adjustment.
+        top_entity_list = data.get('data', {}).get('states') # Try 'states' first
 
-                        # Process only JSON files
-                        if quarter_file.endswith('.json'):
-                            try:
-                                # Extract the quarter number from the filename (e.g., '1.json' -> 1)
-                                quarter = int(quarter_file.split('.')[0])
-                                year_int = int(year) # Ensure year is an integer
+        if not isinstance(top_entity_list, list):
+             top_entity_list = data.get('data', {}).get('districts') # Then try 'districts'
+        if not isinstance(top_entity_list, list):
+             top_entity_list = data.get('data', {}).get('entities') # Generic fallback 'entities'
 
-                                # Open and load the JSON file
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
 
-                                # --- Data Extraction Logic for Top Transaction Districts ---
-                                # Look for the list of top entities. Trying common keys.
-                                # If the actual JSON structure uses a different key, this needs adjustment.
-                                top_entity_list = data.get('data', {}).get('states') # Try 'states' first
+        if isinstance(top_entity_list, list):
+            # Iterate through the entries (assumed to be districts)
+            for entry in top_entity_list:
+                # Extracting the entity name (district name) and metric data
+                district_name = entry.get('entityName') # Assuming 'entityName' holds the district name
+                metric_data = entry.get('metric') # Assuming 'metric' is a dictionary with count/amount
 
-                                if not isinstance(top_entity_list, list):
-                                     top_entity_list = data.get('data', {}).get('districts') # Then try 'districts'
-                                if not isinstance(top_entity_list, list):
-                                     top_entity_list = data.get('data', {}).get('entities') # Generic fallback 'entities'
+                # Ensure district name, metric data, and metric structure are valid
+                if district_name and metric_data and isinstance(metric_data, dict):
+                    count = metric_data.get('count')
+                    amount = metric_data.get('amount')
 
+                    # Append the extracted data if count and amount are present
+                    if count is not None and amount is not None:
+                        add_row(batch, state, year_int, quarter, district_name, count, amount) # Use entityName as the District name
+                    # else: # Optional warning for missing count/amount in a valid metric entry
+                    # print(f"Warning: Missing count or amount in metric for entity {district_name} in file {quarter_path}")
+        # else: # Optional warning if no suitable list key ('states', 'districts', 'entities') found
+        # print(f"Warning: No suitable list key ('states', 'districts', 'entities') found under 'data' in file: {quarter_path}")
 
-                                if isinstance(top_entity_list, list):
-                                    # Iterate through the entries (assumed to be districts)
-                                    for entry in top_entity_list:
-                                        # Extracting the entity name (district name) and metric data
-                                        district_name = entry.get('entityName') # Assuming 'entityName' holds the district name
-                                        metric_data = entry.get('metric') # Assuming 'metric' is a dictionary with count/amount
 
-                                        # Ensure district name, metric data, and metric structure are valid
-                                        if district_name and metric_data and isinstance(metric_data, dict):
-                                            count = metric_data.get('count')
-                                            amount = metric_data.get('amount')
+    except Exception as e:
+        # Catch any other unexpected errors during file processing
+        print(f"An unexpected error occurred processing file {quarter_path}: {e}")
+    return batch
 
-                                            # Append the extracted data if count and amount are present
-                                            if count is not None and amount is not None:
-                                                extracted_data.append({
-                                                    'State': state,
-                                                    'Year': year_int,
-                                                    'Quarter': quarter,
-                                                    'District': district_name, # Use entityName as the District name
-                                                    'TransactionCount': count,
-                                                    'TransactionAmount': amount
-                                                })
-                                            # else: # Optional warning for missing count/amount in a valid metric entry
-                                            # print(f"Warning: Missing count or amount in metric for entity {district_name} in file {quarter_path}")
-                                # else: # Optional warning if no suitable list key ('states', 'districts', 'entities') found
-                                # print(f"Warning: No suitable list key ('states', 'districts', 'entities') found under 'data' in file: {quarter_path}")
 
+def process_top_transaction_district_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_top_transaction_district_file, workers))
 
-                            except json.JSONDecodeError as e:
-                                print(f"Error decoding JSON in file {quarter_path}: {e}")
-                            except Exception as e:
-                                # Catch any other unexpected errors during file processing
-                                print(f"An unexpected error occurred processing file {quarter_path}: {e}")
 
-    # print(f"Finished processing for Top Transaction District data. Extracted {len(extracted_data)} rows.") # Optional debug print
-    return extracted_data
 
 
 
 
+def parse_top_user_pincode_file(state, year, quarter_file, quarter_path, data):
+    batch = new_batch('State', 'Year', 'Quarter', 'District', 'RegisteredUsers')
+    try:
+        quarter = int(quarter_file.split('.')[0])
+        # Processing top user data - Ensure 'pincodes' key exists and is a list
+        if data and 'data' in data and 'pincodes' in data['data'] and isinstance(data['data']['pincodes'], list):
+            for entry in data['data']['pincodes']:
+                district = entry.get('name') # Use .get for safe access
+                registered_users = entry.get('registeredUsers') # Use .get for safe access
+                if district and registered_users is not None:
+                    add_row(batch, state, int(year), quarter, district, registered_users)
+                else:
+                    print(f"Warning: Missing 'name' or 'registeredUsers' in {quarter_path} for entry {entry}")
+        else:
+            print(f"Warning: Unexpected data structure or missing 'pincodes' in {quarter_path}")
+    except Exception as e:
+        print(f"Error processing file {quarter_path}: {e}")
+    return batch
 
 
-def process_top_user_pincode_data(path):
-    extracted_data = []
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-        if os.path.isdir(state_path):
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-                if os.path.isdir(year_path):
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-                        if quarter_file.endswith('.json'):
-                            try:
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
-                                    quarter = int(quarter_file.split('.')[0])
-                                    # Processing top user data - Ensure 'pincodes' key exists and is a list
-                                    if data and 'data' in data and 'pincodes' in data['data'] and isinstance(data['data']['pincodes'], list):
-                                        for entry in data['data']['pincodes']:
-                                            district = entry.get('name') # Use .get for safe access
-                                            registered_users = entry.get('registeredUsers') # Use .get for safe access
-                                            if district and registered_users is not None:
-                                                extracted_data.append({
-                                                    'State': state,
-                                                    'Year': int(year),
-                                                    'Quarter': quarter,
-                                                    'District': district,
-                                                    'RegisteredUsers': registered_users
-                                                })
-                                            else:
-                                                print(f"Warning: Missing 'name' or 'registeredUsers' in {quarter_path} for entry {entry}")
-                                    else:
-                                        print(f"Warning: Unexpected data structure or missing 'pincodes' in {quarter_path}")
-                            except Exception as e:
-                                print(f"Error processing file {quarter_path}: {e}")
-    return extracted_data
+def process_top_user_pincode_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_top_user_pincode_file, workers))
 
 
 # --- Function for Top User District Data (Refined based on sample JSON) ---
-def process_top_user_district_data(path):
+def parse_top_user_district_file(state, year, quarter_file, quarter_path, data):
     """
-    Extracts user data (registered users) for top districts from JSON files
+    Extracts user data (registered users) for top districts from one JSON file
     based on the provided sample structure.
 
     Assumes JSON structure: data -> data -> 'districts' -> list of items
     Each item has 'name' (district name) and 'registeredUsers'.
     """
-    extracted_data = []
-    # print(f"Starting processing for Top User District data in path: {path}") # Optional debug print
-
-    # Loop through each state directory
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-
-        # Ensure it's a directory before proceeding
-        if os.path.isdir(state_path):
-            # Loop through each year directory within the state
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-
-                # Ensure it's a directory before proceeding
-                if os.path.isdir(year_path):
-                    # Loop through each file within the year directory (quarter files)
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-
-                        # Process only JSON files
-                        if quarter_file.endswith('.json'):
-                            try:
-                                # Extract the quarter number from the filename (e.g., '1.json' -> 1)
-                                quarter = int(quarter_file.split('.')[0])
-                                year_int = int(year) # Ensure year is an integer
+    batch = new_batch('State', 'Year', 'Quarter', 'District', 'RegisteredUsers')
+    try:
+        # Extract the quarter number from the filename (e.g., '1.json' -> 1)
+        quarter = int(quarter_file.split('.')[0])
+        year_int = int(year) # Ensure year is an integer
 
-                                # Open and load the JSON file
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
 
-                                # --- Data Extraction Logic for Top User Districts ---
-                                # Access the list of districts using the key 'districts' as per sample
-                                district_list = data.get('data', {}).get('districts')
-
-                                if isinstance(district_list, list):
-                                    # Iterate through the district entries
-                                    for entry in district_list:
-                                        # Extracting the district name and registered users count
-                                        district_name = entry.get('name') # Using 'name' as the key for district name
-                                        registered_users = entry.get('registeredUsers') # Using 'registeredUsers'
-
-                                        # Ensure district name and registered users count are present
-                                        if district_name and registered_users is not None:
-                                            extracted_data.append({
-                                                'State': state,
-                                                'Year': year_int,
-                                                'Quarter': quarter,
-                                                'District': district_name, # Use 'name' as the District name
-                                                'RegisteredUsers': registered_users
-                                            })
-                                        # else: # Optional warning for missing name or registeredUsers in an entry
-                                        # print(f"Warning: Missing 'name' or 'registeredUsers' in entry {entry} in file {quarter_path}")
-
-                                # else: # Optional warning if 'districts' list not found
-                                # print(f"Warning: 'districts' list not found under 'data' in file: {quarter_path}")
-
-
-                            except json.JSONDecodeError as e:
-                                print(f"Error decoding JSON in file {quarter_path}: {e}")
-                            except Exception as e:
-                                # Catch any other unexpected errors during file processing
-                                print(f"An unexpected error occurred processing file {quarter_path}: {e}")
+        # --- Data Extraction Logic for Top User Districts ---
+        # Access the list of districts using the key 'districts' as per sample
+        district_list = data.get('data', {}).get('districts')
 
-    # print(f"Finished processing for Top User District data. Extracted {len(extracted_data)} rows.") # Optional debug print
-    return extracted_data
+        if isinstance(district_list, list):
+            # Iterate through the district entries
+            for entry in district_list:
+                # Extracting the district name and registered users count
+                district_name = entry.get('name') # Using 'name' as the key for district name
+                registered_users = entry.get('registeredUsers') # Using 'registeredUsers'
 
+                # Ensure district name and registered users count are present
+                if district_name and registered_users is not None:
+                    add_row(batch, state, year_int, quarter, district_name, registered_users) # Use 'name' as the District name
+                # else: # Optional warning for missing name or registeredUsers in an entry
+                # print(f"Warning: Missing 'name' or 'registeredUsers' in entry {entry} in file {quarter_path}")
 
-# --- New Function for Top Insurance Data ---
-def process_top_insurance_data(path):
-    extracted_data = []
-    for state in os.listdir(path):
-        state_path = os.path.join(path, state)
-        if os.path.isdir(state_path):
-            for year in os.listdir(state_path):
-                year_path = os.path.join(state_path, year)
-                if os.path.isdir(year_path):
-                    for quarter_file in os.listdir(year_path):
-                        quarter_path = os.path.join(year_path, quarter_file)
-                        if quarter_file.endswith('.json'):
-                            try:
-                                with open(quarter_path, 'r') as json_file:
-                                    data = json.load(json_file)
-                                    quarter = int(quarter_file.split('.')[0])
-                                    # Assuming top insurance data is structured like top transaction data
-                                    # Path: data -> pincodes -> list of top pincodes/districts
-                                    if data and 'data' in data and 'pincodes' in data['data'] and isinstance(data['data']['pincodes'], list):
-                                        for entry in data['data']['pincodes']:
-                                            district_or_pincode = entry.get('entityName') # Use .get for safe access
-                                            metric = entry.get('metric') # Should be a dictionary
-                                            if district_or_pincode and metric and isinstance(metric, dict):
-                                                count = metric.get('count')
-                                                amount = metric.get('amount')
-                                                if count is not None and amount is not None:
-                                                    extracted_data.append({
-                                                        'State': state,
-                                                        'Year': int(year),
-                                                        'Quarter': quarter,
-                                                        'Pincode': district_or_pincode, # Renamed column
-                                                        'InsuranceCount': count, # Changed column name
-                                                        'InsuranceAmount': amount # Changed column name
-                                                    })
-                                            # else:
-                                                # print(f"Warning: Missing 'entityName' or invalid 'metric' in {quarter_path} for entry {entry}")
-                                    # else:
-                                        # print(f"Warning: Unexpected data structure or missing 'pincodes' list in {quarter_path}")
-                                    pass # Suppress frequent warnings
-                            except Exception as e:
-                                print(f"Error processing file {quarter_path}: {e}")
-    return extracted_data
+        # else: # Optional warning if 'districts' list not found
+        # print(f"Warning: 'districts' list not found under 'data' in file: {quarter_path}")
 
 
+    except Exception as e:
+        # Catch any other unexpected errors during file processing
+        print(f"An unexpected error occurred processing file {quarter_path}: {e}")
+    return batch
 
 
+def process_top_user_district_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_top_user_district_file, workers))
 
 
+# --- New Function for Top Insurance Data ---
+def parse_top_insurance_file(state, year, quarter_file, quarter_path, data):
+    batch = new_batch('State', 'Year', 'Quarter', 'Pincode', 'InsuranceCount', 'InsuranceAmount')
+    try:
+        quarter = int(quarter_file.split('.')[0])
+        # Assuming top insurance data is structured like top transaction data
+        # Path: data -> pincodes -> list of top pincodes/districts
+        if data and 'data' in data and 'pincodes' in data['data'] and isinstance(data['data']['pincodes'], list):
+            for entry in data['data']['pincodes']:
+                district_or_pincode = entry.get('entityName') # Use .get for safe access
+                metric = entry.get('metric') # Should be a dictionary
+                if district_or_pincode and metric and isinstance(metric, dict):
+                    count = metric.get('count')
+                    amount = metric.get('amount')
+                    if count is not None and amount is not None:
+                        add_row(batch, state, int(year), quarter, district_or_pincode, count, amount) # Pincode / InsuranceCount / InsuranceAmount columns
+                # else:
+                    # print(f"Warning: Missing 'entityName' or invalid 'metric' in {quarter_path} for entry {entry}")
+        # else:
+            # print(f"Warning: Unexpected data structure or missing 'pincodes' list in {quarter_path}")
+        pass # Suppress frequent warnings
+    except Exception as e:
+        print(f"Error processing file {quarter_path}: {e}")
+    return batch
 
 
+def process_top_insurance_data(path, workers=None):
+    return columns_to_rows(extract_columns(path, parse_top_insurance_file, workers))
 
 
 
@@ -955,142 +715,399 @@ path_to_top_user_json = 'pulse/data/top/user/country/india/state'
 path_to_top_insurance_json = 'pulse/data/top/insurance/country/india/state' # New Path
 
 
-print("Processing aggregated transaction data...")
-extracted_agg_transaction_data = process_agg_transaction_data(path_to_agg_transaction_json)
-df_agg_transaction = pd.DataFrame(extracted_agg_transaction_data)
-print(f"Processed {len(df_agg_transaction)} rows for aggregated transactions.")
+# Table name -> (path, per-file parser). All datasets are extracted in one pass of the process pool.
+EXTRACTION_JOBS = {
+    'aggregated_transaction': (path_to_agg_transaction_json, parse_agg_transaction_file),
+    'aggregated_user': (path_to_agg_user_json, parse_agg_user_file),
+    'aggregated_insurance': (path_to_agg_insurance_json, parse_agg_insurance_file),
+    'map_transactions': (path_to_map_transaction_json, parse_map_transaction_file),
+    'map_users': (path_to_map_user_json, parse_map_user_file),
+    'map_insurance': (path_to_map_insurance_json, parse_map_insurance_file),
+    'top_transaction_pincode': (path_to_top_transaction_json, parse_top_transaction_pincode_file),
+    'top_transaction_district': (path_to_top_transaction_json, parse_top_transaction_district_file), # Use the same path as top pincodes
+    'top_user_pincode': (path_to_top_user_json, parse_top_user_pincode_file),
+    'top_user_district': (path_to_top_user_json, parse_top_user_district_file),
+    'top_insurance_pincode': (path_to_top_insurance_json, parse_top_insurance_file),
+}
 
 
-print("Processing aggregated user data...")
-extracted_agg_user_data = process_agg_user_data(path_to_agg_user_json)
-df_agg_user = pd.DataFrame(extracted_agg_user_data)
-print(f"Processed {len(df_agg_user)} rows for aggregated users.")
+def columns_to_dataframe(columns, contract=True):
+    # Same result as pd.DataFrame(extracted_data) on the row list (empty DataFrame when nothing was extracted),
+    # with the shared dtype contract applied unless contract=False (see pulse_dtypes.py)
+    if count_rows(columns) == 0:
+        return pd.DataFrame()
+    df = pd.DataFrame(columns)
+    return apply_dtype_contract(df) if contract else df
 
-#insurance
-print("Processing aggregated insurance data...")
-extracted_agg_insurance_data = process_agg_insurance_data(path_to_agg_insurance_json)
-df_agg_insurance = pd.DataFrame(extracted_agg_insurance_data)
-print(f"Processed {len(df_agg_insurance)} rows for aggregated insurance.")
 
+def print_memory_report(frames, before=None):
+    # In-memory size of each extracted table (see pulse_dtypes.memory_report)
+    print("\n--- DataFrame Memory per Table ---")
+    print(memory_report(frames, before).to_string(index=False))
 
 
-print("Processing map transaction data...")
-extracted_map_transaction_data = process_map_transaction_data(path_to_map_transaction_json)
-df_map_transactions = pd.DataFrame(extracted_map_transaction_data)
-print(f"Processed {len(df_map_transactions)} rows for map transactions.")
+# --- Database Insertion Function ---
 
-print("Processing map user data...")
-extracted_map_user_data = process_map_user_data(path_to_map_user_json) # Use the correct path here
-df_map_user = pd.DataFrame(extracted_map_user_data)
-print(f"Processed {len(df_map_user)} rows for map users.")
+def get_sql_dtypes(df):
+    # Define a mapping from Pandas dtype to SQL dtype
+    dtype_mapping = {
+        'object': types.VARCHAR(255),
+        'category': types.VARCHAR(255), # Dimension columns (pulse_dtypes.py)
+        'int8': types.SMALLINT,         # quarter
+        'int16': types.SMALLINT,        # year
+        'int32': types.INTEGER,
+        'int64': types.BIGINT,
+        'float32': types.FLOAT,
+        'float64': types.FLOAT,
+        'datetime64[ns]': types.DateTime,
+        # Add other dtype mappings as needed
+    }
+    # Map the DataFrame dtypes using the mapping
+    sql_dtypes = {}
+    for col in df.columns:
+         pandas_dtype = str(df[col].dtype)
+         if pandas_dtype in dtype_mapping:
+             sql_dtypes[col] = dtype_mapping[pandas_dtype]
+         else:
+             # Default type or raise an error if an unexpected dtype is found
+             # print(f"Warning: No specific SQL type mapping for dtype {pandas_dtype} in column {col}. Using VARCHAR.")
+             sql_dtypes[col] = types.VARCHAR(255) # Default to VARCHAR for unsupported types
+    return sql_dtypes
+
+
+def create_table(conn, df, table_name, target_name=None, with_indexes=True):
+    """
+    Creates target_name (defaults to table_name) if it does not exist yet.
+    Tables declared in db_schema.py get their typed columns, primary key and (with_indexes) secondary indexes;
+    any other table is created from the DataFrame's columns using get_sql_dtypes.
+    """
+    target_name = target_name or table_name
+    if get_table_schema(table_name):
+        conn.exec_driver_sql(create_table_sql(table_name, target_name, with_indexes=with_indexes, if_not_exists=True))
+    else:
+        df.head(0).to_sql(name=target_name, con=conn, if_exists='append', index=False, dtype=get_sql_dtypes(df))
 
-#insurance
-print("Processing map insurance data...")
-extracted_map_insurance_data = process_map_insurance_data(path_to_map_insurance_json)
-df_map_insurance = pd.DataFrame(extracted_map_insurance_data)
-print(f"Processed {len(df_map_insurance)} rows for map insurance.")
 
-'''
-print("Processing top transaction data...")
-extracted_top_transaction_data = process_top_transaction_data(path_to_top_transaction_json)
-df_top_transaction = pd.DataFrame(extracted_top_transaction_data)
-print(f"Processed {len(df_top_transaction)} rows for top transactions.")
-'''
-print("Processing top transaction pincode data...")
-extracted_top_transaction_pincode_data = process_top_transaction_pincode_data(path_to_top_transaction_json)
-df_top_transaction_pincode = pd.DataFrame(extracted_top_transaction_pincode_data)
-print(f"Processed {len(df_top_transaction_pincode)} rows for top transaction pincodes.")
+def insert_dataframe_to_sql(df, table_name, replace_table=False, method='auto'): # Removed connection_details parameter
+    """
+    Inserts a DataFrame into a table. Returns True on success, False if an error occurred.
+    method: 'auto', 'infile', 'executemany' or 'to_sql' (see bulk_loader.py).
+    """
+    try:
+        # Shared SQLAlchemy engine (imported credentials and encoded password), reused across tables
+        engine = get_engine()
+
+        # Rows repeating a primary key would make the whole load fail
+        df = drop_duplicate_keys(df, table_name)
+
+        if replace_table:
+            # Reload into a shadow table and swap it in atomically, so readers never see a half-loaded table
+            staging_table = staging_table_name(table_name)
+            print(f"Loading data into shadow table: {staging_table} (method='{method}')...")
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f"DROP TABLE IF EXISTS `{staging_table}`")
+                # Load with only the primary key in place, then build the secondary indexes in one pass
+                create_table(conn, df, table_name, staging_table, with_indexes=False)
+                bulk_append(conn, df, staging_table, method)
+                index_sql = add_indexes_sql(table_name, staging_table) if get_table_schema(table_name) else None
+                if index_sql:
+                    print(f"Building indexes on {staging_table}...")
+                    conn.exec_driver_sql(index_sql)
+                swap_in_staging_table(conn, table_name)
+        else:
+            print(f"Inserting data into table: {table_name} (if_exists='append', method='{method}')...")
+            with engine.begin() as conn:
+                # Create the table if it is missing, then bulk-load the rows
+                create_table(conn, df, table_name)
+                bulk_append(conn, df, table_name, method)
+        print(f"Successfully inserted data into table: {table_name}")
+        return True
 
+    except Exception as e:
+        # Print a more specific error if possible, but the general exception catch is fine
+        print(f"An error occurred while inserting into {table_name}: {e}")
+        return False
 
-print("Processing top transaction district data...")
-extracted_top_transaction_district_data = process_top_transaction_district_data(path_to_top_transaction_json) # Use the same path as top pincodes
-df_top_transaction_district = pd.DataFrame(extracted_top_transaction_district_data)
-print(f"Processed {len(df_top_transaction_district)} rows for top transaction districts.")
 
+def upsert_dataframe_slices(df, table_name, slices, method='auto'):
+    """
+    Replaces the given (state_id, year, quarter) slices of an existing table with the rows in df (with surrogate keys).
+    The delete and the insert run in one transaction. Returns True on success.
+    """
+    try:
+        engine = get_engine()
+
+        if not inspect(engine).has_table(table_name):
+            # Table was never loaded (or was dropped) - fall back to a full insert
+            return insert_dataframe_to_sql(df, table_name, replace_table=True, method=method)
+
+        df = drop_duplicate_keys(df, table_name)
+        print(f"Upserting {len(slices)} (state, year, quarter) slices into table: {table_name}...")
+        with engine.begin() as conn:
+            conn.execute(
+                text(f"DELETE FROM {table_name} WHERE state_id = :state_id AND year = :year AND quarter = :quarter"),
+                [{'state_id': state_id, 'year': year, 'quarter': quarter} for state_id, year, quarter in sorted(slices)]
+            )
+            bulk_append(conn, df, table_name, method)
+        print(f"Successfully upserted {len(df)} rows into table: {table_name}")
+        return True
 
-print("Processing top user pincode data...")
-extracted_top_user_pincode_data = process_top_user_pincode_data(path_to_top_user_json)
-df_top_user_pincode = pd.DataFrame(extracted_top_user_pincode_data)
-print(f"Processed {len(df_top_user_pincode)} rows for top user pincode.")
+    except Exception as e:
+        print(f"An error occurred while upserting into {table_name}: {e}")
+        return False
 
-print("Processing top user district data...")
-extracted_top_user_district_data = process_top_user_district_data(path_to_top_user_json)
-df_top_user_district = pd.DataFrame(extracted_top_user_district_data)
-print(f"Processed {len(df_top_user_district)} rows for top user pincode.")
 
-#insurance
-print("Processing top insurance data...")
-extracted_top_insurance_data = process_top_insurance_data(path_to_top_insurance_json)
-df_top_insurance = pd.DataFrame(extracted_top_insurance_data)
-print(f"Processed {len(df_top_insurance)} rows for top insurance.")
 
-print("--- Data Extraction Completed ---")
-# --- Database Insertion Function ---
+# --- Dimension Tables ---
 
-def insert_dataframe_to_sql(df, table_name, replace_table=False): # Removed connection_details parameter
+def read_dimensions():
+    """
+    The dimension tables already in the database (see pulse_dimensions.py); missing ones are left out.
+    Returns None if they could not be read, since new keys must never clash with the loaded ones.
+    """
     try:
-        # Create an SQLAlchemy engine using imported credentials and encoded password
-        # Ensure DB_PORT is included if it's not the default 3306
-        engine = create_engine(f"mysql+mysqlconnector://{DB_USER}:{ENCODED_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_DATABASE}")
-
-        # Define a mapping from Pandas dtype to SQL dtype
-        dtype_mapping = {
-            'object': types.VARCHAR(255),
-            'int64': types.BIGINT,
-            'float64': types.FLOAT,
-            'datetime64[ns]': types.DateTime,
-            # Add other dtype mappings as needed
-        }
-        # Map the DataFrame dtypes using the mapping
-        sql_dtypes = {}
-        for col in df.columns:
-             pandas_dtype = str(df[col].dtype)
-             if pandas_dtype in dtype_mapping:
-                 sql_dtypes[col] = dtype_mapping[pandas_dtype]
-             else:
-                 # Default type or raise an error if an unexpected dtype is found
-                 # print(f"Warning: No specific SQL type mapping for dtype {pandas_dtype} in column {col}. Using VARCHAR.")
-                 sql_dtypes[col] = types.VARCHAR(255) # Default to VARCHAR for unsupported types
-
-
-        # Replace or append to the table as specified
-        if_exists_action = 'replace' if replace_table else 'append'
-
-        print(f"Inserting data into table: {table_name} (if_exists='{if_exists_action}')...")
-        # Use to_sql to insert the data
-        df.to_sql(name=table_name, con=engine, if_exists=if_exists_action, index=False, dtype=sql_dtypes)
-        print(f"Successfully inserted data into table: {table_name}")
+        engine = get_engine()
+        existing_tables = set(inspect(engine).get_table_names())
+        dims = {}
+        with engine.connect() as conn:
+            for dimension, spec in DIMENSIONS.items():
+                if dimension in existing_tables:
+                    dims[dimension] = pd.read_sql(text(f"SELECT {', '.join(spec['columns'])} FROM {dimension}"), conn)
+        return dims
+    except Exception as e:
+        print(f"An error occurred while reading the dimension tables: {e}")
+        return None
+
+
+def write_dimensions(dims, dimensions):
+    """Rewrites the given dimension tables (they are small). Returns the names written, or None if one failed."""
+    for dimension in dimensions:
+        print(f"Writing dimension table {dimension} ({len(dims[dimension])} members)...")
+        if not insert_dataframe_to_sql(dims[dimension], dimension, replace_table=True):
+            return None
+    return list(dimensions)
 
+
+def outdated_tables(table_names):
+    """Tables in the database whose columns differ from their declared schema (e.g. loaded before the star schema)."""
+    try:
+        inspector = inspect(get_engine())
+        existing_tables = set(inspector.get_table_names())
+        outdated = []
+        for table_name in table_names:
+            schema = get_table_schema(table_name)
+            if schema and table_name in existing_tables:
+                columns = [column['name'].lower() for column in inspector.get_columns(table_name)]
+                if columns != [name.lower() for name, _ in schema['columns']]:
+                    outdated.append(table_name)
+        return outdated
     except Exception as e:
-        # Print a more specific error if possible, but the general exception catch is fine
-        print(f"An error occurred while inserting into {table_name}: {e}")
-    finally:
-        # Close the SQLAlchemy engine
-        if 'engine' in locals() and engine:
-             engine.dispose()
+        print(f"An error occurred while checking the table layouts: {e}")
+        return []
 
 
-# --- Insert DataFrames into SQL ---
+# --- Summary Tables ---
+
+def build_summary_table(summary_name):
+    """Rebuilds one summary table (see summary_tables.py) in a shadow table and swaps it in. Returns True on success."""
+    summary = SUMMARY_TABLES[summary_name]
+    staging_table = staging_table_name(summary_name)
+    key_columns = ', '.join(f"`{col}`" for col in summary['primary_key'])
+    try:
+        print(f"Building summary table: {summary_name}...")
+        with get_engine().begin() as conn:
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS `{staging_table}`")
+            conn.exec_driver_sql(
+                f"CREATE TABLE `{staging_table}` (PRIMARY KEY ({key_columns})) ENGINE=InnoDB {summary['select']}"
+            )
+            swap_in_staging_table(conn, summary_name)
+        return True
+    except Exception as e:
+        print(f"An error occurred while building summary table {summary_name}: {e}")
+        return False
+
+
+def refresh_summary_tables(changed_tables):
+    """
+    Rebuilds the summary tables whose source tables changed in this run (and any that are missing).
+    Returns the names of the summary tables that were rebuilt.
+    """
+    existing_tables = set(inspect(get_engine()).get_table_names())
+    rebuilt_tables = []
+    for summary_name in summaries_to_refresh(changed_tables, existing_tables):
+        missing_sources = [table for table in SUMMARY_TABLES[summary_name]['sources'] if table not in existing_tables]
+        if missing_sources:
+            print(f"Skipping summary table {summary_name}: source table(s) {missing_sources} not loaded yet.")
+            continue
+        if build_summary_table(summary_name):
+            rebuilt_tables.append(summary_name)
+    return rebuilt_tables
+
+
+# --- Load Generations ---
+
+def record_load_generations(table_names):
+    """
+    Bumps the load generation of each table in etl_load_generations.
+    The dashboard keys its query cache on these, so only queries reading one of these tables miss afterwards.
+    """
+    if not table_names:
+        return
+    try:
+        with get_engine().begin() as conn:
+            conn.exec_driver_sql(create_table_sql('etl_load_generations', if_not_exists=True))
+            conn.execute(
+                text("INSERT INTO etl_load_generations (table_name, generation, loaded_at) VALUES (:table_name, 1, NOW()) "
+                     "ON DUPLICATE KEY UPDATE generation = generation + 1, loaded_at = NOW()"),
+                [{'table_name': table_name} for table_name in sorted(set(table_names))]
+            )
+        print(f"Recorded new load generation for: {', '.join(sorted(set(table_names)))}")
+    except Exception as e:
+        print(f"An error occurred while recording load generations: {e}")
 
-print("\n--- Starting Database Insertion ---")
 
+# --- Run Extraction and Insertion ---
 
-# Call insert function using imported details directly
-insert_dataframe_to_sql(df_agg_transaction, 'aggregated_transaction', replace_table=True)
-insert_dataframe_to_sql(df_agg_user, 'aggregated_user', replace_table=True)
-insert_dataframe_to_sql(df_agg_insurance, 'aggregated_insurance') # Insert new table
+# Set PULSE_FULL_REFRESH=1 to ignore the manifest and rebuild every table from scratch
+FULL_REFRESH = os.environ.get('PULSE_FULL_REFRESH', '0') == '1'
 
-insert_dataframe_to_sql(df_map_transactions, 'map_transactions', replace_table=True)
-insert_dataframe_to_sql(df_map_user, 'map_users', replace_table=True)
-insert_dataframe_to_sql(df_map_insurance, 'map_insurance', replace_table=True) # Insert new table
 
-#insert_dataframe_to_sql(df_top_transaction, 'top_transactions', replace_table=True)
-insert_dataframe_to_sql(df_top_transaction_pincode, 'top_transaction_pincode', replace_table=True) # Insert into the pincode table
-insert_dataframe_to_sql(df_top_transaction_district, 'top_transaction_district', replace_table=True) # Insert into district table
-insert_dataframe_to_sql(df_top_user_pincode, 'top_user_pincode', replace_table=True)
-insert_dataframe_to_sql(df_top_user_district, 'top_user_district', replace_table=True)
+def load_table(table_name, df, change, previously_loaded, dims):
+    """Loads one table's extracted changes (df, with surrogate keys). Returns True if the table is up to date afterwards."""
+    slices = encode_slices(change['changed_slices'] | change['removed_slices'], dims)
 
-insert_dataframe_to_sql(df_top_insurance, 'top_insurance_pincode', replace_table=True) # Insert new table
+    if not previously_loaded:
+        # First load (or full refresh) - rebuild the whole table
+        return insert_dataframe_to_sql(df, table_name, replace_table=True)
+    if not slices:
+        print(f"No new or changed files for table: {table_name}")
+        return True
+    return upsert_dataframe_slices(df, table_name, slices)
 
 
-print("\n--- Database Insertion Process Completed ---")
\ No newline at end of file
+# Set PULSE_LOAD_FROM_SNAPSHOT=1 to skip the JSON tree and reload every table from its Parquet snapshot
+LOAD_FROM_SNAPSHOT = os.environ.get('PULSE_LOAD_FROM_SNAPSHOT', '0') == '1'
+
+
+def snapshot_table(table_name, df, change, previously_loaded):
+    """Writes one table's extracted changes (df) to its Parquet snapshot (see pulse_snapshots.py)."""
+    slices = change['changed_slices'] | change['removed_slices']
+    try:
+        if not previously_loaded:
+            write_table_snapshot(df, table_name)
+        elif not snapshot_exists(table_name):
+            print(f"Warning: No snapshot of {table_name} to update. Run with PULSE_FULL_REFRESH=1 to create one.")
+        elif slices:
+            update_table_snapshot(df, table_name, slices)
+    except Exception as e:
+        print(f"An error occurred while writing the snapshot of {table_name}: {e}")
+
+
+def run_json_load():
+    """Extracts the new/changed JSON files, snapshots them and loads them. Returns the tables that changed."""
+    manifest = {} if FULL_REFRESH else load_manifest()
+    for table_name in outdated_tables(EXTRACTION_JOBS):
+        if table_name in manifest:
+            print(f"Table {table_name} was loaded with an older layout - reloading it in full.")
+            del manifest[table_name]
+
+    print(f"Processing new or changed Pulse files with {EXTRACT_WORKERS} worker process(es) "
+          f"and the {JSON_DECODER_NAME} JSON decoder...")
+    changes = extract_changed_datasets(EXTRACTION_JOBS, manifest, workers=EXTRACT_WORKERS)
+
+    for table_name, change in changes.items():
+        print(f"Processed {count_rows(change['columns'])} rows for {table_name} "
+              f"({len(change['changed_slices'])} changed, {len(change['removed_slices'])} removed quarter files).")
+
+    print("--- Data Extraction Completed ---")
+
+    # One DataFrame per table, shared by the snapshot and the database load
+    frames, before = {}, {}
+    for table_name, change in changes.items():
+        df = columns_to_dataframe(change.pop('columns'), contract=False) # The column lists are not needed after this
+        before[table_name] = frame_memory(df)
+        frames[table_name] = apply_dtype_contract(df)
+    print_memory_report(frames, before)
+
+    if snapshots_available():
+        print("\n--- Writing Parquet Snapshots ---")
+        for table_name, change in changes.items():
+            snapshot_table(table_name, frames[table_name], change, table_name in manifest)
+    else:
+        print("pyarrow is not installed - skipping Parquet snapshots.")
+
+    # --- Insert DataFrames into SQL ---
+
+    print("\n--- Starting Database Insertion ---")
+
+    # New states, districts, brands, ... get their keys first, so every fact row has one
+    dims = read_dimensions()
+    if dims is None:
+        print("Skipping the database load: the dimension tables could not be read.")
+        return []
+    dims, new_dimensions = update_dimensions(dims, frames)
+    changed_tables = write_dimensions(dims, new_dimensions)
+    if changed_tables is None:
+        print("Skipping the fact tables: a dimension table could not be written.")
+        return []
+
+    for table_name, change in changes.items():
+        previously_loaded = table_name in manifest
+        df = encode_dimension_keys(frames[table_name], table_name, dims)
+        if load_table(table_name, df, change, previously_loaded, dims):
+            # Only record the files once they are safely in the database
+            manifest[table_name] = change['files']
+            save_manifest(manifest)
+            if not previously_loaded or change['changed_slices'] or change['removed_slices']:
+                changed_tables.append(table_name)
+    return changed_tables
+
+
+def run_snapshot_load():
+    """Reloads every table from its Parquet snapshot, without reading any JSON. Returns the tables that were loaded."""
+    if not snapshots_available():
+        print("Error: PULSE_LOAD_FROM_SNAPSHOT=1 needs pyarrow installed.")
+        return []
+
+    print("\n--- Loading Tables from Parquet Snapshots ---")
+    dims = read_dimensions()
+    if dims is None:
+        print("Skipping the database load: the dimension tables could not be read.")
+        return []
+    # First pass: every dimension member, so the dimension tables are written before the facts that use them
+    new_dimensions = set()
+    for table_name in EXTRACTION_JOBS:
+        df = read_table_snapshot(table_name)
+        if df is not None:
+            dims, added = update_dimensions(dims, {table_name: df})
+            new_dimensions.update(added)
+    changed_tables = write_dimensions(dims, [dimension for dimension in DIMENSIONS if dimension in new_dimensions])
+    if changed_tables is None:
+        print("Skipping the fact tables: a dimension table could not be written.")
+        return []
+
+    for table_name in EXTRACTION_JOBS:
+        df = read_table_snapshot(table_name)
+        if df is None:
+            print(f"No snapshot found for table: {table_name}. Skipping.")
+            continue
+        # Partitions with different categories come back as plain strings
+        df = apply_dtype_contract(df)
+        print(f"Read {len(df)} rows for {table_name} from its snapshot ({frame_memory(df) / 2**20:.2f} MB in memory).")
+        if insert_dataframe_to_sql(encode_dimension_keys(df, table_name, dims), table_name, replace_table=True):
+            changed_tables.append(table_name)
+    return changed_tables
+
+
+if __name__ == '__main__':
+    changed_tables = run_snapshot_load() if LOAD_FROM_SNAPSHOT else run_json_load()
+
+    print("\n--- Refreshing Summary Tables ---")
+    rebuilt_tables = refresh_summary_tables(changed_tables)
+
+    # Tell the dashboard which tables changed, so only the cached results that read them are refreshed
+    record_load_generations(changed_tables + rebuilt_tables)
+
+    dispose_engine()
+
+    print("\n--- Database Insertion Process Completed ---")
@@ -0,0 +1,201 @@
+# db_schema.py
+# Declared MySQL schema for the Pulse tables loaded by data_extraction.py.
+#
+# Column names match the DataFrame columns produced by the extraction functions
+# (MySQL column names are case-insensitive, so the dashboard queries can keep using lowercase names),
+# with state, district, brand and transaction type stored as surrogate keys of the
+# dimension tables (see pulse_dimensions.py).
+# Each table gets a composite primary key on its natural key and secondary indexes
+# covering the dashboard's filters and GROUP BYs.
+
+# Shared column types
+STATE = 'VARCHAR(64) NOT NULL'       # state slugs, e.g. 'dadra-&-nagar-haveli-&-daman-&-diu'
+DISTRICT = 'VARCHAR(100) NOT NULL'
+STATE_ID = 'SMALLINT NOT NULL'       # dim_state key
+DISTRICT_ID = 'INT NOT NULL'         # dim_district key
+SMALL_ID = 'SMALLINT NOT NULL'       # dim_brand / dim_transaction_type keys
+YEAR = 'SMALLINT NOT NULL'
+QUARTER = 'TINYINT NOT NULL'
+COUNT = 'BIGINT'
+AMOUNT = 'DOUBLE'                    # FLOAT (single precision) loses digits on large rupee amounts
+
+
+TABLE_SCHEMAS = {
+    'aggregated_transaction': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('transaction_type_id', SMALL_ID),
+                    ('TransactionCount', COUNT), ('TransactionAmount', AMOUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'transaction_type_id'),
+        'indexes': {
+            # year = .. AND quarter = .. GROUP BY state (extreme states, district vs state totals)
+            'idx_period_state': ('Year', 'Quarter', 'state_id', 'TransactionCount', 'TransactionAmount'),
+            # GROUP BY year, quarter, transactiontype (overview and popular transaction types)
+            'idx_period_type': ('Year', 'Quarter', 'transaction_type_id', 'TransactionCount', 'TransactionAmount'),
+        },
+    },
+    'aggregated_user': {
+        'columns': [('state_id', STATE_ID), ('year', YEAR), ('quarter', QUARTER), ('brand_id', SMALL_ID),
+                    ('count', COUNT), ('percentage', 'DOUBLE'), ('registeredUsers', COUNT)],
+        'primary_key': ('state_id', 'year', 'quarter', 'brand_id'),
+        'indexes': {
+            # GROUP BY brand (registered users by brand, lowest brands)
+            'idx_brand': ('brand_id', 'registeredUsers', 'count'),
+        },
+    },
+    'aggregated_insurance': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('InsuranceType', 'VARCHAR(32) NOT NULL'),
+                    ('InsuranceCount', COUNT), ('InsuranceAmount', AMOUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'InsuranceType'),
+        'indexes': {
+            # year = .. AND quarter = .. GROUP BY state (top insurance states)
+            'idx_period_state': ('Year', 'Quarter', 'state_id', 'InsuranceCount'),
+        },
+    },
+    'map_transactions': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('district_id', DISTRICT_ID),
+                    ('TransactionCount', COUNT), ('TransactionAmount', AMOUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'district_id'),
+        'indexes': {
+            # SELECT DISTINCT district WHERE state = .. ORDER BY district
+            'idx_state_district': ('state_id', 'district_id'),
+            # year = .. AND quarter = .. filters across states
+            'idx_period_state': ('Year', 'Quarter', 'state_id', 'TransactionCount', 'TransactionAmount'),
+        },
+    },
+    'map_users': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('district_id', DISTRICT_ID),
+                    ('RegisteredUsers', COUNT), ('AppOpens', COUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'district_id'),
+        'indexes': {
+            # GROUP BY state over registered users / app opens (app open rates)
+            'idx_state_engagement': ('state_id', 'RegisteredUsers', 'AppOpens'),
+        },
+    },
+    'map_insurance': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('district_id', DISTRICT_ID),
+                    ('InsuranceCount', COUNT), ('InsuranceAmount', AMOUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'district_id'),
+        'indexes': {},
+    },
+    'top_transaction_pincode': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('Pincode', 'INT NOT NULL'),
+                    ('TransactionCount', COUNT), ('TransactionAmount', AMOUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'Pincode'),
+        'indexes': {},
+    },
+    'top_transaction_district': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('district_id', DISTRICT_ID),
+                    ('TransactionCount', COUNT), ('TransactionAmount', AMOUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'district_id'),
+        'indexes': {},
+    },
+    'top_user_pincode': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('District', DISTRICT), # holds the pincode
+                    ('RegisteredUsers', COUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'District'),
+        'indexes': {},
+    },
+    'top_user_district': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('district_id', DISTRICT_ID),
+                    ('RegisteredUsers', COUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'district_id'),
+        'indexes': {},
+    },
+    'top_insurance_pincode': {
+        'columns': [('state_id', STATE_ID), ('Year', YEAR), ('Quarter', QUARTER), ('Pincode', 'VARCHAR(16) NOT NULL'),
+                    ('InsuranceCount', COUNT), ('InsuranceAmount', AMOUNT)],
+        'primary_key': ('state_id', 'Year', 'Quarter', 'Pincode'),
+        'indexes': {
+            # GROUP BY pincode (pincodes with the highest insurance transactions)
+            'idx_pincode': ('Pincode', 'InsuranceCount', 'InsuranceAmount'),
+        },
+    },
+    # Dimension tables (see pulse_dimensions.py). Keys are assigned by data_extraction.py and never reused.
+    'dim_state': {
+        'columns': [('state_id', STATE_ID), ('state', STATE), ('state_name', 'VARCHAR(64) NOT NULL')],
+        'primary_key': ('state_id',),
+        'indexes': {
+            # state = .. (dropdown selections arrive as slugs)
+            'idx_state': ('state',),
+        },
+    },
+    'dim_district': {
+        'columns': [('district_id', DISTRICT_ID), ('state_id', STATE_ID), ('district', DISTRICT)],
+        'primary_key': ('district_id',),
+        'indexes': {
+            'idx_state_district': ('state_id', 'district'),
+        },
+    },
+    'dim_brand': {
+        'columns': [('brand_id', SMALL_ID), ('brand', 'VARCHAR(64) NOT NULL')],
+        'primary_key': ('brand_id',),
+        'indexes': {},
+    },
+    'dim_transaction_type': {
+        'columns': [('transaction_type_id', SMALL_ID), ('transactiontype', 'VARCHAR(64) NOT NULL')],
+        'primary_key': ('transaction_type_id',),
+        'indexes': {},
+    },
+    'dim_period': {
+        'columns': [('period_id', 'SMALLINT NOT NULL'), ('year', YEAR), ('quarter', QUARTER), ('period', 'VARCHAR(8) NOT NULL')],
+        'primary_key': ('period_id',),
+        'indexes': {},
+    },
+    # Written by data_extraction.py after every load: generation goes up by one each time a table's contents change,
+    # so the dashboard can tell which of its cached query results are stale.
+    'etl_load_generations': {
+        'columns': [('table_name', 'VARCHAR(64) NOT NULL'), ('generation', 'BIGINT NOT NULL'),
+                    ('loaded_at', 'DATETIME NOT NULL')],
+        'primary_key': ('table_name',),
+        'indexes': {},
+    },
+}
+
+
+def _quote(name):
+    return f"`{name}`"
+
+
+def get_table_schema(table_name):
+    """Declared schema of a table, or None if the table has no declared schema."""
+    return TABLE_SCHEMAS.get(table_name)
+
+
+def create_table_sql(table_name, target_name=None, with_indexes=True, if_not_exists=False):
+    """
+    CREATE TABLE statement for a declared table.
+    target_name: create the table under another name (e.g. the staging table), with the same definition.
+    with_indexes: leave out the secondary indexes, so they can be built after a bulk load instead.
+    """
+    schema = TABLE_SCHEMAS[table_name]
+    definitions = [f"{_quote(name)} {sql_type}" for name, sql_type in schema['columns']]
+    definitions.append(f"PRIMARY KEY ({', '.join(_quote(col) for col in schema['primary_key'])})")
+    if with_indexes:
+        for index_name, columns in schema['indexes'].items():
+            definitions.append(f"INDEX {_quote(index_name)} ({', '.join(_quote(col) for col in columns)})")
+    exists_clause = 'IF NOT EXISTS ' if if_not_exists else ''
+    return (f"CREATE TABLE {exists_clause}{_quote(target_name or table_name)} (\n    "
+            + ",\n    ".join(definitions)
+            + "\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4")
+
+
+def add_indexes_sql(table_name, target_name=None):
+    """ALTER TABLE statement adding all secondary indexes of a declared table (None if it has none)."""
+    indexes = TABLE_SCHEMAS[table_name]['indexes']
+    if not indexes:
+        return None
+    clauses = [f"ADD INDEX {_quote(index_name)} ({', '.join(_quote(col) for col in columns)})"
+               for index_name, columns in indexes.items()]
+    return f"ALTER TABLE {_quote(target_name or table_name)} " + ", ".join(clauses)
+
+
+def drop_duplicate_keys(df, table_name):
+    """Drops rows that would violate the table's primary key (keeps the last one), reporting how many."""
+    schema = TABLE_SCHEMAS.get(table_name)
+    if schema is None or df.empty:
+        return df
+    key = [col for col in schema['primary_key'] if col in df.columns]
+    duplicated = df.duplicated(subset=key, keep='last')
+    if duplicated.any():
+        print(f"Warning: Dropping {int(duplicated.sum())} rows with a duplicate {tuple(key)} key in {table_name}")
+        df = df[~duplicated]
+    return df
@@ -0,0 +1,94 @@
+# duckdb_backend.py
+# Embedded (in-process) query backend for the dashboard: a DuckDB database built
+# from the Parquet snapshots written by data_extraction.py (see pulse_snapshots.py).
+#
+# The snapshots keep the names, so the dimension tables of pulse_dimensions.py are
+# derived from them in memory, and every Pulse table becomes a view over its snapshot
+# files with the same surrogate keys as the MySQL load. The summary tables from
+# summary_tables.py are computed in memory too, and etl_load_generations is filled from
+# the snapshot file times, so the dashboard (dashboard_core.py) can run its queries
+# unchanged and without a MySQL server. Needs the duckdb package.
+
+import os
+
+try:
+    import duckdb
+except ImportError: # Optional dependency
+    duckdb = None
+
+from pulse_snapshots import SNAPSHOT_DIR
+from summary_tables import SUMMARY_TABLES
+from pulse_dimensions import DIMENSIONS, FACT_DIMENSIONS, dimension_sql, fact_view_sql
+# Same table names as the MySQL load
+from db_schema import TABLE_SCHEMAS
+
+
+def duckdb_available():
+    """True if the duckdb package is installed."""
+    return duckdb is not None
+
+
+def snapshot_versions(snapshot_dir=SNAPSHOT_DIR):
+    """
+    Table name -> version of its snapshot (latest modification time of its files, in ns).
+    Tables without a snapshot are left out.
+    """
+    versions = {}
+    for table_name in TABLE_SCHEMAS:
+        table_dir = os.path.join(snapshot_dir, table_name)
+        latest = 0
+        for root, _, files in os.walk(table_dir):
+            for file_name in files:
+                if file_name.endswith('.parquet'):
+                    latest = max(latest, os.stat(os.path.join(root, file_name)).st_mtime_ns)
+        if latest:
+            versions[table_name] = latest
+    return versions
+
+
+def open_snapshot_database(snapshot_dir=SNAPSHOT_DIR):
+    """
+    Builds an in-memory DuckDB database over the snapshots in snapshot_dir.
+    Returns the connection; use connection.cursor() for a per-thread handle.
+    """
+    if duckdb is None:
+        raise ImportError("The duckdb query backend needs the duckdb package (pip install duckdb).")
+
+    conn = duckdb.connect(database=':memory:')
+    versions = snapshot_versions(snapshot_dir)
+
+    # Snapshot views, with the names (snapshot_<table>)
+    table_columns = {}
+    for table_name in versions:
+        files = os.path.join(snapshot_dir, table_name, '*', '*', 'data.parquet').replace(os.sep, '/')
+        # Every file holds all columns (year/quarter included), so directory names are not parsed as columns
+        source = f"read_parquet('{files}', hive_partitioning = false, union_by_name = true)"
+        # DuckDB keeps the stored spelling ('Year', 'State') in result columns, MySQL the one used in the query,
+        # so the views use lowercase names to give the dashboard the same column names as on MySQL
+        columns = [row[0] for row in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()]
+        select_list = ', '.join(f'"{col}" AS "{col.lower()}"' for col in columns)
+        conn.execute(f"CREATE VIEW snapshot_{table_name} AS SELECT {select_list} FROM {source}")
+        table_columns[table_name] = [col.lower() for col in columns]
+
+    # Dimension tables (small, so they are materialized), from every snapshot holding their members
+    for dimension in DIMENSIONS:
+        sources = [table for table, dimensions in FACT_DIMENSIONS.items()
+                   if table in versions and (dimension == 'dim_period' or dimension in dimensions)]
+        if sources:
+            conn.execute(f"CREATE TABLE {dimension} AS "
+                         f"{dimension_sql(dimension, [f'snapshot_{table}' for table in sources])}")
+            versions[dimension] = max(versions[table] for table in sources)
+
+    # The Pulse tables as MySQL has them: surrogate keys instead of the names
+    for table_name, columns in table_columns.items():
+        conn.execute(f"CREATE VIEW {table_name} AS {fact_view_sql(table_name, f'snapshot_{table_name}', columns)}")
+
+    for summary_name, summary in SUMMARY_TABLES.items():
+        if all(table in versions for table in summary['sources']):
+            conn.execute(f"CREATE TABLE {summary_name} AS {summary['select']}")
+            versions[summary_name] = max(versions[table] for table in summary['sources'])
+
+    conn.execute("CREATE TABLE etl_load_generations (table_name VARCHAR PRIMARY KEY, generation BIGINT)")
+    if versions:
+        conn.executemany("INSERT INTO etl_load_generations VALUES (?, ?)", sorted(versions.items()))
+    return conn
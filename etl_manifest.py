@@ -0,0 +1,115 @@
+# etl_manifest.py
+# Persistent manifest of the Pulse quarter files already loaded into each table,
+# so later runs only parse and upsert the files that are new or have changed.
+#
+# Manifest layout (JSON):
+#   {table_name: {quarter_path: {"mtime": ..., "size": ..., "sha256": ...}}}
+
+import json
+import os
+
+from extraction_engine import list_quarter_files, merge_batches, run_tasks
+
+
+# Location of the manifest file. Override with the PULSE_MANIFEST_PATH environment variable.
+MANIFEST_PATH = os.environ.get('PULSE_MANIFEST_PATH', 'pulse_manifest.json')
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Loads the manifest. Returns an empty manifest if the file does not exist or is unreadable."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read manifest {path} ({e}). Treating every file as new.")
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Writes the manifest atomically (temp file + rename) so a crash never leaves it half-written."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def quarter_slice(state, year, quarter_file):
+    """(state, year, quarter) key of a quarter file, or None if the year/quarter are not numeric."""
+    try:
+        return state, int(year), int(quarter_file.split('.')[0])
+    except ValueError:
+        return None
+
+
+def extract_changed_datasets(jobs, manifest, workers=None):
+    """
+    Like extraction_engine.extract_datasets, but only parses files that are new or changed
+    compared to the manifest.
+
+    A file whose mtime and size match its manifest entry is skipped without being read.
+    Otherwise it is parsed (and hashed) on the process pool; if only its mtime changed but
+    the content hash is the same, its rows are discarded. A file needed by several datasets
+    (e.g. top/transaction) is read and decoded once for all of them.
+
+    Returns a dict of dataset name -> {
+        'columns': merged columns of the new/changed files,
+        'changed_slices': set of (state, year, quarter) to replace,
+        'removed_slices': set of (state, year, quarter) whose file disappeared,
+        'files': the table's manifest section to save once the load succeeded,
+    }
+    """
+    listings = {}
+    pending = {} # quarter_path -> (state, year, quarter_file, names of the datasets that need it)
+    results = {}
+    for name, (path, _) in jobs.items():
+        if path not in listings:
+            listings[path] = list_quarter_files(path)
+        known_files = manifest.get(name, {})
+        files = {}
+        for state, year, quarter_file, quarter_path in listings[path]:
+            stat = os.stat(quarter_path)
+            entry = known_files.get(quarter_path)
+            if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                files[quarter_path] = entry
+                continue
+            files[quarter_path] = {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': None}
+            pending.setdefault(quarter_path, (state, year, quarter_file, []))[3].append(name)
+
+        removed_slices = set()
+        for quarter_path in known_files.keys() - files.keys():
+            year_path, quarter_file = os.path.split(quarter_path)
+            state_path, year = os.path.split(year_path)
+            quarter_key = quarter_slice(os.path.basename(state_path), year, quarter_file)
+            if quarter_key:
+                removed_slices.add(quarter_key)
+
+        results[name] = {'columns': {}, 'changed_slices': set(), 'removed_slices': removed_slices, 'files': files}
+
+    tasks = []
+    owners = []
+    for quarter_path, (state, year, quarter_file, names) in pending.items():
+        tasks.append((tuple(jobs[name][1] for name in names), state, year, quarter_file, quarter_path, True))
+        owners.append((names, quarter_path, quarter_slice(state, year, quarter_file)))
+
+    for (names, quarter_path, quarter_key), (digest, batches) in zip(owners, run_tasks(tasks, workers)):
+        for name, batch in zip(names, batches):
+            result = results[name]
+            old_entry = manifest.get(name, {}).get(quarter_path)
+            if digest is None:
+                # Could not be read (e.g. a transient OSError): keep the previous entry (or none), so the
+                # next run tries the file again, and leave its slice as it was loaded
+                if old_entry:
+                    result['files'][quarter_path] = old_entry
+                else:
+                    del result['files'][quarter_path]
+                continue
+            result['files'][quarter_path]['sha256'] = digest
+            if old_entry and old_entry.get('sha256') == digest:
+                continue # Touched but identical content - nothing to reload
+            merge_batches(result['columns'], batch)
+            if quarter_key:
+                result['changed_slices'].add(quarter_key)
+
+    return results
@@ -0,0 +1,166 @@
+# extraction_engine.py
+# Shared engine for walking the Pulse state/year/quarter tree and parsing the
+# quarter JSON files in parallel.
+#
+# Each dataset provides a parser: a module-level function taking
+# (state, year, quarter_file, quarter_path, data) - data being the file's decoded
+# JSON document - and returning a column batch, i.e. a dict of column name -> list
+# of values for that one file.
+# The engine lists every tree once, fans the files out to a process pool and
+# merges the batches back together in the original os.listdir order. Each file is
+# read and decoded once, and the document is handed to every dataset built from
+# that tree (e.g. top/transaction feeds both the pincode and the district tables).
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Pluggable JSON decoder (orjson / simdjson when installed, stdlib json otherwise)
+from pulse_json import get_decoder
+
+
+# Number of worker processes used to parse the quarter files.
+# Override with the PULSE_EXTRACT_WORKERS environment variable (1 = no pool, parse in this process).
+EXTRACT_WORKERS = int(os.environ.get('PULSE_EXTRACT_WORKERS', os.cpu_count() or 1))
+
+# Decoder for the quarter files, chosen with PULSE_JSON_DECODER (see pulse_json.py).
+# Worker processes import this module too, so they resolve the same decoder.
+JSON_DECODER_NAME, decode_json = get_decoder()
+
+
+# --- Column Batch Helpers ---
+
+def new_batch(*column_names):
+    """Creates an empty column batch with the given column names (in order)."""
+    return {name: [] for name in column_names}
+
+
+def add_row(batch, *values):
+    """Appends one row to a column batch. Values must follow the batch's column order."""
+    for column, value in zip(batch.values(), values):
+        column.append(value)
+
+
+def merge_batches(columns, batch):
+    """Extends the merged columns with the values of one batch."""
+    if not batch:
+        return columns
+    for name, values in batch.items():
+        columns.setdefault(name, []).extend(values)
+    return columns
+
+
+def count_rows(columns):
+    """Number of rows held in a merged column dict."""
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+def columns_to_rows(columns):
+    """Converts merged columns back into the list-of-dicts format used by the process_* functions."""
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+# --- Tree Listing ---
+
+def list_quarter_files(path):
+    """
+    Lists every quarter JSON file under a Pulse 'state' directory.
+    Returns (state, year, quarter_file, quarter_path) tuples in os.listdir order.
+    Year and quarter are left as strings - validating them is up to each parser.
+    """
+    quarter_files = []
+    if not os.path.isdir(path):
+        print(f"Error: Base path not found or not a directory: {path}")
+        return quarter_files
+
+    for state in os.listdir(path):
+        state_path = os.path.join(path, state)
+        if os.path.isdir(state_path):
+            for year in os.listdir(state_path):
+                year_path = os.path.join(state_path, year)
+                if os.path.isdir(year_path):
+                    for quarter_file in os.listdir(year_path):
+                        if quarter_file.endswith('.json'):
+                            quarter_files.append((state, year, quarter_file, os.path.join(year_path, quarter_file)))
+    return quarter_files
+
+
+# --- Parallel Extraction ---
+
+def read_quarter_file(quarter_path, with_digest=False, decode=None):
+    """
+    Reads a quarter file in one call and decodes the raw bytes (with decode, default: the configured decoder).
+    Returns (SHA-256 of the content or None, decoded document or None if it could not be read/decoded).
+    """
+    try:
+        with open(quarter_path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        print(f"Error reading file {quarter_path}: {e}")
+        return None, None
+    digest = hashlib.sha256(raw).hexdigest() if with_digest else None
+    try:
+        return digest, (decode or decode_json)(raw)
+    except ValueError as e: # Invalid JSON or text encoding
+        print(f"Error decoding JSON in file {quarter_path}: {e}")
+        return digest, None
+
+
+def _parse_task(task):
+    # Runs in the worker process. Parsers must be module-level functions so they can be pickled.
+    # Returns (content digest or None, one column batch per parser).
+    parsers, state, year, quarter_file, quarter_path, with_digest = task
+    digest, data = read_quarter_file(quarter_path, with_digest)
+    if data is None:
+        return digest, [{} for _ in parsers]
+    return digest, [parser(state, year, quarter_file, quarter_path, data) for parser in parsers]
+
+
+def run_tasks(tasks, workers=None):
+    """
+    Runs parse tasks - (parsers, state, year, quarter_file, quarter_path, with_digest) tuples -
+    on the process pool. Each file is read and decoded once and passed to all of its parsers.
+    Returns the (digest, batches) results in task order.
+    """
+    workers = EXTRACT_WORKERS if workers is None else workers
+    if workers <= 1 or len(tasks) < 2:
+        return list(map(_parse_task, tasks))
+    # A few chunks per worker keeps the pool busy without pickling one task at a time
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_task, tasks, chunksize=chunksize))
+
+
+def extract_datasets(jobs, workers=None):
+    """
+    Extracts several datasets in one pass of the process pool.
+
+    jobs: dict of dataset name -> (base_path, parser)
+    workers: number of worker processes (defaults to EXTRACT_WORKERS)
+
+    Returns a dict of dataset name -> merged columns (dict of column name -> list).
+    Trees shared by several datasets (e.g. top/transaction) are only listed, read and decoded once.
+    """
+    datasets_by_path = {}
+    for name, (path, _) in jobs.items():
+        datasets_by_path.setdefault(path, []).append(name)
+
+    tasks = []
+    owners = []
+    for path, names in datasets_by_path.items():
+        parsers = tuple(jobs[name][1] for name in names)
+        for state, year, quarter_file, quarter_path in list_quarter_files(path):
+            tasks.append((parsers, state, year, quarter_file, quarter_path, False))
+            owners.append(names)
+
+    extracted = {name: {} for name in jobs}
+    for names, (_, batches) in zip(owners, run_tasks(tasks, workers)):
+        for name, batch in zip(names, batches):
+            merge_batches(extracted[name], batch)
+    return extracted
+
+
+def extract_columns(path, parser, workers=None):
+    """Extracts a single dataset. Returns merged columns (dict of column name -> list)."""
+    return extract_datasets({path: (path, parser)}, workers)[path]
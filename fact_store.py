@@ -0,0 +1,122 @@
+# fact_store.py
+# In-memory store of the core fact tables for the dashboard.
+#
+# The fact tables are fetched once, indexed by (year, quarter, state_id) and kept for
+# the whole server process (dashboard_core.py holds it with st.cache_resource), so views
+# that only change the year/quarter/state selection are answered with pandas
+# lookups instead of a database round trip. The store holds the surrogate keys
+# (see pulse_dimensions.py); names are only looked up for the rows a view returns.
+#
+# Every function returns a DataFrame with the same columns as the SQL query it replaces.
+
+import pandas as pd
+
+
+PERIOD_STATE = ['year', 'quarter', 'state_id']
+
+
+def build_fact_store(transactions, district_transactions, insurance, dim_state, dim_district):
+    """
+    Builds the store from the raw fact tables (lowercase column names, surrogate keys):
+    transactions: aggregated_transaction, district_transactions: map_transactions, insurance: aggregated_insurance,
+    dim_state / dim_district: the dimensions giving the state and district names.
+    Returns a dict of name -> DataFrame sorted by its (year, quarter, state_id[, ...]) index,
+    plus the key <-> name lookups.
+    """
+    store = {}
+    store['state_names'] = pd.Series(dim_state['state'].to_numpy(dtype=object), index=dim_state['state_id'])
+    store['state_ids'] = pd.Series(dim_state['state_id'].to_numpy(), index=dim_state['state'].to_numpy(dtype=object))
+    store['district_names'] = pd.Series(dim_district['district'].to_numpy(dtype=object), index=dim_district['district_id'])
+    # Per-state totals of each quarter (highest/lowest states, state side of district vs state)
+    store['state_totals'] = (
+        transactions.groupby(PERIOD_STATE, observed=True)[['transactioncount', 'transactionamount']].sum()
+        .rename(columns={'transactioncount': 'total_volume', 'transactionamount': 'total_value'})
+        .sort_index()
+    )
+    # District totals of each quarter
+    store['district_totals'] = (
+        district_transactions.groupby(PERIOD_STATE + ['district_id'], observed=True)[['transactioncount', 'transactionamount']].sum()
+        .rename(columns={'transactioncount': 'district_total_volume', 'transactionamount': 'district_total_value'})
+        .sort_index()
+    )
+    # Insurance transactions per state of each quarter
+    store['insurance_totals'] = (
+        insurance.groupby(PERIOD_STATE, observed=True)[['insurancecount']].sum()
+        .rename(columns={'insurancecount': 'total_insurance_transactions'})
+        .sort_index()
+    )
+    return store
+
+
+def _period_slice(frame, year, quarter):
+    # Rows of one (year, quarter), indexed by the remaining index levels. Empty if the period is unknown.
+    try:
+        return frame.loc[(year, quarter)]
+    except KeyError:
+        return frame.iloc[0:0].droplevel(['year', 'quarter'])
+
+
+def _with_state_names(totals, store):
+    # state_id column -> state column (the slug), in the same place
+    totals.insert(0, 'state', totals.pop('state_id').map(store['state_names']))
+    return totals
+
+
+def state_totals(store, year, quarter):
+    """Per-state transaction volume and value of one quarter (columns: state, total_volume, total_value)."""
+    return _with_state_names(_period_slice(store['state_totals'], year, quarter).reset_index(), store)
+
+
+def rank_extremes(totals, metrics, n=1):
+    """
+    Top-n and bottom-n rows of totals for each metric column, from a single fetch of the totals.
+    Returns a dict of (metric, 'highest' | 'lowest') -> DataFrame (all columns of totals, best/worst first).
+    Rows where the metric is missing (e.g. a ratio with a zero denominator) are left out.
+    """
+    extremes = {}
+    for metric in metrics:
+        if metric not in totals.columns: # Nothing loaded
+            extremes[(metric, 'highest')] = extremes[(metric, 'lowest')] = pd.DataFrame(columns=totals.columns)
+            continue
+        ranked = totals.assign(**{metric: pd.to_numeric(totals[metric], errors='coerce')}).dropna(subset=[metric])
+        extremes[(metric, 'highest')] = ranked.nlargest(n, metric).reset_index(drop=True)
+        extremes[(metric, 'lowest')] = ranked.nsmallest(n, metric).reset_index(drop=True)
+    return extremes
+
+
+def period_extremes(store, year, quarter, n=1):
+    """Highest/lowest n states by total_volume and total_value in one quarter (see rank_extremes)."""
+    return rank_extremes(state_totals(store, year, quarter), ['total_volume', 'total_value'], n)
+
+
+DISTRICT_BENCHMARK_COLUMNS = ['state', 'district', 'district_total_volume', 'district_total_value',
+                              'state_total_volume', 'state_total_value', 'volume_share', 'value_share']
+
+
+def district_benchmark(store, year, quarter, state):
+    """
+    Every district of a state for one quarter next to the state's totals, with each district's share of them
+    (same columns as SQL_QUERY_DISTRICT_VS_STATE), highest volume first. Empty if the state has no data.
+    """
+    try:
+        state_id = store['state_ids'][state]
+        districts = _period_slice(store['district_totals'], year, quarter).loc[state_id]
+        state_row = store['state_totals'].loc[(year, quarter, state_id)]
+    except KeyError:
+        return pd.DataFrame(columns=DISTRICT_BENCHMARK_COLUMNS)
+    benchmark = districts.reset_index()
+    benchmark.insert(0, 'district', benchmark.pop('district_id').map(store['district_names']))
+    benchmark.insert(0, 'state', state)
+    benchmark['state_total_volume'] = state_row['total_volume']
+    benchmark['state_total_value'] = state_row['total_value']
+    benchmark['volume_share'] = benchmark['district_total_volume'] / state_row['total_volume'] if state_row['total_volume'] else None
+    benchmark['value_share'] = benchmark['district_total_value'] / state_row['total_value'] if state_row['total_value'] else None
+    return (benchmark[DISTRICT_BENCHMARK_COLUMNS]
+            .sort_values('district_total_volume', ascending=False, kind='stable')
+            .reset_index(drop=True))
+
+
+def insurance_states(store, year, quarter):
+    """States by insurance transactions in one quarter, highest first (columns: state, total_insurance_transactions)."""
+    totals = _with_state_names(_period_slice(store['insurance_totals'], year, quarter).reset_index(), store)
+    return totals.sort_values('total_insurance_transactions', ascending=False, kind='stable').reset_index(drop=True)
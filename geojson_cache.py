@@ -0,0 +1,158 @@
+# geojson_cache.py
+# Lighter India state geometry for the dashboard's choropleths.
+#
+# The full-resolution GeoJSON is simplified (Douglas-Peucker, tolerance in degrees),
+# its coordinates are rounded to a fixed number of decimals, and every feature
+# property except the ones the maps use is dropped. The result is written next to
+# the other caches on disk, keyed by the source file and the settings, so the work
+# is done once per GeoJSON file rather than on every server start.
+
+import hashlib
+import json
+import os
+
+
+# Directory of the simplified GeoJSON files. Override with the PHONEPE_GEOJSON_CACHE_DIR environment variable.
+GEOJSON_CACHE_DIR = os.environ.get('PHONEPE_GEOJSON_CACHE_DIR', 'geojson_cache')
+
+# A ring needs 4 positions (first = last) to stay a polygon
+MIN_RING_POINTS = 4
+
+
+# --- Geometry Simplification ---
+
+def _point_line_distance(point, start, end):
+    # Distance from point to the segment start-end (planar, in coordinate units)
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+    t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+    return ((x - x1 - t * dx) ** 2 + (y - y1 - t * dy) ** 2) ** 0.5
+
+
+def simplify_line(points, tolerance):
+    """Douglas-Peucker simplification of a list of [x, y] positions (first and last are always kept)."""
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)] # Iterative, so long borders do not hit the recursion limit
+    while stack:
+        first, last = stack.pop()
+        max_distance, max_index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _point_line_distance(points[i], points[first], points[last])
+            if distance > max_distance:
+                max_distance, max_index = distance, i
+        if max_index is not None and max_distance > tolerance:
+            keep[max_index] = True
+            stack.append((first, max_index))
+            stack.append((max_index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def quantize_line(points, precision):
+    """Rounds positions to precision decimals (x, y only) and drops consecutive duplicates."""
+    quantized = []
+    for point in points:
+        rounded = [round(point[0], precision), round(point[1], precision)]
+        if not quantized or rounded != quantized[-1]:
+            quantized.append(rounded)
+    return quantized
+
+
+def simplify_ring(ring, tolerance, precision):
+    """Simplified and quantized polygon ring. Small rings (islands) that would collapse are only quantized."""
+    simplified = quantize_line(simplify_line(ring, tolerance), precision)
+    if len(simplified) >= MIN_RING_POINTS:
+        return simplified
+    quantized = quantize_line(ring, precision)
+    if len(quantized) >= MIN_RING_POINTS:
+        return quantized
+    return [[round(point[0], precision), round(point[1], precision)] for point in ring]
+
+
+def simplify_geometry(geometry, tolerance, precision):
+    """Simplified copy of a GeoJSON Polygon / MultiPolygon geometry (other types are returned unchanged)."""
+    if not geometry:
+        return geometry
+    if geometry.get('type') == 'Polygon':
+        rings = [simplify_ring(ring, tolerance, precision) for ring in geometry['coordinates']]
+        return {'type': 'Polygon', 'coordinates': rings}
+    if geometry.get('type') == 'MultiPolygon':
+        polygons = [[simplify_ring(ring, tolerance, precision) for ring in polygon] for polygon in geometry['coordinates']]
+        return {'type': 'MultiPolygon', 'coordinates': polygons}
+    return geometry
+
+
+def simplify_geojson(geojson, tolerance=0.005, precision=3, keep_properties=None):
+    """
+    Simplified copy of a GeoJSON FeatureCollection.
+    tolerance: Douglas-Peucker tolerance in coordinate units (degrees). precision: decimals kept per coordinate.
+    keep_properties: names of the feature properties to keep (None keeps all of them).
+    """
+    features = []
+    for feature in geojson.get('features', []):
+        properties = feature.get('properties') or {}
+        if keep_properties is not None:
+            properties = {key: value for key, value in properties.items() if key in keep_properties}
+        simplified = {'type': 'Feature', 'properties': properties,
+                      'geometry': simplify_geometry(feature.get('geometry'), tolerance, precision)}
+        if 'id' in feature:
+            simplified['id'] = feature['id']
+        features.append(simplified)
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def count_positions(geojson):
+    """Number of coordinate positions in the Polygon / MultiPolygon features of a FeatureCollection."""
+    total = 0
+    for feature in geojson.get('features', []):
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') == 'Polygon':
+            total += sum(len(ring) for ring in geometry['coordinates'])
+        elif geometry.get('type') == 'MultiPolygon':
+            total += sum(len(ring) for polygon in geometry['coordinates'] for ring in polygon)
+    return total
+
+
+# --- Disk Cache ---
+
+def _cache_path(source_path, tolerance, precision, keep_properties, cache_dir):
+    # The key changes whenever the source file or the settings change, so a stale file is never reused
+    stat = os.stat(source_path)
+    key = json.dumps([os.path.abspath(source_path), stat.st_mtime_ns, stat.st_size, tolerance, precision,
+                      sorted(keep_properties) if keep_properties is not None else None])
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(cache_dir, f"{name}.{digest}.geojson")
+
+
+def load_simplified_geojson(source_path, tolerance=0.005, precision=3, keep_properties=None, cache_dir=GEOJSON_CACHE_DIR):
+    """
+    Simplified GeoJSON of source_path (see simplify_geojson), read from the disk cache when it is there.
+    Otherwise the source is simplified once and the result written to cache_dir.
+    """
+    cache_path = _cache_path(source_path, tolerance, precision, keep_properties, cache_dir)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read cached GeoJSON {cache_path} ({e}). Rebuilding it.")
+
+    with open(source_path, 'r', encoding='utf-8') as f:
+        geojson = json.load(f)
+    simplified = simplify_geojson(geojson, tolerance, precision, keep_properties)
+    print(f"Simplified {source_path}: {count_positions(geojson):,} -> {count_positions(simplified):,} positions")
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(simplified, f, separators=(',', ':')) # Compact: no whitespace
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not write the GeoJSON cache {cache_path} ({e}).")
+    return simplified
@@ -0,0 +1,238 @@
+# page_device_analysis.py
+# Device Dominance and User Engagement Analysis case study: registered users by state
+# and brand, and app open rates per registered user.
+
+import streamlit as st
+
+from dashboard_core import load_query, query_generation, show_chart
+from fact_store import rank_extremes
+# seaborn is imported on first use, not when the page module loads (see startup_report.py)
+from startup_report import lazy_import
+
+sns = lazy_import('seaborn')
+
+
+def render():
+    """Renders the Device Dominance and User Engagement Analysis page."""
+    st.header("Device Dominance and User Engagement Analysis")
+
+    st.markdown("""
+    This section analyzes user engagement patterns, including device usage and registered user distribution.
+    """)
+
+    # --- Sub-navigation for Device Dominance ---
+    device_analysis_selection = st.selectbox(
+        "Select Analysis Type",
+        ["Highest Number of Registered Users","Total Registered Users by Brand", "Lowest Users by Brand", "App open highest rate per registered user", "App open lowest rate per registered user"] # Added new option here
+    )
+
+    # --- Content based on Device Dominance Sub-navigation ---
+    if device_analysis_selection == "Highest Number of Registered Users":
+        st.subheader("Registered Users by State and Brand")
+
+        st.markdown("""
+        This heatmap visualizes the total number of registered users across different states and mobile brands.
+        """)
+
+        # Load the data using the new SQL query
+        df_registered_users = load_query('registered_users_by_brand')
+
+        if df_registered_users.empty:
+            st.warning("Could not load data for registered users by brand. Please check your database connection and the 'aggregated_user' table.")
+        else:
+            # --- Data Preparation for Heatmap ---
+            # Pivot the data to get states as rows, brands as columns, and total_registered_users as values
+            heatmap_data = df_registered_users.pivot_table(
+                index='state',
+                columns='brand',
+                values='total_registered_users',
+                fill_value=0, # Fill missing values with 0
+                observed=True # Only states/brands present in the data
+            )
+
+            # --- Create Heatmap Visualization ---
+            st.subheader("Total Registered Users Heatmap by State and Brand")
+
+            def draw_registered_users_heatmap(fig, ax, heatmap_data):
+                sns.heatmap(
+                    heatmap_data,
+                    fmt=".0f", cmap="viridis",  # Show values and use Viridis colormap
+                    linewidths=0.5, linecolor='gray',
+                    cbar_kws={'label': 'Total Registered Users'},
+                    ax=ax # Draw on this chart's own axes, not the pyplot current figure
+                )
+
+                # Set axis labels and title
+                ax.set_title("Total Registered Users by State and Brand", fontsize=16)
+                ax.set_xlabel("Brand")
+                ax.set_ylabel("State")
+                ax.tick_params(axis='x', rotation=45)
+                ax.tick_params(axis='y', rotation=0)
+
+            # Display in Streamlit
+            show_chart('registered_users_heatmap', draw_registered_users_heatmap, heatmap_data,
+                       query_generation('registered_users_by_brand'), figsize=(12, 8))
+
+            # Optional: Display raw data
+            if st.checkbox("Show Raw Data (Registered Users by Brand)"):
+                st.subheader("Raw Data (Registered Users by Brand)")
+                st.dataframe(df_registered_users)
+
+
+    elif device_analysis_selection == "Total Registered Users by Brand": # New option
+        st.subheader("Total Registered Users Distribution by Brand")
+
+        st.markdown("""
+        This pie chart shows the distribution of total registered users across different mobile brands.
+        """)
+
+        # Load the data for total registered users by brand
+        df_total_users_by_brand = load_query('total_registered_users_by_brand') # Using the specific query
+
+        if df_total_users_by_brand.empty:
+            st.warning("Could not load data for total registered users by brand. Please check your database connection and the 'aggregated_user' table.")
+        else:
+            # --- Create Matplotlib Pie Chart ---
+            st.subheader("Total Registered Users by Brand")
+            def draw_users_by_brand(fig, ax, df_total_users_by_brand):
+                # Extract data
+                sizes = df_total_users_by_brand['total_registered_users']
+                labels = df_total_users_by_brand['brand']
+
+                # Create the pie chart and store the wedges (for legend colors)
+                wedges, texts, autotexts = ax.pie(
+                    sizes,
+                    labels=None,  # Don't use labels on the pie slices
+                    autopct='%1.1f%%',  # Show percentages with one decimal place
+                    startangle=140
+                )
+
+                # Create custom legend labels (e.g., "Samsung: 1,000,000")
+                legend_labels = [
+                    f"{brand}: {value:,}" for brand, value in zip(labels, sizes)
+                ]
+
+                # Add the legend with brand names and values
+                ax.legend(wedges, legend_labels, title="Brand (Registered Users)", loc="center left", bbox_to_anchor=(1, 0.5))
+
+                ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+                ax.set_title("Total Registered Users by Brand Distribution")  # Set title
+
+            # Display the plot in Streamlit
+            show_chart('users_by_brand', draw_users_by_brand, df_total_users_by_brand,
+                       query_generation('total_registered_users_by_brand'), figsize=(8, 8))
+
+    elif device_analysis_selection == "Lowest Users by Brand":
+        st.subheader("Lowest Users by Brand")
+
+        st.markdown("""
+        This bar chart shows the distribution of least users using brands.
+        """)
+        df_lowest_users_by_brand = load_query('lowest_brands')
+
+        if df_lowest_users_by_brand.empty:
+            st.warning("Could not load data for total registered users by brand. Please check your database connection and the 'aggregated_user' table.")
+        else:
+            st.subheader("Lowest Registered Users by Brand")
+            def draw_lowest_brands(fig, ax, df_lowest_users_by_brand):
+                # Extract data
+                sizes = df_lowest_users_by_brand['TotalUsers']
+                labels = df_lowest_users_by_brand['brand']
+
+                # Create the pie chart and store the wedges (for legend colors)
+                wedges, texts, autotexts = ax.pie(
+                    sizes,
+                    labels=None,  # Don't use labels on the pie slices
+                    autopct='%1.1f%%',  # Show percentages with one decimal place
+                    startangle=100,
+                    wedgeprops=dict(width=0.5) 
+                )
+
+                # Create custom legend labels (e.g., "Samsung: 1,000,000")
+                legend_labels = [
+                    f"{brand}: {value:,}" for brand, value in zip(labels, sizes)
+                ]
+
+                # Add the legend with brand names and values
+                ax.legend(wedges, legend_labels, title="Brand (Registered Users)", loc="center left", bbox_to_anchor=(1, 0.5))
+
+                ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+                ax.set_title("Lowest Registered Users by Brand Distribution")  # Set title
+
+            # Display the plot in Streamlit
+            show_chart('lowest_brands', draw_lowest_brands, df_lowest_users_by_brand,
+                       query_generation('lowest_brands'), figsize=(8, 8))
+
+            # Optional: Display raw data checkbox
+            if st.checkbox("Show Raw Data (Least usered Brands)"):
+                st.subheader("Raw Data (Least usered Brands)")
+                st.dataframe(df_lowest_users_by_brand)
+
+    elif device_analysis_selection == "App open highest rate per registered user":
+        st.subheader("app open highest rate per registered user")
+
+        st.markdown("""
+        This bar chart shows the distribution of App open rate.
+        """)
+        # One cached query for both app open rate views, ranked in-process
+        df_AppOpen_Rate = rank_extremes(load_query('app_open_rates'), ['app_open_rate_per_user'], n=5)[('app_open_rate_per_user', 'highest')]
+
+        if df_AppOpen_Rate.empty:
+            st.warning("Could not load data for total registered users. Please check your database connection and the 'summary_state_engagement' table.")
+        else:
+            st.subheader("App open rate by states")
+
+
+
+            def draw_app_open_rate(fig, ax, df_AppOpen_Rate):
+                ax.barh(df_AppOpen_Rate['state'], df_AppOpen_Rate['app_open_rate_per_user'], color='lightgreen')
+
+                ax.set_title('App Open Rate Per Registered User by State (Top 5)')
+                ax.set_xlabel('App Open Rate Per Registered User')
+                ax.set_ylabel('State')
+
+                for index, value in enumerate(df_AppOpen_Rate['app_open_rate_per_user']):
+                    ax.text(value, index, f'{value:.2f}', va='center') # Place text at the end of each bar
+
+                fig.tight_layout()
+
+            show_chart('app_open_rate_highest', draw_app_open_rate, df_AppOpen_Rate, query_generation('app_open_rates'))
+
+            st.write("""
+            **Note:** The data displayed is sample data. Replace the `data` dictionary
+            with the actual results fetched from your database query.
+            """)
+
+    elif device_analysis_selection == "App open lowest rate per registered user":
+        st.subheader("app open lowest rate per registered user")
+
+        st.markdown("""
+        This bar chart shows the distribution of App open rate.
+        """)
+        df_AppOpen_Lowest_Rate = rank_extremes(load_query('app_open_rates'), ['app_open_rate_per_user'], n=5)[('app_open_rate_per_user', 'lowest')]
+
+        if df_AppOpen_Lowest_Rate.empty:
+            st.warning("Could not load data for total registered users. Please check your database connection and the 'summary_state_engagement' table.")
+        else:
+            st.subheader("App open rate by states")
+
+
+
+            def draw_app_open_rate(fig, ax, df_AppOpen_Lowest_Rate):
+                ax.barh(df_AppOpen_Lowest_Rate['state'], df_AppOpen_Lowest_Rate['app_open_rate_per_user'], color='lightblue')
+
+                ax.set_title('App Open Rate Per Registered User by State (Least 5)')
+                ax.set_xlabel('App Open Rate Per Registered User')
+                ax.set_ylabel('State')
+
+                for index, value in enumerate(df_AppOpen_Lowest_Rate['app_open_rate_per_user']):
+                    ax.text(value, index, f'{value:.2f}', va='center') # Place text at the end of each bar
+
+                fig.tight_layout()
+
+            show_chart('app_open_rate_lowest', draw_app_open_rate, df_AppOpen_Lowest_Rate, query_generation('app_open_rates'))
+
+            st.write("""
+            **Note:** The data displayed is sample data. Replace the `data` dictionary
+            with the actual results fetched from your database query.
+            """)
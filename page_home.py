@@ -0,0 +1,71 @@
+# page_home.py
+# Home page of the dashboard: overall transaction volume and value trends.
+
+import streamlit as st
+import pandas as pd
+
+from dashboard_core import load_aggregated_transaction_data, query_generation, show_chart
+# Plotly is imported on first use, not when the page module loads (see startup_report.py)
+from startup_report import lazy_import
+
+px = lazy_import('plotly.express')
+
+
+def render():
+    """Renders the Home page."""
+    st.subheader("Transaction Trends Over Time of PhonePe - Overview")
+
+    st.markdown("""
+    The Indian digital payments story has truly captured the world’s imagination. From the largest towns to the remotest villages, there is a payments revolution being driven by the penetration of mobile phones, mobile internet and state-of-art payments infrastructure built as Public Goods championed by the central bank and the government. PhonePe started in 2016 and has been a strong beneficiary of the API driven digitisation of payments in India.
+    PhonePe is a leading digital payment platform in India, offering a range of financial services including mobile payments, banking, and online money transfers. Founded in 2015, it operates on the Unified Payments Interface (UPI) developed by the National Payments Corporation of India (NPCI). PhonePe is known for its user-friendly interface and widespread acceptance across merchants and businesses in India.
+
+    This dashboard provides insights derived from transaction data available in the PhonePe Pulse repository. Here, you can explore transaction trends, geographical insights, and other key metrics.
+    
+    This view shows the overall transaction volume and value trends
+    for all transaction types combined over time.
+    """)
+
+    # Load the data
+    df = load_aggregated_transaction_data()
+
+    if df.empty:
+        st.warning("Could not load data. Please check database connection details in credentials.py and ensure the table schema is correct.")
+    else:
+            
+            # Aggregate data for the overview (sum across transaction types)
+        overview_df = df.groupby('period')[['total_transaction_volume', 'total_transaction_value']].sum().reset_index()
+        overview_df['period'] = pd.Categorical(overview_df['period'], categories=sorted(overview_df['period'].unique()), ordered=True)
+
+            # Ensure 'period' is sorted and set as categorical for proper ordering (already done above)
+        overview_df = overview_df.sort_values('period')
+        st.subheader("Total Transaction Volume Over Time")
+            # Plot using matplotlib
+        def draw_volume_overview(fig, ax, overview_df):
+            ax.bar(overview_df['period'], overview_df['total_transaction_volume'], color='skyblue')
+            ax.set_title('Total Transaction Volume Over Time (All Types)')
+
+            ax.set_xlabel('Time Period')
+            ax.set_ylabel('Volume')
+            ax.tick_params(axis='x', rotation=45)
+            ax.grid(axis='y', linestyle='--', alpha=0.5)
+
+        show_chart('volume_overview', draw_volume_overview, overview_df,
+                   query_generation('aggregated_transaction'), figsize=(12, 6))
+
+            # Value Trend Chart (Overview)
+        st.subheader("Total Transaction Value Over Time")
+        fig_value_overview = px.line(
+            overview_df,
+            x='period',
+            y='total_transaction_value',
+            color_discrete_sequence=['indianred'], # Use a different color for differentiation
+            title='Total Transaction Value Over Time (All Types)',
+            labels={'total_transaction_value': 'Value', 'period': 'Time Period'}
+        )
+        fig_value_overview.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig_value_overview, use_container_width=True)
+
+            # Optional: Display raw data
+        if st.checkbox("Show Raw Data"):
+            st.subheader("Raw Data")
+            st.dataframe(overview_df)
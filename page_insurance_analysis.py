@@ -0,0 +1,202 @@
+# page_insurance_analysis.py
+# Insurance Transactions Analysis case study: top PIN codes, top states of a quarter
+# and the yearly insurance transactions of every state.
+
+import streamlit as st
+
+from dashboard_core import get_dropdown_options, load_fact_store, load_query, query_generation, show_chart
+from chart_render import rotate_xticklabels
+from fact_store import insurance_states
+# seaborn is imported on first use, not when the page module loads (see startup_report.py)
+from startup_report import lazy_import
+
+sns = lazy_import('seaborn')
+
+
+def render():
+    """Renders the Insurance Transactions Analysis page."""
+    st.header("Insurance Transactions Analysis") # New Header
+
+    st.markdown("""
+    This section focuses on analyzing insurance transaction data.
+    """)
+
+    # --- Sub-navigation for Insurance Transactions Analysis ---
+    insurance_analysis_options = ["PIN codes having the highest insurance transaction", "States recorded the highest number of insurance transactions", "States where insurance transactions declined"]
+    insurance_analysis_selection = st.selectbox(
+        "Select Analysis Type",
+        insurance_analysis_options
+    )
+
+    # --- Content based on Insurance Transactions Analysis Sub-navigation ---
+    if insurance_analysis_selection == "PIN codes having the highest insurance transaction":
+        st.subheader("PIN Codes with Highest Insurance Transaction Volume")
+
+        st.markdown("""
+        This section shows the PIN codes with the highest insurance transaction volumes.
+        """)
+
+        # Load the data for top insurance pincodes
+        df_top_insurance_pincode = load_query('top_insurance_pincode') # Using the specific query
+
+        if df_top_insurance_pincode.empty:
+            st.warning("Could not load data for top insurance pincodes. Please check your database connection and the 'top_insurance_pincode' table.")
+        else:
+            st.subheader("Top PIN Codes by Insurance Transaction Volume")
+            st.dataframe(df_top_insurance_pincode) # Display raw data for now
+
+            
+
+            # Optional: Add code here for an alternative visualization (e.g., a bar chart for top N pincodes)
+            if not df_top_insurance_pincode.empty:
+                st.subheader("Top 10 PIN Codes by Insurance Transaction Volume (Bar Chart)")
+                top_n_pincodes = df_top_insurance_pincode.head(10) # Get top 10
+                def draw_top_pincodes(fig, ax, top_n_pincodes):
+                    ax.bar(top_n_pincodes['pincode'].astype(str), top_n_pincodes['total_insurance_volume'])
+                    ax.set_title("Top 10 PIN Codes by Insurance Transaction Volume")
+                    ax.set_xlabel("PIN Code")
+                    ax.set_ylabel("Total Insurance Transaction Volume")
+                    rotate_xticklabels(ax, rotation=45, ha='right')
+                    fig.tight_layout()
+
+                show_chart('top_insurance_pincodes', draw_top_pincodes, top_n_pincodes,
+                           query_generation('top_insurance_pincode'))
+
+
+            # Optional: Display raw data checkbox
+            if st.checkbox("Show Raw Data (Top Insurance Pincodes)"):
+                st.subheader("Raw Data (Top Insurance Pincodes)")
+                st.dataframe(df_top_insurance_pincode)
+
+    elif insurance_analysis_selection == "States recorded the highest number of insurance transactions":
+        st.subheader("States with Highest Insurance Transaction Volume")
+
+        st.markdown("""
+        This section visualizes the states with the highest number of insurance transactions.
+        """)
+
+        # Load the data using the specific SQL query from the Canvas
+        # Note: This query requires year and quarter to be selected.
+        # We need to add year and quarter selection for this analysis.
+        st.sidebar.subheader("Filter Insurance Data")
+        years, quarters, states = get_dropdown_options() # Reuse existing function
+
+        if not years or not quarters:
+             st.warning("Could not load years or quarters from the database. Please check your connection and data.")
+        else:
+            selected_year_insurance = st.sidebar.selectbox("Select Year", years, key='insurance_year')
+            selected_quarter_insurance = st.sidebar.selectbox("Select Quarter", quarters, key='insurance_quarter')
+
+            if st.button(f"Analyze for {selected_year_insurance} Q{selected_quarter_insurance}", key='analyze_insurance_states'):
+                 st.write(f"Analyzing states with highest insurance transactions for {selected_year_insurance} Quarter {selected_quarter_insurance}...")
+
+                 # Data for the selected year and quarter, from the in-memory fact store
+                 store = load_fact_store()
+                 if store is not None:
+                     df_top_insurance_states = insurance_states(store, selected_year_insurance, selected_quarter_insurance)
+                     # The store takes the state names from dim_state, so its reloads change the chart too
+                     data_version = query_generation('fact_insurance') + query_generation('dim_state')
+                 else:
+                     # Fall back to one query for the period
+                     df_top_insurance_states = load_query('top_insurance_states_by_year_quarter',
+                                                          (selected_year_insurance, selected_quarter_insurance))
+                     data_version = query_generation('top_insurance_states_by_year_quarter')
+
+                 if df_top_insurance_states.empty:
+                     st.info(f"No data available for states with insurance transactions for {selected_year_insurance} Q{selected_quarter_insurance}. Please check your database.")
+                 else:
+                     # --- Create Matplotlib Bar Chart ---
+                     st.subheader(f"Top States by Insurance Transactions ({selected_year_insurance} Q{selected_quarter_insurance})")
+                     def draw_insurance_states(fig, ax, df_top_insurance_states):
+                         # Create the bar chart
+                         ax.bar(df_top_insurance_states['state'], df_top_insurance_states['total_insurance_transactions'])
+
+                         ax.set_title("States by Total Insurance Transactions") # Set title
+                         ax.set_xlabel("State") # Set x-axis label
+                         ax.set_ylabel("Total Insurance Transactions(lakhs)") # Set y-axis label
+                         rotate_xticklabels(ax, rotation=45, ha='right') # Rotate x-axis labels for readability
+                         fig.tight_layout() # Adjust layout
+
+                     show_chart('insurance_states', draw_insurance_states, df_top_insurance_states, data_version,
+                                params=(selected_year_insurance, selected_quarter_insurance)) # Display the chart in Streamlit
+
+                     # Optional: Display raw data
+                     if st.checkbox("Show Raw Data (Top Insurance States)"):
+                         st.subheader("Raw Data (Top Insurance States)")
+                         st.dataframe(df_top_insurance_states)
+
+    elif insurance_analysis_selection == "States where insurance transactions declined": # New option name
+        st.subheader("Total Yearly Insurance Transaction Count by State")
+
+        st.markdown("""
+        This section visualizes the total number of insurance transactions per state over the years.
+        """)
+
+        # Load the data using the simple yearly query
+        df_yearly_insurance_total = load_query('yearly_insurance_count_by_state')
+
+        # --- Temporary Debugging Line ---
+        st.write("Debugging: Data loaded for Yearly Insurance Totals:")
+        st.dataframe(df_yearly_insurance_total)
+        # --- End Debugging Line ---
+
+
+        if df_yearly_insurance_total.empty:
+            st.warning("Could not load yearly insurance data by state. Please check your database connection and the 'aggregated_insurance' table.")
+        else:
+            # --- Create Matplotlib Line Chart for Yearly Totals ---
+            st.subheader("Total Yearly Insurance Transaction Count Over Time by State")
+
+            # Check if 'year' and 'total_year_volume' columns exist before plotting
+            if 'year' in df_yearly_insurance_total.columns and 'total_year_volume' in df_yearly_insurance_total.columns:
+                def draw_yearly_insurance(fig, ax, df_yearly_insurance_total):
+                    # Plot a line for each state
+                    for state in df_yearly_insurance_total['state'].unique():
+                        state_data = df_yearly_insurance_total[df_yearly_insurance_total['state'] == state].sort_values(by='year')
+                        ax.plot(state_data['year'], state_data['total_year_volume'], marker='o', linestyle='-', label=state)
+
+                show_chart('yearly_insurance_trend', draw_yearly_insurance, df_yearly_insurance_total,
+                           query_generation('yearly_insurance_count_by_state'), figsize=(12, 7))
+            else:
+                st.warning("Could not find 'year' or 'total_year_volume' column in the data. Cannot plot trend.")
+
+            # --- Create Heatmap Visualization using Matplotlib and Seaborn ---
+            st.subheader("Total Yearly Insurance Transaction Count Heatmap by State and Year")
+
+# Data Preparation for Heatmap: Pivot the data
+# Ensure 'year' is treated as a category or string for pivoting if needed,
+# but for heatmap index/columns, numerical or object types work.
+# Using 'year' as columns and 'state' as index.
+            heatmap_data = df_yearly_insurance_total.pivot_table(
+                index='state',
+                columns='year',
+                values='total_year_volume',
+                fill_value=0, # Fill years/states with no data with 0
+                observed=True # Only states present in the data
+            )
+
+# Create the heatmap using Seaborn
+            def draw_yearly_insurance_heatmap(fig, ax, heatmap_data):
+                sns.heatmap(
+                    heatmap_data,
+                    annot=True, # Annotate cells with the count values
+                    fmt=".0f", # Format annotations as integers
+                    cmap="viridis", # Use a color map (viridis, plasma, etc.)
+                    ax=ax # Draw the heatmap on the created axes
+                )
+
+                ax.set_title("Total Yearly Insurance Transaction Count by State and Year") # Set title
+                ax.set_xlabel("Year") # Set x-axis label
+                ax.set_ylabel("State") # Set y-axis label
+                rotate_xticklabels(ax, rotation=45, ha='right') # Rotate x-axis labels for readability
+                ax.tick_params(axis='y', rotation=0) # Ensure y-axis labels are horizontal
+                fig.tight_layout() # Adjust layout to prevent labels overlapping
+
+# Display the Matplotlib figure in Streamlit
+            show_chart('yearly_insurance_heatmap', draw_yearly_insurance_heatmap, heatmap_data,
+                       query_generation('yearly_insurance_count_by_state'), figsize=(12, 8)) # Adjust figsize as needed
+
+            st.info("""
+            This heatmap visualizes the total insurance transaction count for each state across different years.
+            Darker colors indicate a higher transaction count.
+            """)
@@ -0,0 +1,146 @@
+# page_market_expansion.py
+# Transaction Analysis for Market Expansion case study: top-performing states and
+# transaction-to-user ratios.
+
+import streamlit as st
+
+from dashboard_core import load_query, query_generation, show_chart
+from fact_store import rank_extremes
+# Plotly is imported on first use, not when the page module loads (see startup_report.py)
+from startup_report import lazy_import
+
+px = lazy_import('plotly.express')
+
+
+def render():
+    """Renders the Transaction Analysis for Market Expansion page."""
+    st.header("Transaction Analysis for Market Expansion")
+
+    st.markdown("""
+    This section analyzes transaction data to identify opportunities for market expansion.
+    """)
+
+    # --- Sub-navigation for Market Expansion Analysis ---
+    market_expansion_analysis_options = ["Top-performing states","Transaction to Low user Ratio","Transaction to High user Ratio"] # New option
+    market_expansion_analysis_selection = st.selectbox(
+        "Select Analysis Type",
+        market_expansion_analysis_options
+    )
+
+    # --- Content based on Market Expansion Analysis Sub-navigation ---
+    if market_expansion_analysis_selection == "Top-performing states":
+        st.subheader("Top 5 Performing States by Quarterly Transaction Volume")
+
+        st.markdown("""
+        This section shows the top 5 states with the highest total transaction volume in the latest quarter available in the data.
+        """)
+
+        # Load the data using the specific query
+        df_top_states_quarterly = load_query('top_10_states_quarterly_volume')
+
+        if df_top_states_quarterly.empty:
+            st.warning("Could not load data for top-performing states by quarterly volume. Please check your database connection and the 'aggregated_transaction' table.")
+        else:
+            # --- Data Visualization: Bar Chart for Top States ---
+            st.subheader("Top States by Quarterly Transaction Volume")
+
+            # Create a combined period string for better labeling if needed,
+            # but for top 10 in the latest quarter, just showing state and volume is sufficient.
+            # If you want to show the specific quarter, you might need to adjust the query
+            # to get the latest quarter first, then the top 10 states for that quarter.
+            # The current query gets the top 10 overall across all quarters.
+            # Let's assume for this visualization we want the top 10 overall quarterly volumes.
+
+            fig_top_states = px.bar(
+                df_top_states_quarterly,
+                x='state',
+                y='quarterly_transaction_volume',
+                
+                labels={'state': 'State', 'quarterly_transaction_volume': 'Total Quarterly Transaction Volume'},
+                color='state' # Color bars by state
+            )
+            fig_top_states.update_layout(xaxis_tickangle=-45) # Angle x-axis labels for readability
+            st.plotly_chart(fig_top_states, use_container_width=True)
+
+            st.info("""
+            Note: This query ranks the top 5 quarterly volumes across all quarters, not necessarily the top 5 states in the *latest* quarter.
+            """)
+
+
+            # Optional: Display raw data
+            if st.checkbox("Show Raw Data"):
+                st.subheader("Raw Data")
+                st.dataframe(df_top_states_quarterly)
+
+    if market_expansion_analysis_selection == "Transaction to Low user Ratio":
+        st.subheader("Least 5 States with low user ratio")
+
+        st.markdown("""
+        This section shows the Least 5 States with low user ratio.
+        """)
+
+        # Load the data using the specific query
+        # One cached query for both user ratio views, ranked in-process
+        df_user_ratio = rank_extremes(load_query('user_ratios'), ['transaction_to_user_ratio'], n=5)[('transaction_to_user_ratio', 'lowest')]
+
+        if df_user_ratio.empty:
+            st.warning("Could not load data for top-performing states by quarterly volume. Please check your database connection and the 'summary_state_engagement' table.")
+        else:
+            # --- Data Visualization: Bar Chart for Top States ---
+            st.subheader("States with Low user ratio")
+            def draw_user_ratio(fig, ax, df_user_ratio):
+                scatter = ax.scatter(
+                    df_user_ratio['state'], # X-axis: Total Registered Users
+                    df_user_ratio['transaction_to_user_ratio'], # Y-axis: Transaction-to-User Ratio
+                    alpha=0.8, # Transparency of points
+                    #s=df_user_ratio['total_registered_users']/500 # Size of points based on user count (adjust scaling as needed)
+                )
+
+
+                ax.set_title('Total Registered Users vs. Transaction-to-User Ratio by State')
+                ax.set_xlabel('state')
+                ax.set_ylabel('Transaction-to-User Ratio')
+                fig.tight_layout()
+
+            show_chart('user_ratio_lowest', draw_user_ratio, df_user_ratio, query_generation('user_ratios'), figsize=(10, 7))
+
+
+            if st.checkbox("Show Raw Data "):
+                st.subheader("Raw Data")
+                st.dataframe(df_user_ratio)
+
+    if market_expansion_analysis_selection == "Transaction to High user Ratio":
+        st.subheader("Top 5 States with high user ratio")
+
+        st.markdown("""
+        This section shows the Top 5 States with high user ratio.
+        """)
+
+        # Load the data using the specific query
+        df_high_user_ratio = rank_extremes(load_query('user_ratios'), ['transaction_to_user_ratio'], n=5)[('transaction_to_user_ratio', 'highest')]
+
+        if df_high_user_ratio.empty:
+            st.warning("Could not load data for top-performing states by quarterly volume. Please check your database connection and the 'summary_state_engagement' table.")
+        else:
+            # --- Data Visualization: Bar Chart for Top States ---
+            st.subheader("States with High user ratio")
+            def draw_user_ratio(fig, ax, df_high_user_ratio):
+                scatter = ax.scatter(
+                    df_high_user_ratio['state'], # X-axis: Total Registered Users
+                    df_high_user_ratio['transaction_to_user_ratio'], # Y-axis: Transaction-to-User Ratio
+                    alpha=0.8, # Transparency of points
+                    #s=df_high_user_ratio['total_registered_users']/500 # Size of points based on user count (adjust scaling as needed)
+                )
+
+
+                ax.set_title('Total Registered Users vs. Transaction-to-User Ratio by State')
+                ax.set_xlabel('state')
+                ax.set_ylabel('Transaction-to-User Ratio')
+                fig.tight_layout()
+
+            show_chart('user_ratio_highest', draw_user_ratio, df_high_user_ratio, query_generation('user_ratios'), figsize=(10, 7))
+
+
+            if st.checkbox("Show Raw Data "):
+                st.subheader("Raw Data")
+                st.dataframe(df_high_user_ratio)
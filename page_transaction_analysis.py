@@ -0,0 +1,303 @@
+# page_transaction_analysis.py
+# Transaction Data Analysis case study: popular transaction types, extreme states,
+# district vs. state performance and the top states by registered users.
+
+import streamlit as st
+
+from dashboard_core import get_districts_for_state, get_dropdown_options, load_aggregated_transaction_data, load_fact_store, load_query, query_generation, show_chart
+from fact_store import district_benchmark, period_extremes, rank_extremes
+# Plotly is imported on first use, not when the page module loads (see startup_report.py)
+from startup_report import lazy_import
+
+px = lazy_import('plotly.express')
+
+
+def render():
+    """Renders the Transaction Data Analysis page."""
+    st.header("Transaction Data Analysis") # Added a sub-header for this section
+
+    st.markdown("""
+    This section visualizes transaction data trends.
+    """)
+
+
+    # --- Sub-navigation for Transaction Data Analysis (moved to main body) ---
+    transaction_analysis_selection = st.selectbox(
+        "Select Analysis Type",
+        ["Most Popular Transaction Types", "States with Extreme Transactions", "District vs. State Performance", "Top 10 States by Registered Users"] # Sub-navigation options
+    )
+
+    
+
+    if transaction_analysis_selection == "Most Popular Transaction Types":
+        st.subheader("Most Popular Transaction Types Analysis")
+
+        st.markdown("""
+        This view allows you to analyze the volume and value trends for
+        individual transaction types to see which are the most popular.
+        """)
+
+        # Load the data
+        df = load_aggregated_transaction_data()
+
+        if df.empty:
+            st.warning("Could not load data. Please check database connection details in credentials.py and ensure the table schema is correct.")
+        else:
+            # --- Visualizations for Individual Transaction Types ---
+
+# Plot Volume Trend
+# Aggregating total volume by transaction type
+            volume_by_type = df.groupby('transactiontype', observed=True)['total_transaction_volume'].sum()
+
+# Create pie chart
+            def draw_volume_by_type(fig, ax_pie, volume_by_type):
+                ax_pie.pie(volume_by_type, labels=volume_by_type.index, autopct='%1.1f%%', startangle=90)
+                ax_pie.set_title("Total Transaction Volume by Type")
+
+#pie is drawn as circle
+                ax_pie.axis('equal')
+
+            show_chart('volume_by_type', draw_volume_by_type, volume_by_type,
+                       query_generation('aggregated_transaction'), figsize=(6.4, 4.8)) # matplotlib's default size
+
+# Grouping of data for Value by period and transactiontype
+            st.subheader("Transaction Value Trend by Type")
+            value_pivot = df.pivot_table(
+                index='period',
+                columns='transactiontype',
+                values='total_transaction_value',
+                aggfunc='sum',
+                observed=True # Only transaction types present in the data
+            ).fillna(0).sort_index()
+
+# Plot Value Trend
+            def draw_value_by_type(fig, ax_val, value_pivot):
+                for col in value_pivot.columns:
+                    ax_val.plot(value_pivot.index, value_pivot[col], marker='o', label=col)
+
+                ax_val.set_title("Total Transaction Value by Type Over Time")
+                ax_val.set_xlabel("Time Period")
+                ax_val.set_ylabel("Value")
+                ax_val.legend(title="Transaction Type")
+                ax_val.tick_params(axis='x', rotation=45)
+
+            show_chart('value_by_type', draw_value_by_type, value_pivot,
+                       query_generation('aggregated_transaction'), figsize=(12, 5))
+
+            # Optional: Display raw data
+            if st.checkbox("Show Raw Data (By Transaction Type)"):
+                st.subheader("Raw Data (By Transaction Type)")
+                st.dataframe(df) # Display the full dataframe
+
+    elif transaction_analysis_selection == "States with Extreme Transactions":
+        st.subheader("States with Highest/Lowest Transaction Volume and Value")
+
+        st.markdown("""
+        Select a year and quarter to find the states with the highest and lowest
+        total transaction volume and value during that period.
+        """)
+
+        # --- Year and Quarter Selection ---
+        years, quarters, states = get_dropdown_options()
+
+        if not years or not quarters or not states:
+             st.warning("Could not load years, quarters, or states from the database. Please check your connection and data.")
+        else:
+            selected_year = st.selectbox("Select Year", years, key='extreme_year') # Added unique key
+            selected_quarter = st.selectbox("Select Quarter", quarters, key='extreme_quarter') # Added unique key
+
+
+            # --- Fetch and Display Extreme States ---
+            if st.button(f"Analyze for {selected_year} Q{selected_quarter}", key='analyze_extreme'): # Added unique key
+                st.write(f"Analyzing data for {selected_year} Quarter {selected_quarter}...")
+
+                # Answered from the in-memory fact store (no database round trip per selection)
+                # Per-state totals are computed once and ranked for both metrics
+                store = load_fact_store()
+                if store is not None:
+                    extremes = period_extremes(store, selected_year, selected_quarter)
+                else:
+                    # Fall back to one query for the period
+                    extremes = rank_extremes(load_query('state_totals_by_period', (selected_year, selected_quarter)),
+                                             ['total_volume', 'total_value'])
+
+                # Highest / lowest volume
+                df_highest_volume = extremes[('total_volume', 'highest')].reindex(columns=['state', 'total_volume'])
+                df_lowest_volume = extremes[('total_volume', 'lowest')].reindex(columns=['state', 'total_volume'])
+
+                # Highest / lowest value
+                df_highest_value = extremes[('total_value', 'highest')].reindex(columns=['state', 'total_value'])
+                df_lowest_value = extremes[('total_value', 'lowest')].reindex(columns=['state', 'total_value'])
+
+                # --- Display Results ---
+                if not df_highest_volume.empty:
+                    st.subheader("Highest Transaction Volume")
+                    st.dataframe(df_highest_volume)
+                else:
+                    st.info("Could not retrieve data for highest transaction volume for the selected period.")
+
+                if not df_lowest_volume.empty:
+                    st.subheader("Lowest Transaction Volume")
+                    st.dataframe(df_lowest_volume)
+                else:
+                    st.info("Could not retrieve data for lowest transaction volume for the selected period.")
+
+                if not df_highest_value.empty:
+                    st.subheader("Highest Transaction Value")
+                    st.dataframe(df_highest_value)
+                else:
+                    st.info("Could not retrieve data for highest transaction value for the selected period.")
+
+                if not df_lowest_value.empty:
+                    st.subheader("Lowest Transaction Value")
+                    st.dataframe(df_lowest_value)
+                else:
+                    st.info("Could not retrieve data for lowest transaction value for the selected period.")
+
+    elif transaction_analysis_selection == "District vs. State Performance":
+        st.subheader("District Performance Compared to State Total")
+
+        st.markdown("""
+        Select a year, quarter, state, and district to compare the district's
+        total transaction volume and value against the total for its state.
+        """)
+
+        # --- Year, Quarter, State, and District Selection ---
+        years, quarters, states = get_dropdown_options()
+
+        if not years or not quarters or not states:
+             st.warning("Could not load years, quarters, or states from the database. Please check your connection and data.")
+        else:
+            selected_year = st.selectbox("Select Year", years, key='district_year') # Added unique key
+            selected_quarter = st.selectbox("Select Quarter", quarters, key='district_quarter') # Added unique key
+            selected_state = st.selectbox("Select State", states, key='district_state') # Added unique key
+
+            # Dynamically load districts based on selected state
+            districts = get_districts_for_state(selected_state)
+
+            if not districts:
+                st.warning(f"Could not load districts for {selected_state}. Please check your data in map_transactions.") # Using table name from provided base code
+            else:
+                selected_district = st.selectbox("Select District", districts, key='district_district') # Added unique key
+
+
+                # --- Fetch and Display Comparison Data ---
+                if st.button(f"Compare {selected_district} ({selected_state}) Performance", key='compare_district'): # Added unique key
+                    st.write(f"Comparing {selected_district} ({selected_state}) performance for {selected_year} Q{selected_quarter}...")
+
+                    # All districts of the state with their share of the state total (from the in-memory fact store,
+                    # or one query per state and period), so switching district does not fetch anything new
+                    store = load_fact_store()
+                    if store is not None:
+                        df_benchmark = district_benchmark(store, selected_year, selected_quarter, selected_state)
+                    else:
+                        df_benchmark = load_query('district_vs_state', (selected_year, selected_quarter, selected_state))
+                    df_comparison = df_benchmark[df_benchmark['district'] == selected_district] if not df_benchmark.empty else df_benchmark
+
+                    # --- Display Results and Visualization ---
+                    if not df_comparison.empty:
+                        st.subheader("Comparison Results")
+                        st.dataframe(df_comparison)
+
+                        # District benchmark: every district's share of the state volume, selected district highlighted
+                        st.subheader(f"District Benchmark: Share of {selected_state} Transaction Volume")
+                        df_benchmark_plot = df_benchmark.assign(
+                            Highlight=df_benchmark['district'].eq(selected_district).map({True: selected_district, False: 'Other districts'})
+                        )
+                        fig_benchmark = px.bar(
+                            df_benchmark_plot,
+                            x='district',
+                            y='volume_share',
+                            color='Highlight',
+                            title=f"District Share of State Transaction Volume ({selected_year} Q{selected_quarter})",
+                            labels={'district': 'District', 'volume_share': 'Share of State Volume'},
+                            hover_data=['district_total_volume', 'district_total_value', 'value_share']
+                        )
+                        fig_benchmark.update_layout(xaxis_tickangle=-45, yaxis_tickformat='.1%')
+                        st.plotly_chart(fig_benchmark, use_container_width=True)
+
+                        # Prepare data for plotting
+                        # Reshape data for easier plotting (e.g., using melt)
+                        df_melted_volume = df_comparison[['district', 'state', 'district_total_volume', 'state_total_volume']].melt(
+                            id_vars=['district', 'state'],
+                            var_name='Scope',
+                            value_name='Total Volume'
+                        )
+                        df_melted_volume['Scope'] = df_melted_volume['Scope'].replace({
+                            'district_total_volume': f'{selected_district} (District)',
+                            'state_total_volume': f'{selected_state} (State Total)'
+                        })
+
+
+                        df_melted_value = df_comparison[['district', 'state', 'district_total_value', 'state_total_value']].melt(
+                            id_vars=['district', 'state'],
+                            var_name='Scope',
+                            value_name='Total Value'
+                        )
+                        df_melted_value['Scope'] = df_melted_value['Scope'].replace({
+                            'district_total_value': f'{selected_district} (District)',
+                            'state_total_value': f'{selected_state} (State Total)'
+                        })
+
+
+                        # Volume Comparison Bar Chart
+                        st.subheader("Volume Comparison: District vs. State Total")
+                        fig_volume_comparison = px.bar(
+                            df_melted_volume,
+                            x='Scope',
+                            y='Total Volume',
+                            title=f"Transaction Volume: {selected_district} vs. {selected_state} Total ({selected_year} Q{selected_quarter})",
+                            labels={'Total Volume': 'Transaction Volume'},
+                            color='Scope' # Color bars by Scope (District/State)
+                        )
+                        fig_volume_comparison.update_layout(xaxis_tickangle=-45)
+                        st.plotly_chart(fig_volume_comparison, use_container_width=True)
+
+                        # Value Comparison Bar Chart
+                        st.subheader("Value Comparison: District vs. State Total")
+                        fig_value_comparison = px.bar(
+                            df_melted_value,
+                            x='Scope',
+                            y='Total Value',
+                             title=f"Transaction Value: {selected_district} vs. {selected_state} Total ({selected_year} Q{selected_quarter})",
+                            labels={'Total Value': 'Transaction Value'},
+                             color='Scope' # Color bars by Scope (District/State)
+                        )
+                        fig_value_comparison.update_layout(xaxis_tickangle=-45)
+                        st.plotly_chart(fig_value_comparison, use_container_width=True)
+
+
+                    else:
+                         st.info(f"Could not retrieve comparison data for {selected_district} ({selected_state}) for {selected_year} Q{selected_quarter}. Please check if data exists for this period and location.")
+
+    elif transaction_analysis_selection == "Top 10 States by Registered Users":
+        st.subheader("Top 10 States by Total Registered Users")
+
+        st.markdown("""
+        This visualization shows the top 10 states with the highest total number of registered PhonePe users.
+        """)
+
+        # Load the data for top users
+        df_top_users = load_query('top_10_users') # Using generic loader
+
+        if df_top_users.empty:
+            st.warning("Could not load data for top 10 states by registered users. Please check your database connection and the 'aggregated_user' table.")
+        else:
+            # --- Visualization for Top 10 Users ---
+
+            st.subheader("Top 10 States by Registered User Count")
+            fig_top_users = px.bar(
+                df_top_users,
+                x='state',
+                y='total_registered_users',
+                title='Top 10 States by Total Registered Users',
+                labels={'state': 'State', 'total_registered_users': 'Total Registered Users'},
+                color='state' # Color bars by state
+            )
+            fig_top_users.update_layout(xaxis_tickangle=-45) # Angle x-axis labels for readability
+            st.plotly_chart(fig_top_users, use_container_width=True)
+
+            # Optional: Display raw data
+            if st.checkbox("Show Raw Data (Top 10 States by Users)"):
+                st.subheader("Raw Data (Top 10 States by Users)")
+                st.dataframe(df_top_users)
@@ -0,0 +1,333 @@
+# page_transaction_dynamics.py
+# Decoding Transaction Dynamics on PhonePe case study: transaction behaviour across
+# states (bar charts and the India map) and the growth potential of payment categories.
+
+import streamlit as st
+import pandas as pd
+
+from dashboard_core import GEOJSON_STATE_KEY, load_query, load_state_geo_index, load_state_map_data, query_generation, show_chart
+# Plotly is imported on first use, not when the page module loads (see startup_report.py)
+from startup_report import lazy_import
+
+px = lazy_import('plotly.express')
+
+
+def render():
+    """Renders the Decoding Transaction Dynamics on PhonePe page."""
+    st.header("Decoding Transaction Dynamics on PhonePe")
+
+    st.markdown("""
+    This section explores various aspects of transaction behavior on the PhonePe platform.
+    """)
+
+    # --- Sub-navigation for Decoding Transaction Dynamics ---
+    decoding_dynamics_selection = st.selectbox(
+        "Select Analysis Type",
+        ["Variations in transaction behavior across states", "Potential for Growth of payment categories"] # Added new option here
+    )
+
+    # --- Content based on Decoding Transaction Dynamics Sub-navigation ---
+    if decoding_dynamics_selection == "Variations in transaction behavior across states":
+        st.subheader("Variations in Transaction Behavior Across States")
+
+        st.markdown("""
+        This section visualizes the total transaction volume and value aggregated across all years and quarters for each state,
+        using either bar charts or an interactive India map.
+        """)
+
+        # --- Visualization Type Selection ---
+        viz_type = st.radio("Select Visualization Type", ["Bar Charts", "India Map"]) # Renamed for clarity
+
+        # Load the data for state variations (canonical names, map states only - see load_state_map_data)
+        geo_index = load_state_geo_index()
+        df_state_variations_prepared = load_state_map_data('state_variations')
+
+        if geo_index is None:
+             st.warning("Could not load GeoJSON data for India states or the state dimension (dim_state). Map visualization is not available. Please check the file path and rerun data_extraction.py.")
+        elif df_state_variations_prepared.empty:
+             st.warning("Could not load data for state variations. Please check your database connection and the 'map_transactions' table.") # Using table name from provided base code
+        else:
+            # Check if the 'state' column exists in the prepared DataFrame before proceeding
+            if 'state' in df_state_variations_prepared.columns:
+
+                 # States (after mapping and filtering) without a GeoJSON feature, found once when the index was built
+                 # Provide feedback on mismatches even if not stopping plotting
+                 if geo_index['unmatched']:
+                      st.warning(f"The following states in your data (after mapping and filtering) were not found in the GeoJSON features using key '{GEOJSON_STATE_KEY}': {set(geo_index['unmatched'])}")
+                      st.info("These states will not be colored on the map. Please check your data and GeoJSON.")
+
+
+                 if viz_type == "Bar Charts":
+                    # --- Bar Charts for State Variations ---
+
+                    # Volume Variation Bar Chart
+                    st.subheader("Total Transaction Volume by State (All Periods)")
+
+                    def draw_state_volume(fig_state_volume, ax_state_volume, df_state_variations_prepared):
+# Plotting bar chart
+                        ax_state_volume.bar(
+                            df_state_variations_prepared['state'].astype(str), # Category -> plain names
+                            df_state_variations_prepared['sumOfTransCount'],
+                            color='skyblue',
+                            width=0.6
+                        )
+
+# Add titles and labels
+                        ax_state_volume.set_title('Total Transaction Volume by State (Aggregated)')
+                        ax_state_volume.set_xlabel('State')
+                        ax_state_volume.set_ylabel('Total Transaction Volume')
+                        ax_state_volume.tick_params(axis='x', rotation=90)
+                        fig_state_volume.tight_layout()
+                    
+
+# Annotate bar values
+                        for i, v in enumerate(df_state_variations_prepared['sumOfTransCount']):
+                            ax_state_volume.text(i, v + max(df_state_variations_prepared['sumOfTransCount']) * 0.01, f'{v:,.0f}', ha='center', fontsize=8)
+
+# Display in Streamlit
+                    show_chart('state_volume', draw_state_volume, df_state_variations_prepared,
+                               query_generation('state_variations'), figsize=(12, 7))
+
+
+                    # Value Variation Bar Chart
+                    st.subheader("Total Transaction Value by State (All Periods)")
+                    fig_value_variations = px.bar(
+                        df_state_variations_prepared, # Use prepared data
+                        x='state',
+                        y='sumOfTransAmount',
+                        title='Total Transaction Value by State (Aggregated)',
+                        labels={'state': 'State', 'sumOfTransAmount': 'Total Transaction Value'},
+                        color='state' # Color bars by state
+                    )
+                    fig_value_variations.update_layout(xaxis_tickangle=-45) # Angle x-axis labels for readability
+                    st.plotly_chart(fig_value_variations, use_container_width=True)
+
+                 elif viz_type == "India Map": # Updated name
+                     # --- India Map for State Variations ---
+
+                     # Volume / Value Map
+                     # One figure for both metrics, so the state geometry is sent to the browser once;
+                     # the Volume / Value buttons only swap the colored values
+                     st.subheader("Total Transaction Volume and Value Across States (Map)")
+                     fig_state_map = px.choropleth(
+                         df_state_variations_prepared, # Use prepared data
+                         geojson=geo_index['geojson'], # Features keyed by state_id (see build_state_geo_index)
+                         locations='state_id', # Matched to the feature ids, no name lookup
+                         color='sumOfTransCount', # Column with the value to color the map (Volume first)
+                         hover_name='state', # Column for tooltip
+                         hover_data={'sumOfTransCount': True, 'sumOfTransAmount': ':,.2f'}, # Additional data in tooltip
+                         title='Total Transaction Volume by State (Map)',
+                         labels={'sumOfTransCount': 'Total Volume', 'sumOfTransAmount': 'Total Value'},
+                     )
+                     map_metrics = [
+                         ('Volume', 'sumOfTransCount', 'Total Volume', 'Total Transaction Volume by State (Map)'),
+                         ('Value', 'sumOfTransAmount', 'Total Value', 'Total Transaction Value by State (Map)'),
+                     ]
+                     # Tooltip reads both metrics from customdata, so it stays right whichever one colors the map
+                     fig_state_map.update_traces(
+                         hovertemplate="<b>%{hovertext}</b><br><br>Total Volume=%{customdata[0]:,}<br>Total Value=%{customdata[1]:,.2f}<extra></extra>"
+                     )
+                     fig_state_map.update_layout(updatemenus=[dict(
+                         type='buttons',
+                         direction='right',
+                         x=0, y=1.0, xanchor='left', yanchor='bottom',
+                         buttons=[dict(
+                             label=label,
+                             method='update',
+                             args=[{'z': [df_state_variations_prepared[column].tolist()]},
+                                   {'title.text': title, 'coloraxis.colorbar.title.text': colorbar_title}]
+                         ) for label, column, colorbar_title, title in map_metrics]
+                     )])
+                     # Use fitbounds="geojson" to automatically zoom to the GeoJSON layer
+                     # Corrected: Replaced showstates=True with showsubunits=True
+                     fig_state_map.update_geos(showcountries=False, showsubunits=True, showcoastlines=False, fitbounds="geojson")
+                     fig_state_map.update_layout(margin={"r":0,"t":70,"l":0,"b":0})
+                     st.plotly_chart(fig_state_map, use_container_width=True)
+
+
+                 # Optional: Display raw data
+                 if st.checkbox("Show Raw Data (State Variations)"):
+                     st.subheader("Raw Data (State Variations)")
+                     st.dataframe(df_state_variations_prepared) # Display the prepared data
+            else:
+                 st.warning("State data could not be prepared for visualization. Please check data loading, GeoJSON, and state name mapping.")
+
+    # --- New Section: Potential for Growth of Payment Categories ---
+    elif decoding_dynamics_selection == "Potential for Growth of payment categories":
+        st.header("Potential for Growth of Payment Categories") # Changed to header for consistency
+
+        st.markdown("""
+        Analyze transaction volume and value trends across states and payment categories
+        to identify areas and categories with high growth potential.
+        """)
+
+        # Load the data using the selected SQL query
+        df_growth_potential = load_query('growth_potential')
+
+        if df_growth_potential.empty:
+            st.warning("Could not load data for growth potential analysis. Please check your database connection and the 'aggregated_transaction' table.")
+        else:
+            # Combine year and quarter for a time-based axis
+            df_growth_potential['period'] = df_growth_potential['year'].astype(str) + '-Q' + df_growth_potential['quarter'].astype(str)
+            # Ensure correct order for plotting
+            period_order = sorted(df_growth_potential['period'].unique())
+            df_growth_potential['period'] = pd.Categorical(df_growth_potential['period'], categories=period_order, ordered=True)
+
+            # --- Visualization Type Selection for Growth Potential Section ---
+            # Removed "India Map with Bubbles" option
+            growth_viz_type = st.radio("Select Visualization Type", ["Trend Charts", "Pie Charts by State/Category"], key='growth_viz_type') # Updated option list
+
+            # --- Content based on Growth Potential Visualization Type ---
+            if growth_viz_type == "Trend Charts":
+
+                st.markdown("""
+                View transaction volume and value trends over time for different payment categories,
+                with optional filtering by state.
+                """)
+
+                # --- Interactive Filters for Trend Charts ---
+                st.sidebar.subheader("Filter Trend Data")
+                all_states = ['All'] + sorted(df_growth_potential['state'].unique())
+                selected_state_filter_trend = st.sidebar.selectbox("Select State for Trend", all_states, key='growth_state_filter_trend')
+
+                # Apply state filter
+                filtered_df_trend = df_growth_potential.copy()
+                if selected_state_filter_trend != 'All':
+                    filtered_df_trend = filtered_df_trend[filtered_df_trend['state'] == selected_state_filter_trend]
+
+                if filtered_df_trend.empty:
+                    st.info("No data available for the selected state for trend charts.")
+                else:
+                    # Volume Trend by Category (filtered)
+                    st.subheader("Transaction Volume Trend by Category")
+                    if selected_state_filter_trend != 'All':
+                         title_volume = f"Transaction Volume Trend by Category in {selected_state_filter_trend}"
+                    else:
+                         title_volume = "Transaction Volume Trend by Category (All States)"
+
+                    # Pivot data for volume trend
+                    volume_pivot = filtered_df_trend.pivot_table(
+                        index='period',
+                        columns='transactiontype',
+                        values='total_volume',
+                        aggfunc='sum',
+                        observed=True # Only transaction types present in the filtered data
+                    ).fillna(0).sort_index()
+
+                    def draw_growth_volume(fig, ax_vol, volume_pivot):
+                        for col in volume_pivot.columns:
+                           ax_vol.plot(volume_pivot.index, volume_pivot[col], marker='o', label=col)
+
+                        ax_vol.set_title(title_volume)
+                        ax_vol.set_xlabel("Time Period")
+                        ax_vol.set_ylabel("Total Volume")
+                        ax_vol.legend(title="Transaction Type")
+                        ax_vol.tick_params(axis='x', rotation=45)
+
+                    show_chart('growth_volume_trend', draw_growth_volume, volume_pivot, query_generation('growth_potential'),
+                               params=(selected_state_filter_trend,), figsize=(12, 5))
+
+                    # --- Transaction Value Trend by Category ---
+                    st.subheader("Transaction Value Trend by Category")
+                    if selected_state_filter_trend != 'All':
+                        title_value = f"Transaction Value Trend by Category in {selected_state_filter_trend}"
+                    else:
+                        title_value = "Transaction Value Trend by Category (All States)"
+
+# Pivot data for value trend
+                    value_pivot = filtered_df_trend.pivot_table(
+                        index='period',
+                        columns='transactiontype',
+                        values='total_value',
+                        aggfunc='sum',
+                        observed=True # Only transaction types present in the filtered data
+                    ).fillna(0).sort_index()
+
+                    def draw_growth_value(fig, ax_val, value_pivot):
+                        for col in value_pivot.columns:
+                            ax_val.plot(value_pivot.index, value_pivot[col], marker='o', label=col)
+
+                        ax_val.set_title(title_value)
+                        ax_val.set_xlabel("Time Period")
+                        ax_val.set_ylabel("Total Value")
+                        ax_val.legend(title="Transaction Type")
+                        ax_val.tick_params(axis='x', rotation=45)
+
+                    show_chart('growth_value_trend', draw_growth_value, value_pivot, query_generation('growth_potential'),
+                               params=(selected_state_filter_trend,), figsize=(12, 5))
+               
+            elif growth_viz_type == "Pie Charts by State/Category": # Updated option name
+
+                 st.markdown("""
+                 View the distribution of total transaction volume and value by State (when 'All' States is selected)
+                 or by Payment Category (when a specific State is selected) using pie charts.
+                 """)
+
+                 # --- Interactive Filters for Pie Charts ---
+                 st.sidebar.subheader("Filter Pie Chart Data")
+                 all_states = ['All'] + sorted(df_growth_potential['state'].unique())
+                 selected_state_filter_pie = st.sidebar.selectbox("Select State for Pie Chart", all_states, key='growth_state_filter_pie') # Updated key
+
+                 # Removed the transaction type filter selectbox for pie charts
+                 # all_transaction_types = ['All'] + sorted(df_growth_potential['transactiontype'].unique())
+                 # selected_type_filter_pie = st.sidebar.selectbox("Select Transaction Type for Pie Chart", all_transaction_types, key='growth_type_filter_pie') # Updated key
+
+                 # Apply filters (only state filter remains)
+                 filtered_df_pie = df_growth_potential.copy()
+                 if selected_state_filter_pie != 'All':
+                     filtered_df_pie = filtered_df_pie[filtered_df_pie['state'] == selected_state_filter_pie]
+                 # Removed the transaction type filter condition
+                 # if selected_type_filter_pie != 'All':
+                 #     filtered_df_pie = filtered_df_pie[filtered_df_pie['transactiontype'] == selected_type_filter_pie]
+
+                 if filtered_df_pie.empty:
+                     st.info("No data available for the selected filters for pie charts.")
+                 else:
+                     # Determine whether to group by state or transaction type for the pie chart
+                     if selected_state_filter_pie == 'All':
+                         # Group by state when 'All' states are selected (shows distribution across states)
+                         st.subheader("Total Volume Distribution by State (All Transaction Types)")
+                         df_volume_agg = filtered_df_pie.groupby('state', observed=True)['total_volume'].sum().reset_index()
+                         fig_volume_pie = px.pie(
+                             df_volume_agg,
+                             values='total_volume',
+                             names='state',
+                             title="Total Transaction Volume Distribution by State (All Transaction Types)",
+                             hole=.3
+                         )
+                         st.plotly_chart(fig_volume_pie, use_container_width=True)
+
+                         st.subheader("Total Value Distribution by State (All Transaction Types)")
+                         df_value_agg = filtered_df_pie.groupby('state', observed=True)['total_value'].sum().reset_index()
+                         fig_value_pie = px.pie(
+                             df_value_agg,
+                             values='total_value',
+                             names='state',
+                             title="Total Transaction Value Distribution by State (All Transaction Types)",
+                             hole=.3
+                         )
+                         st.plotly_chart(fig_value_pie, use_container_width=True)
+
+                     else: # A specific state is selected
+                         # Group by transaction type when a specific state is selected (shows distribution across categories in that state)
+                         st.subheader(f"Total Volume Distribution by Category in '{selected_state_filter_pie}'")
+                         df_volume_agg = filtered_df_pie.groupby('transactiontype', observed=True)['total_volume'].sum().reset_index()
+                         fig_volume_pie = px.pie(
+                             df_volume_agg,
+                             values='total_volume',
+                             names='transactiontype',
+                             title=f"Total Transaction Volume Distribution in '{selected_state_filter_pie}' by Category",
+                             hole=.3
+                         )
+                         st.plotly_chart(fig_volume_pie, use_container_width=True)
+
+                         st.subheader(f"Total Value Distribution by Category in '{selected_state_filter_pie}'")
+                         df_value_agg = filtered_df_pie.groupby('transactiontype', observed=True)['total_value'].sum().reset_index()
+                         fig_value_pie = px.pie(
+                             df_value_agg,
+                             values='total_value',
+                             names='transactiontype',
+                             title=f"Total Transaction Value Distribution in '{selected_state_filter_pie}' by Category",
+                             hole=.3
+                         )
+                         st.plotly_chart(fig_value_pie, use_container_width=True)
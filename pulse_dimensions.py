@@ -0,0 +1,231 @@
+# pulse_dimensions.py
+# Star schema of the Pulse tables: dimension tables with integer surrogate keys,
+# and the fact tables storing those keys instead of repeating the names.
+#
+#   dim_state             state_id, state (slug), state_name (canonical, see pulse_states.py)
+#   dim_district          district_id, state_id, district
+#   dim_brand             brand_id, brand
+#   dim_transaction_type  transaction_type_id, transactiontype
+#   dim_period            period_id (year * 10 + quarter), year, quarter, period ('2023-Q1')
+#
+# The facts keep year and quarter (the period's natural key, two small integers),
+# because loads, upserts and snapshots are all sliced by (state, year, quarter).
+#
+# data_extraction.py keeps the dimensions in the database and only ever appends
+# to them, so a member keeps its key across incremental loads. The Parquet
+# snapshots keep the names (Parquet stores repeated strings once per file anyway);
+# duckdb_backend.py derives the same schema from them with dimension_sql / fact_view_sql.
+
+import pandas as pd
+
+from pulse_states import canonical_state_name, state_name_sql
+
+
+# Dimension table -> surrogate key column, natural key (lowercase; state_id refers to dim_state),
+#                    and every column of the table in order. In build order: dim_district needs dim_state.
+DIMENSIONS = {
+    'dim_state': {
+        'key': 'state_id',
+        'natural_key': ('state',),
+        'columns': ('state_id', 'state', 'state_name'),
+    },
+    'dim_district': {
+        'key': 'district_id',
+        'natural_key': ('state_id', 'district'),
+        'columns': ('district_id', 'state_id', 'district'),
+    },
+    'dim_brand': {
+        'key': 'brand_id',
+        'natural_key': ('brand',),
+        'columns': ('brand_id', 'brand'),
+    },
+    'dim_transaction_type': {
+        'key': 'transaction_type_id',
+        'natural_key': ('transactiontype',),
+        'columns': ('transaction_type_id', 'transactiontype'),
+    },
+    'dim_period': {
+        'key': 'period_id',
+        'natural_key': ('year', 'quarter'),
+        'columns': ('period_id', 'year', 'quarter', 'period'),
+    },
+}
+
+# Fact table -> dimensions whose natural key it stores as a surrogate key (dim_state first)
+FACT_DIMENSIONS = {
+    'aggregated_transaction': ('dim_state', 'dim_transaction_type'),
+    'aggregated_user': ('dim_state', 'dim_brand'),
+    'aggregated_insurance': ('dim_state',),
+    'map_transactions': ('dim_state', 'dim_district'),
+    'map_users': ('dim_state', 'dim_district'),
+    'map_insurance': ('dim_state', 'dim_district'),
+    'top_transaction_pincode': ('dim_state',),
+    'top_transaction_district': ('dim_state', 'dim_district'),
+    'top_user_pincode': ('dim_state',), # Its District column holds pincodes
+    'top_user_district': ('dim_state', 'dim_district'),
+    'top_insurance_pincode': ('dim_state',),
+}
+
+
+def _dimension_tables(dimension):
+    # Fact tables a dimension's members come from (every fact table has a period)
+    if dimension == 'dim_period':
+        return list(FACT_DIMENSIONS)
+    return [table for table, dimensions in FACT_DIMENSIONS.items() if dimension in dimensions]
+
+
+def _source_columns(dimension):
+    # Natural key columns as stored in the facts before encoding (state instead of state_id)
+    return ['state' if col == 'state_id' else col for col in DIMENSIONS[dimension]['natural_key']]
+
+
+def _column_lookup(df):
+    # The Pulse tables spell their columns 'State' or 'state' - match them by lowercase name
+    return {col.lower(): col for col in df.columns}
+
+
+def empty_dimension(dimension):
+    """A dimension table without members."""
+    return pd.DataFrame(columns=list(DIMENSIONS[dimension]['columns']))
+
+
+# --- Building the Dimensions (pandas) ---
+
+def _new_members(dimension, members, start):
+    # Rows for members not in the dimension yet, keys from start upwards (natural key order)
+    spec = DIMENSIONS[dimension]
+    members = members.sort_values(list(spec['natural_key'])).reset_index(drop=True)
+    if dimension == 'dim_period':
+        members['period_id'] = members['year'] * 10 + members['quarter'] # Same key whenever the period is added
+        members['period'] = members['year'].astype(str) + '-Q' + members['quarter'].astype(str)
+    else:
+        members[spec['key']] = range(start, start + len(members))
+    if dimension == 'dim_state':
+        members['state_name'] = members['state'].map(canonical_state_name)
+    return members[list(spec['columns'])]
+
+
+def update_dimensions(dims, frames):
+    """
+    Adds the members of frames (fact table name -> extracted DataFrame, with names) missing from dims
+    (dimension name -> DataFrame). Existing members keep their keys; new ones get the next free keys.
+    Returns (dims with every dimension, names of the dimensions that got new members).
+    """
+    dims = {dimension: dims.get(dimension, empty_dimension(dimension)) for dimension in DIMENSIONS}
+    changed = []
+    state_ids = None
+    for dimension, spec in DIMENSIONS.items():
+        natural_key = list(spec['natural_key'])
+        parts = []
+        for table_name in _dimension_tables(dimension):
+            df = frames.get(table_name)
+            if df is None or df.empty:
+                continue
+            lookup = _column_lookup(df)
+            part = pd.DataFrame({col: df[lookup[col]].to_numpy(dtype=object) for col in _source_columns(dimension)})
+            if 'state_id' in natural_key:
+                part.insert(0, 'state_id', part.pop('state').map(state_ids))
+            parts.append(part.drop_duplicates())
+        if not parts:
+            continue
+
+        members = pd.concat(parts, ignore_index=True).drop_duplicates()
+        if dimension == 'dim_period':
+            members = members.astype('int64')
+        existing = dims[dimension]
+        if not existing.empty:
+            known = pd.MultiIndex.from_frame(existing[natural_key].astype(members.dtypes.to_dict()))
+            members = members[~pd.MultiIndex.from_frame(members).isin(known)]
+        if not members.empty:
+            start = int(existing[spec['key']].max()) + 1 if not existing.empty else 1
+            added = _new_members(dimension, members, start)
+            dims[dimension] = added if existing.empty else pd.concat([existing, added], ignore_index=True)
+            changed.append(dimension)
+
+        if dimension == 'dim_state':
+            state_ids = dict(zip(dims['dim_state']['state'], dims['dim_state']['state_id']))
+    return dims, changed
+
+
+# --- Encoding the Facts (pandas) ---
+
+def encode_dimension_keys(df, table_name, dims):
+    """
+    Copy of an extracted fact table with each dimension's natural key replaced by its surrogate key
+    (e.g. State -> state_id, District -> district_id), in the same column position.
+    Every member must be in dims already (see update_dimensions).
+    """
+    if table_name not in FACT_DIMENSIONS or df.empty:
+        return df
+    encoded = df.copy()
+    for dimension in FACT_DIMENSIONS[table_name]:
+        spec = DIMENSIONS[dimension]
+        lookup = _column_lookup(encoded)
+        source = [lookup[col] for col in spec['natural_key']]
+        keys = dims[dimension].set_index(list(spec['natural_key']))[spec['key']]
+        if len(source) == 1:
+            values = pd.Index(encoded[source[0]].to_numpy(dtype=object))
+        else:
+            values = pd.MultiIndex.from_arrays([encoded[col].to_numpy(dtype=object) for col in source])
+        ids = keys.reindex(values)
+        if ids.isna().any():
+            raise ValueError(f"{table_name}: {int(ids.isna().sum())} rows have no {spec['key']} in {dimension}")
+        # The key takes the place of the last natural key column (state_id itself stays where it is)
+        position = encoded.columns.get_loc(source[-1])
+        encoded.insert(position, spec['key'], ids.to_numpy().astype('int32'))
+        encoded = encoded.drop(columns=[col for col in source if col != 'state_id'])
+    return encoded
+
+
+def encode_slices(slices, dims):
+    """(state, year, quarter) slices as (state_id, year, quarter). States without a key (never loaded) are left out."""
+    state_ids = dict(zip(dims['dim_state']['state'], dims['dim_state']['state_id']))
+    return {(int(state_ids[state]), year, quarter) for state, year, quarter in slices if state in state_ids}
+
+
+# --- Building the Dimensions (SQL) ---
+
+def dimension_sql(dimension, tables):
+    """
+    SELECT building a dimension from fact tables that still hold the names (e.g. snapshot views).
+    Keys are numbered in natural key order; dim_district joins the dim_state built before it.
+    """
+    spec = DIMENSIONS[dimension]
+    source_columns = ', '.join(_source_columns(dimension))
+    members = ' UNION '.join(f"SELECT DISTINCT {source_columns} FROM {table}" for table in tables)
+    if dimension == 'dim_state':
+        return (f"SELECT ROW_NUMBER() OVER (ORDER BY state) AS state_id, state, {state_name_sql('state')} AS state_name "
+                f"FROM ({members}) AS members")
+    if dimension == 'dim_district':
+        return ("SELECT ROW_NUMBER() OVER (ORDER BY s.state_id, m.district) AS district_id, s.state_id, m.district "
+                f"FROM ({members}) AS m JOIN dim_state s ON s.state = m.state")
+    if dimension == 'dim_period':
+        return ("SELECT year * 10 + quarter AS period_id, year, quarter, CONCAT(year, '-Q', quarter) AS period "
+                f"FROM ({members}) AS members")
+    natural = spec['natural_key'][0]
+    return f"SELECT ROW_NUMBER() OVER (ORDER BY {natural}) AS {spec['key']}, {natural} FROM ({members}) AS members"
+
+
+def fact_view_sql(table_name, source, columns):
+    """
+    SELECT giving a fact table (source, lowercase columns holding the names) with surrogate keys instead,
+    in the same column order as the encoded table data_extraction.py loads.
+    """
+    select_list = []
+    joins = []
+    for col in columns:
+        if col == 'state':
+            select_list.append('s.state_id')
+            joins.append("JOIN dim_state s ON s.state = f.state")
+        elif col == 'district' and 'dim_district' in FACT_DIMENSIONS[table_name]:
+            select_list.append('d.district_id')
+            joins.append("JOIN dim_district d ON d.state_id = s.state_id AND d.district = f.district")
+        elif col == 'brand' and 'dim_brand' in FACT_DIMENSIONS[table_name]:
+            select_list.append('b.brand_id')
+            joins.append("JOIN dim_brand b ON b.brand = f.brand")
+        elif col == 'transactiontype' and 'dim_transaction_type' in FACT_DIMENSIONS[table_name]:
+            select_list.append('t.transaction_type_id')
+            joins.append("JOIN dim_transaction_type t ON t.transactiontype = f.transactiontype")
+        else:
+            select_list.append(f'f."{col}"')
+    return f"SELECT {', '.join(select_list)} FROM {source} f {' '.join(joins)}"
@@ -0,0 +1,75 @@
+# pulse_dtypes.py
+# Dtype contract shared by data_extraction.py (extracted and reloaded tables) and
+# the dashboard (query results, see result_stream.py).
+#
+# Columns are matched by lowercase name, so 'State' (extraction) and 'state' (SQL
+# results) get the same dtype:
+#   dimension columns     -> category (each distinct name stored once)
+#   surrogate keys (_id)  -> int32
+#   year / quarter        -> int16 / int8
+#   counts                -> int64
+#   amounts / percentages -> float64
+# Columns not covered keep the dtype pandas gave them.
+
+import pandas as pd
+
+
+DIMENSION_COLUMNS = ('state', 'district', 'brand', 'transactiontype', 'insurancetype')
+PERIOD_DTYPES = {'year': 'int16', 'quarter': 'int8'}
+COUNT_COLUMNS = ('registeredusers', 'appopens')       # plus every '...count' column
+AMOUNT_COLUMNS = ('percentage',)                      # plus every '...amount' column
+
+
+def column_dtype(column):
+    """Dtype the contract gives a column name ('category', 'int16', ...), or None if it is not covered."""
+    name = column.lower()
+    if name in DIMENSION_COLUMNS:
+        return 'category'
+    if name in PERIOD_DTYPES:
+        return PERIOD_DTYPES[name]
+    if name.endswith('_id'):
+        return 'int32'
+    if name in COUNT_COLUMNS or name.endswith('count'):
+        return 'int64'
+    if name in AMOUNT_COLUMNS or name.endswith('amount'):
+        return 'float64'
+    return None
+
+
+def apply_dtype_contract(df):
+    """Converts the covered columns of df (in place) and returns it. Integer columns with missing values stay float."""
+    for col in df.columns:
+        dtype = column_dtype(col)
+        if dtype is None or df[col].dtype == dtype:
+            continue
+        if dtype == 'category':
+            df[col] = df[col].astype('category')
+        elif dtype.startswith('int'):
+            values = pd.to_numeric(df[col])
+            df[col] = values.astype(dtype) if values.notna().all() else values.astype('float64')
+        else:
+            df[col] = pd.to_numeric(df[col]).astype(dtype)
+    return df
+
+
+def frame_memory(df):
+    """Bytes held by a DataFrame, strings included."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def memory_report(frames, before=None):
+    """
+    One row per table of frames (table name -> DataFrame): rows, memory in MB and bytes per row, largest first.
+    before: table name -> bytes the table took before the contract was applied (adds a before_mb column).
+    """
+    rows = []
+    for table_name, df in frames.items():
+        size = frame_memory(df)
+        row = {'table': table_name, 'rows': len(df), 'memory_mb': round(size / 2**20, 2),
+               'bytes_per_row': round(size / len(df)) if len(df) else 0}
+        if before is not None:
+            row['before_mb'] = round(before.get(table_name, 0) / 2**20, 2)
+        rows.append(row)
+    columns = ['table', 'rows', 'memory_mb', 'bytes_per_row'] + (['before_mb'] if before is not None else [])
+    report = pd.DataFrame(rows, columns=columns)
+    return report.sort_values('memory_mb', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,76 @@
+# pulse_json.py
+# Pluggable JSON decoder for the Pulse quarter files (raw bytes in, dicts/lists out).
+#
+# Decoders:
+#   'orjson'   - orjson.loads (pip install orjson)
+#   'simdjson' - pysimdjson, decoded straight into dicts/lists (pip install pysimdjson)
+#   'json'     - the standard library json module (always available)
+#   'auto'     - the first installed of orjson, simdjson, json
+# Every decoder raises ValueError on invalid JSON, like json.loads.
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError: # Optional dependency
+    orjson = None
+
+try:
+    import simdjson
+except ImportError: # Optional dependency
+    simdjson = None
+
+
+# Decoder used by the extraction. Override with the PULSE_JSON_DECODER environment variable.
+JSON_DECODER = os.environ.get('PULSE_JSON_DECODER', 'auto').lower()
+
+# Fastest first ('auto' picks the first one installed)
+DECODER_ORDER = ('orjson', 'simdjson', 'json')
+
+
+def _decode_orjson(raw):
+    return orjson.loads(raw)
+
+
+_simdjson_parser = None
+
+def _decode_simdjson(raw):
+    # One parser per process, reused for every file (its buffers are kept between calls).
+    # recursive=True builds plain dicts/lists, so the parsers' isinstance checks keep working.
+    global _simdjson_parser
+    if _simdjson_parser is None:
+        _simdjson_parser = simdjson.Parser()
+    return _simdjson_parser.parse(raw, recursive=True)
+
+
+def _decode_json(raw):
+    return json.loads(raw)
+
+
+DECODERS = {
+    'orjson': (lambda: orjson is not None, _decode_orjson),
+    'simdjson': (lambda: simdjson is not None, _decode_simdjson),
+    'json': (lambda: True, _decode_json),
+}
+
+
+def available_decoders():
+    """Names of the installed decoders, fastest first."""
+    return [name for name in DECODER_ORDER if DECODERS[name][0]()]
+
+
+def get_decoder(name=JSON_DECODER):
+    """
+    Returns (decoder name, decode function) for a decoder name or 'auto'.
+    A decoder that is not installed falls back to 'auto' with a warning.
+    """
+    if name == 'auto':
+        name = available_decoders()[0]
+    elif name not in DECODERS:
+        raise ValueError(f"Unknown JSON decoder '{name}'. Expected 'auto' or one of {DECODER_ORDER}.")
+    elif not DECODERS[name][0]():
+        fallback = available_decoders()[0]
+        print(f"Warning: JSON decoder '{name}' is not installed. Using '{fallback}' instead.")
+        name = fallback
+    return name, DECODERS[name][1]
@@ -0,0 +1,129 @@
+# pulse_snapshots.py
+# Columnar snapshots of the extracted Pulse tables, so the database load (or any
+# analysis) can be re-run without parsing the JSON tree again.
+#
+# One Parquet dataset per table, one file per year/quarter partition:
+#   <PULSE_SNAPSHOT_DIR>/<table_name>/year=<year>/quarter=<quarter>/data.parquet
+# Every file holds all of the table's columns (year and quarter included), and is
+# read back memory-mapped. Needs pyarrow; without it snapshots are simply skipped.
+
+import os
+import shutil
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # Optional dependency
+    pa = None
+    pq = None
+
+
+# Root directory of the snapshots. Override with the PULSE_SNAPSHOT_DIR environment variable.
+SNAPSHOT_DIR = os.environ.get('PULSE_SNAPSHOT_DIR', 'pulse_snapshots')
+
+
+def snapshots_available():
+    """True if pyarrow is installed (snapshots can be written and read)."""
+    return pa is not None
+
+
+def _period_columns(df):
+    # The Pulse tables spell year/quarter either 'Year'/'Quarter' or 'year'/'quarter'
+    lookup = {col.lower(): col for col in df.columns}
+    return lookup['year'], lookup['quarter']
+
+
+def _partition_path(table_dir, year, quarter):
+    return os.path.join(table_dir, f"year={int(year)}", f"quarter={int(quarter)}", 'data.parquet')
+
+
+def _write_partition(file_path, df):
+    # Written to a temp file and renamed, so readers never see a half-written partition
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = file_path + '.tmp'
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression='zstd')
+    os.replace(tmp_path, file_path)
+
+
+def snapshot_exists(table_name, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.isdir(os.path.join(snapshot_dir, table_name))
+
+
+def write_table_snapshot(df, table_name, snapshot_dir=SNAPSHOT_DIR):
+    """Replaces the whole snapshot of a table with df (partitioned by year/quarter)."""
+    table_dir = os.path.join(snapshot_dir, table_name)
+    tmp_dir = table_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    if not df.empty:
+        year_col, quarter_col = _period_columns(df)
+        for (year, quarter), partition in df.groupby([year_col, quarter_col], sort=True):
+            _write_partition(_partition_path(tmp_dir, year, quarter), partition)
+    shutil.rmtree(table_dir, ignore_errors=True)
+    os.replace(tmp_dir, table_dir)
+    print(f"Wrote snapshot of {table_name} ({len(df)} rows) to {table_dir}")
+
+
+def update_table_snapshot(df, table_name, slices, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Replaces the given (state, year, quarter) slices of a table's snapshot with the rows in df.
+    Only the year/quarter partitions containing one of the slices are rewritten.
+    """
+    table_dir = os.path.join(snapshot_dir, table_name)
+    states_by_period = {}
+    for state, year, quarter in slices:
+        states_by_period.setdefault((int(year), int(quarter)), set()).add(state)
+
+    if not df.empty:
+        year_col, quarter_col = _period_columns(df)
+        new_rows = {(int(year), int(quarter)): partition
+                    for (year, quarter), partition in df.groupby([year_col, quarter_col], sort=True)}
+    else:
+        new_rows = {}
+
+    for (year, quarter), states in sorted(states_by_period.items()):
+        file_path = _partition_path(table_dir, year, quarter)
+        parts = []
+        if os.path.exists(file_path):
+            existing = pq.read_table(file_path, memory_map=True).to_pandas()
+            state_col = next(col for col in existing.columns if col.lower() == 'state')
+            parts.append(existing[~existing[state_col].isin(states)])
+        if (year, quarter) in new_rows:
+            parts.append(new_rows[(year, quarter)])
+        partition = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        if partition.empty:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        else:
+            _write_partition(file_path, partition)
+    print(f"Updated {len(states_by_period)} year/quarter partitions of the {table_name} snapshot")
+
+
+def read_table_snapshot(table_name, columns=None, periods=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Reads a table's snapshot into a DataFrame (memory-mapped Parquet files).
+    columns: only read these columns. periods: only read these (year, quarter) partitions.
+    Returns None if the table has no snapshot.
+    """
+    table_dir = os.path.join(snapshot_dir, table_name)
+    if not os.path.isdir(table_dir):
+        return None
+    wanted = {(int(year), int(quarter)) for year, quarter in periods} if periods is not None else None
+    tables = []
+    for year_dir in sorted(os.listdir(table_dir)):
+        if not year_dir.startswith('year='):
+            continue
+        for quarter_dir in sorted(os.listdir(os.path.join(table_dir, year_dir))):
+            if not quarter_dir.startswith('quarter='):
+                continue
+            if wanted is not None and (int(year_dir[5:]), int(quarter_dir[8:])) not in wanted:
+                continue # Partition pruning
+            file_path = os.path.join(table_dir, year_dir, quarter_dir, 'data.parquet')
+            if os.path.exists(file_path):
+                tables.append(pq.read_table(file_path, columns=columns, memory_map=True))
+    if not tables:
+        return pd.DataFrame(columns=columns)
+    # Converted per partition: a column that is all null in one partition may have a different Arrow type
+    return pd.concat([table.to_pandas() for table in tables], ignore_index=True)
@@ -0,0 +1,61 @@
+# pulse_states.py
+# Canonical state names, shared by the load (pulse_dimensions.py builds dim_state
+# from them) and the dashboard (map views, see dashboard_core.py).
+#
+# The Pulse files name states by slug ('andaman-&-nicobar-islands'); the dashboard
+# shows, and the India GeoJSON ('st_nm' property) uses, the names below. Resolving
+# them once at load time means the map views never rename states while rendering.
+
+# State slug (as in the Pulse data) -> canonical name (as in the GeoJSON)
+STATE_NAMES = {
+    'andaman-&-nicobar-islands': 'Andaman & Nicobar Island',
+    'andhra-pradesh': 'Andhra Pradesh',
+    'arunachal-pradesh': 'Arunanchal Pradesh',
+    'assam': 'Assam',
+    'bihar': 'Bihar',
+    'chandigarh': 'Chandigarh',
+    'chhattisgarh': 'Chhattisgarh',
+    'dadra-&-nagar-haveli-&-daman-&-diu': 'Dadara & Nagar Havelli', # Note: This might need adjustment based on your GeoJSON
+    'delhi': 'NCT of Delhi',
+    'goa': 'Goa',
+    'gujarat': 'Gujarat',
+    'haryana': 'Haryana',
+    'himachal-pradesh': 'Himachal Pradesh',
+    'jammu-&-kashmir': 'Jammu & Kashmir',
+    'jharkhand': 'Jharkhand',
+    'karnataka': 'Karnataka',
+    'kerala': 'Kerala',
+    'ladakh': 'Ladakh',
+    'lakshadweep': 'Lakshadweep',
+    'madhya-pradesh': 'Madhya Pradesh',
+    'maharashtra': 'Maharashtra',
+    'manipur': 'Manipur',
+    'meghalaya': 'Meghalaya',
+    'mizoram': 'Mizoram',
+    'nagaland': 'Nagaland',
+    'odisha': 'Odisha',
+    'puducherry': 'Puducherry',
+    'punjab': 'Punjab',
+    'rajasthan': 'Rajasthan',
+    'sikkim': 'Sikkim',
+    'tamil-nadu': 'Tamil Nadu',
+    'telangana': 'Telangana',
+    'tripura': 'Tripura',
+    'uttar-pradesh': 'Uttar Pradesh',
+    'uttarakhand': 'Uttarakhand',
+    'west-bengal': 'West Bengal',
+}
+
+# States left off the map views (not drawn consistently in the India GeoJSON)
+MAP_EXCLUDED_STATES = ('Ladakh',)
+
+
+def canonical_state_name(state):
+    """Canonical name of a state slug. Slugs without one keep their own spelling."""
+    return STATE_NAMES.get(state, state)
+
+
+def state_name_sql(column='state'):
+    """SQL expression giving the canonical name of the state slug in column (same result as canonical_state_name)."""
+    cases = ' '.join(f"WHEN '{slug}' THEN '{name}'" for slug, name in STATE_NAMES.items())
+    return f"CASE {column} {cases} ELSE {column} END"
@@ -0,0 +1,92 @@
+# result_stream.py
+# Chunked (streaming) fetch of query results for the dashboard.
+#
+# Rows are read from the database cursor a chunk at a time and every chunk is
+# converted to compact dtypes as soon as it arrives, so a large result never sits
+# in memory as a list of Python tuples plus a wide DataFrame at the same time.
+# Works with a MySQL (mysql.connector) cursor and a DuckDB result; no Streamlit here.
+
+import os
+from decimal import Decimal
+
+import pandas as pd
+
+# Same dtypes as the extracted tables
+from pulse_dtypes import apply_dtype_contract
+
+
+# Rows fetched per round trip. Override with the PHONEPE_FETCH_CHUNK_ROWS environment variable.
+FETCH_CHUNK_ROWS = int(os.environ.get('PHONEPE_FETCH_CHUNK_ROWS', 50000))
+
+# DuckDB returns results in vectors of this many rows
+DUCKDB_VECTOR_ROWS = 2048
+
+# DuckDB result types stored as int64 (SUM of a BIGINT is a HUGEINT, which pandas receives as float64)
+DUCKDB_INTEGER_TYPES = ('HUGEINT', 'BIGINT', 'INTEGER', 'SMALLINT', 'TINYINT',
+                        'UBIGINT', 'UINTEGER', 'USMALLINT', 'UTINYINT')
+
+
+def downcast_chunk(df, integer_columns=()):
+    """
+    Converts one chunk to the dtype contract of pulse_dtypes.py (in place) and returns it.
+    integer_columns: columns the database typed as integers; pandas may have given them float64
+    (e.g. a DuckDB SUM of a BIGINT is a HUGEINT), they are stored as int64 when no value is missing.
+    """
+    for col in df.columns:
+        if df[col].dtype == object:
+            # SUM() results come back from MySQL as Decimal objects: sums of integer columns
+            # (no digits after the point) are stored as int64, fractional ones as float64
+            values = df[col].dropna()
+            if not values.empty and isinstance(values.iloc[0], Decimal):
+                if len(values) == len(df) and all(value.as_tuple().exponent >= 0 for value in values):
+                    df[col] = pd.Series([int(value) for value in values], index=df.index, dtype='int64')
+                else:
+                    df[col] = pd.to_numeric(df[col]).astype('float64')
+        elif col in integer_columns and df[col].dtype == 'float64' and df[col].notna().all():
+            if df[col].abs().max() < 2**63: # A HUGEINT can exceed the int64 range
+                df[col] = df[col].astype('int64')
+    return apply_dtype_contract(df)
+
+
+def concat_chunks(chunks, columns):
+    """Joins the downcast chunks into one DataFrame, keeping the category columns categorical."""
+    if not chunks:
+        return downcast_chunk(pd.DataFrame(columns=columns))
+    if len(chunks) == 1:
+        return chunks[0]
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            # pd.concat only keeps the category dtype if every chunk has the same categories
+            categories = sorted(set().union(*(chunk[col].cat.categories for chunk in chunks)))
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_mysql_cursor(cursor, chunk_rows=FETCH_CHUNK_ROWS):
+    """
+    Reads every row of an executed (unbuffered) mysql.connector cursor, chunk_rows at a time.
+    Returns a DataFrame.
+    """
+    columns = [column[0] for column in cursor.description]
+    chunks = []
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        chunks.append(downcast_chunk(pd.DataFrame(rows, columns=columns)))
+    return concat_chunks(chunks, columns)
+
+
+def read_duckdb_result(result, chunk_rows=FETCH_CHUNK_ROWS):
+    """Reads every row of an executed DuckDB query, about chunk_rows at a time. Returns a DataFrame."""
+    columns = [column[0] for column in result.description]
+    integer_columns = {column[0] for column in result.description if str(column[1]) in DUCKDB_INTEGER_TYPES}
+    vectors = max(1, chunk_rows // DUCKDB_VECTOR_ROWS)
+    chunks = []
+    while True:
+        chunk = result.fetch_df_chunk(vectors)
+        if chunk.empty:
+            break
+        chunks.append(downcast_chunk(chunk, integer_columns))
+    return concat_chunks(chunks, columns)
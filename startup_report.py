@@ -0,0 +1,97 @@
+# startup_report.py
+# Cold-start timings of the dashboard, and lazy imports of the heavy libraries.
+#
+# A new server process (e.g. a freshly autoscaled replica) pays for importing the
+# shared dashboard code, the selected page's module and the libraries that page
+# uses, and then for rendering the page. Each of those is timed the first time it
+# happens in the process and printed to the server log, followed by the time from
+# the first run of app.py to its first rendered page. Streamlit's own start-up
+# (before app.py first runs) is not included. benchmark_startup.py measures the
+# import costs from the command line.
+
+import importlib
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+# Also show the timings in the sidebar. Set the PHONEPE_SHOW_STARTUP_TIMES environment variable to 1.
+SHOW_STARTUP_TIMES = os.environ.get('PHONEPE_SHOW_STARTUP_TIMES', '0') == '1'
+
+# When this module was first imported: the start of the first app.py run in this process
+STARTED = time.perf_counter()
+
+# label -> seconds, in the order they were first timed
+_timings = {}
+
+
+def record_time(label, seconds):
+    """Keeps and prints the first timing under label. Later ones are warm (nothing left to load), so they are ignored."""
+    if label not in _timings:
+        _timings[label] = seconds
+        print(f"[startup] {label}: {seconds * 1000:.0f} ms")
+
+
+def startup_times():
+    """Label -> seconds of everything timed so far in this process."""
+    return dict(_timings)
+
+
+@contextmanager
+def timed(label):
+    """Times the with block under label (only the first time it runs in the process counts)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_time(label, time.perf_counter() - start)
+
+
+# --- Lazy Imports ---
+
+def timed_import(module_name):
+    """Imports a module (e.g. 'plotly.express'), timing the import if it is the first one in the process."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    record_time(f"import {module_name}", time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Stands in for a module until one of its attributes is used, then imports it with timed_import."""
+
+    def __init__(self, module_name):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, name):
+        # Only called for names the proxy itself does not have, i.e. the module's attributes
+        if self._module is None:
+            self._module = timed_import(self._module_name)
+        return getattr(self._module, name)
+
+
+def lazy_import(module_name):
+    """
+    Module placeholder for a library only some views need, e.g. px = lazy_import('plotly.express').
+    Nothing is imported until the first px.<name> is used.
+    """
+    return LazyModule(module_name)
+
+
+# --- Report ---
+
+def report_startup():
+    """
+    Records the time from the first app.py run to its first rendered page (once per process),
+    and shows every timing in the sidebar when SHOW_STARTUP_TIMES is set. Call at the end of app.py.
+    """
+    record_time('first page ready', time.perf_counter() - STARTED)
+    if SHOW_STARTUP_TIMES:
+        import streamlit as st
+        with st.sidebar.expander("Startup times"):
+            for label, seconds in _timings.items():
+                st.text(f"{label}: {seconds * 1000:.0f} ms")
@@ -0,0 +1,169 @@
+# summary_tables.py
+# Pre-aggregated summary tables built from the Pulse tables at load time.
+#
+# The dashboard reads these small, already-grouped tables instead of re-running
+# a GROUP BY over the raw tables on every cache miss. Each summary is a plain
+# SELECT over the loaded tables, so the same definitions can be run by any SQL
+# backend that has those tables (not only MySQL). Building them is up to the loader.
+# They group on the surrogate keys of the fact tables (see pulse_dimensions.py);
+# the dashboard queries (dashboard_core.py) join the dimension tables for the names.
+
+
+# name -> sources: tables the summary is built from (rebuilt when any of them changes)
+#         primary_key: grouping columns
+#         select: the query producing the summary (column aliases are the ones the dashboard reads)
+SUMMARY_TABLES = {
+    # Overall transaction trends by type (SQL_QUERY_AGGREGATED_TRANSACTION)
+    'summary_transaction_by_period_type': {
+        'sources': ('aggregated_transaction',),
+        'primary_key': ('year', 'quarter', 'transaction_type_id'),
+        'select': """
+SELECT
+    year,
+    quarter,
+    transaction_type_id,
+    SUM(transactioncount) AS total_transaction_volume,
+    SUM(transactionamount) AS total_transaction_value
+FROM
+    aggregated_transaction
+GROUP BY
+    year,
+    quarter,
+    transaction_type_id
+""",
+    },
+    # Per-state totals for each quarter (highest/lowest states, top states by quarterly volume)
+    'summary_transaction_by_state_period': {
+        'sources': ('aggregated_transaction',),
+        'primary_key': ('state_id', 'year', 'quarter'),
+        'select': """
+SELECT
+    state_id,
+    year,
+    quarter,
+    SUM(transactioncount) AS total_volume,
+    SUM(transactionamount) AS total_value
+FROM
+    aggregated_transaction
+GROUP BY
+    state_id,
+    year,
+    quarter
+""",
+    },
+    # Transaction totals per state over all quarters (SQL_QUERY_STATE_VARIATIONS)
+    'summary_map_transaction_by_state': {
+        'sources': ('map_transactions',),
+        'primary_key': ('state_id',),
+        'select': """
+SELECT
+    state_id,
+    SUM(transactioncount) AS sumOfTransCount,
+    SUM(transactionamount) AS sumOfTransAmount
+FROM
+    map_transactions
+GROUP BY
+    state_id
+""",
+    },
+    # Users per state over all quarters (SQL_QUERY_TOP_10_USERS sums the brand device counts)
+    'summary_users_by_state': {
+        'sources': ('aggregated_user',),
+        'primary_key': ('state_id',),
+        'select': """
+SELECT
+    state_id,
+    SUM(count) AS total_registered_users
+FROM
+    aggregated_user
+GROUP BY
+    state_id
+""",
+    },
+    # Registered users per brand (SQL_QUERY_TOTAL_REGISTERED_USERS_BY_BRAND, SQL_QUERY_LOWEST_BRANDS)
+    'summary_users_by_brand': {
+        'sources': ('aggregated_user',),
+        'primary_key': ('brand_id',),
+        'select': """
+SELECT
+    brand_id,
+    SUM(registeredusers) AS total_registered_users
+FROM
+    aggregated_user
+GROUP BY
+    brand_id
+""",
+    },
+    # Insurance transactions per state and year (SQL_QUERY_YEARLY_INSURANCE_COUNT_BY_STATE)
+    'summary_insurance_by_state_year': {
+        'sources': ('aggregated_insurance',),
+        'primary_key': ('state_id', 'year'),
+        'select': """
+SELECT
+    state_id,
+    year,
+    SUM(insurancecount) AS total_year_volume
+FROM
+    aggregated_insurance
+GROUP BY
+    state_id,
+    year
+""",
+    },
+    # Engagement metrics per state and quarter (app open and transaction-to-user rankings).
+    # Registered users and app opens come from map_users (one row per district); aggregated_user repeats the
+    # state's registered users on every brand row, so joining it to transactions would count them many times.
+    'summary_state_engagement': {
+        'sources': ('map_users', 'aggregated_transaction'),
+        'primary_key': ('state_id', 'year', 'quarter'),
+        'select': """
+SELECT
+    mu.state_id,
+    mu.year,
+    mu.quarter,
+    mu.registered_users,
+    mu.app_opens,
+    tx.transaction_count,
+    mu.app_opens / NULLIF(mu.registered_users, 0) AS app_open_rate_per_user,
+    tx.transaction_count / NULLIF(mu.registered_users, 0) AS transaction_to_user_ratio
+FROM
+    (SELECT state_id, year, quarter, SUM(registeredusers) AS registered_users, SUM(appopens) AS app_opens
+     FROM map_users
+     GROUP BY state_id, year, quarter) mu
+LEFT JOIN
+    (SELECT state_id, year, quarter, SUM(transactioncount) AS transaction_count
+     FROM aggregated_transaction
+     GROUP BY state_id, year, quarter) tx
+    ON tx.state_id = mu.state_id AND tx.year = mu.year AND tx.quarter = mu.quarter
+""",
+    },
+    # Every dropdown value in one small table (years, quarters, states, transaction types, districts per state).
+    # value is text for every dimension (names, not keys); state is '' except for districts.
+    'summary_dimension_values': {
+        'sources': ('aggregated_transaction', 'map_transactions', 'dim_state', 'dim_district', 'dim_transaction_type'),
+        'primary_key': ('dimension', 'state', 'value'),
+        'select': """
+SELECT 'year' AS dimension, '' AS state, CONCAT(year, '') AS value FROM aggregated_transaction GROUP BY year
+UNION ALL
+SELECT 'quarter', '', CONCAT(quarter, '') FROM aggregated_transaction GROUP BY quarter
+UNION ALL
+SELECT 'state', '', s.state
+FROM (SELECT state_id FROM aggregated_transaction GROUP BY state_id) a JOIN dim_state s ON s.state_id = a.state_id
+UNION ALL
+SELECT 'transactiontype', '', t.transactiontype
+FROM (SELECT transaction_type_id FROM aggregated_transaction GROUP BY transaction_type_id) a
+JOIN dim_transaction_type t ON t.transaction_type_id = a.transaction_type_id
+UNION ALL
+SELECT 'district', s.state, d.district
+FROM (SELECT district_id FROM map_transactions GROUP BY district_id) m
+JOIN dim_district d ON d.district_id = m.district_id
+JOIN dim_state s ON s.state_id = d.state_id
+""",
+    },
+}
+
+
+def summaries_to_refresh(changed_tables, existing_tables):
+    """Names of the summary tables built from any of changed_tables, plus those that do not exist yet."""
+    return [name for name, summary in SUMMARY_TABLES.items()
+            if name not in existing_tables or set(summary['sources']) & set(changed_tables)]
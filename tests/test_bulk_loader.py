@@ -0,0 +1,124 @@
+# test_bulk_loader.py
+# The LOAD DATA and executemany paths, against a fake DB-API connection that records what it was sent
+# (the CSV content is read back before load_infile removes the temp file).
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sqlalchemy') # bulk_loader creates its engine with SQLAlchemy
+
+from bulk_loader import bulk_append, load_executemany, load_infile
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        path = re.search(r"LOCAL INFILE '([^']*)'", sql).group(1)
+        with open(path, encoding='utf-8', newline='') as f:
+            self.connection.infile_chunks.append(f.read())
+        self.connection.infile_paths.append(path)
+        if len(self.connection.infile_chunks) in self.connection.failing_infile_calls:
+            raise RuntimeError("local_infile is disabled")
+
+    def executemany(self, sql, rows):
+        self.connection.inserts.append((sql, rows))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Stands in for a SQLAlchemy connection: bulk_loader only uses conn.connection.cursor()."""
+
+    def __init__(self, failing_infile_calls=()):
+        self.connection = self
+        self.failing_infile_calls = set(failing_infile_calls)
+        self.infile_chunks = []
+        self.infile_paths = []
+        self.inserts = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def test_infile_csv_escapes_backslashes_nulls_and_quotes():
+    df = pd.DataFrame({
+        'State': pd.Categorical(['goa', 'a\\b']),
+        'District': ['north, goa', None],
+        'Name': ['say "hi"', 'c:\\temp'],
+        'TransactionCount': [1.0, np.nan],
+    })
+    conn = FakeConnection()
+    load_infile(conn, df, 'map_transactions')
+    assert conn.infile_chunks == [
+        'goa,"north, goa","say ""hi""",1.0\n'
+        'a\\\\b,\\N,c:\\\\temp,\\N\n'
+    ]
+    # The frame itself is not changed
+    assert df['Name'].tolist() == ['say "hi"', 'c:\\temp']
+    assert not any(os.path.exists(path) for path in conn.infile_paths)
+
+
+def test_infile_categorical_without_backslashes():
+    # One category maps one-to-one, so Series.map gives a categorical: the check must not call any() on it
+    df = pd.DataFrame({'State': pd.Categorical(['goa', 'goa']), 'Year': [2021, 2022]})
+    conn = FakeConnection()
+    load_infile(conn, df, 'aggregated_user')
+    assert conn.infile_chunks == ['goa,2021\ngoa,2022\n']
+
+
+def test_infile_sends_one_file_per_chunk():
+    df = pd.DataFrame({'Year': [2018, 2019, 2020, 2021, 2022], 'Quarter': [1, 2, 3, 4, 1]})
+    conn = FakeConnection()
+    load_infile(conn, df, 'aggregated_user', chunk_rows=2)
+    assert conn.infile_chunks == ['2018,1\n2019,2\n', '2020,3\n2021,4\n', '2022,1\n']
+    assert not any(os.path.exists(path) for path in conn.infile_paths)
+
+
+def test_executemany_sends_python_values_in_chunks():
+    df = pd.DataFrame({
+        'State': pd.Categorical(['goa', 'assam', 'goa']),
+        'Year': np.array([2021, 2021, 2022], dtype='int16'),
+        'TransactionAmount': [1.5, np.nan, 3.0],
+    })
+    conn = FakeConnection()
+    load_executemany(conn, df, 'aggregated_transaction', chunk_rows=2)
+    sql = "INSERT INTO `aggregated_transaction` (`State`, `Year`, `TransactionAmount`) VALUES (%s, %s, %s)"
+    assert conn.inserts == [
+        (sql, [('goa', 2021, 1.5), ('assam', 2021, None)]),
+        (sql, [('goa', 2022, 3.0)]),
+    ]
+    # The driver can't bind numpy scalars
+    assert all(type(value) in (str, int, float, type(None))
+               for _, rows in conn.inserts for row in rows for value in row)
+
+
+def test_failed_first_infile_chunk_falls_back_to_executemany():
+    df = pd.DataFrame({'Year': [2018, 2019, 2020], 'Quarter': [1, 2, 3]})
+    conn = FakeConnection(failing_infile_calls={1})
+    assert bulk_append(conn, df, 'aggregated_user', method='infile', chunk_rows=2) == 'executemany'
+    # Every row goes through executemany, none twice
+    assert [row for _, rows in conn.inserts for row in rows] == [(2018, 1), (2019, 2), (2020, 3)]
+
+
+def test_failed_later_infile_chunk_is_raised():
+    # Rows of the first chunk are already in: falling back would load them twice
+    df = pd.DataFrame({'Year': [2018, 2019, 2020], 'Quarter': [1, 2, 3]})
+    conn = FakeConnection(failing_infile_calls={2})
+    with pytest.raises(RuntimeError):
+        bulk_append(conn, df, 'aggregated_user', method='infile', chunk_rows=2)
+    assert conn.inserts == []
+
+
+def test_bulk_append_checks_the_method_and_skips_empty_frames():
+    with pytest.raises(ValueError):
+        bulk_append(FakeConnection(), pd.DataFrame({'Year': [2018]}), 'aggregated_user', method='bcp')
+    conn = FakeConnection()
+    assert bulk_append(conn, pd.DataFrame(columns=['Year']), 'aggregated_user', method='infile') == 'infile'
+    assert conn.infile_chunks == [] and conn.inserts == []
@@ -0,0 +1,102 @@
+# test_etl_manifest.py
+# extract_changed_datasets decides which (state, year, quarter) slices get deleted and reloaded.
+
+import json
+import os
+
+import extraction_engine
+from etl_manifest import extract_changed_datasets
+
+
+def parse_value(state, year, quarter_file, quarter_path, data):
+    # Module-level, like the real parsers: one row per file
+    return {'State': [state], 'Year': [int(year)], 'Quarter': [int(quarter_file.split('.')[0])], 'Value': [data['value']]}
+
+
+def write_quarter(root, state, year, quarter, value):
+    year_dir = os.path.join(root, state, str(year))
+    os.makedirs(year_dir, exist_ok=True)
+    path = os.path.join(year_dir, f"{quarter}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'value': value}, f)
+    return path
+
+
+def run(root, manifest):
+    # One dataset, in-process (workers=1); returns its result and the manifest saved after the load
+    result = extract_changed_datasets({'table': (root, parse_value)}, manifest, workers=1)['table']
+    return result, {'table': result['files']}
+
+
+def test_first_run_loads_every_file(tmp_path):
+    root = str(tmp_path)
+    write_quarter(root, 'delhi', 2021, 1, 10)
+    write_quarter(root, 'goa', 2021, 2, 20)
+    result, _ = run(root, {})
+    assert result['changed_slices'] == {('delhi', 2021, 1), ('goa', 2021, 2)}
+    assert result['removed_slices'] == set()
+    assert sorted(result['columns']['Value']) == [10, 20]
+    assert all(entry['sha256'] for entry in result['files'].values())
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    root = str(tmp_path)
+    write_quarter(root, 'delhi', 2021, 1, 10)
+    _, manifest = run(root, {})
+    result, _ = run(root, manifest)
+    assert result['changed_slices'] == set()
+    assert result['columns'] == {}
+
+
+def test_touch_only_does_not_reload(tmp_path):
+    root = str(tmp_path)
+    path = write_quarter(root, 'delhi', 2021, 1, 10)
+    _, manifest = run(root, {})
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime + 100, stat.st_mtime + 100))
+    result, saved = run(root, manifest)
+    assert result['changed_slices'] == set()
+    assert result['columns'] == {}
+    # The new mtime is recorded, so the next run skips the file without hashing it
+    assert saved['table'][path]['mtime'] == os.stat(path).st_mtime
+
+
+def test_content_change_reloads_its_slice(tmp_path):
+    root = str(tmp_path)
+    write_quarter(root, 'delhi', 2021, 1, 10)
+    write_quarter(root, 'goa', 2021, 1, 20)
+    _, manifest = run(root, {})
+    write_quarter(root, 'delhi', 2021, 1, 999999) # Different size as well as content
+    result, _ = run(root, manifest)
+    assert result['changed_slices'] == {('delhi', 2021, 1)}
+    assert result['columns']['Value'] == [999999]
+
+
+def test_removed_file_removes_its_slice(tmp_path):
+    root = str(tmp_path)
+    write_quarter(root, 'delhi', 2021, 1, 10)
+    path = write_quarter(root, 'delhi', 2021, 2, 20)
+    _, manifest = run(root, {})
+    os.remove(path)
+    result, saved = run(root, manifest)
+    assert result['removed_slices'] == {('delhi', 2021, 2)}
+    assert result['changed_slices'] == set()
+    assert path not in saved['table']
+
+
+def test_unreadable_file_is_retried(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    path = write_quarter(root, 'delhi', 2021, 1, 10)
+    _, manifest = run(root, {})
+    write_quarter(root, 'delhi', 2021, 1, 999999)
+    new_path = write_quarter(root, 'goa', 2021, 1, 20)
+    with monkeypatch.context() as patch:
+        patch.setattr(extraction_engine, 'read_quarter_file', lambda *args, **kwargs: (None, None))
+        result, saved = run(root, manifest)
+    # Neither slice is touched, and neither file is recorded as loaded
+    assert result['changed_slices'] == set()
+    assert saved['table'][path] == manifest['table'][path]
+    assert new_path not in saved['table']
+
+    result, _ = run(root, saved)
+    assert result['changed_slices'] == {('delhi', 2021, 1), ('goa', 2021, 1)}
@@ -0,0 +1,153 @@
+# test_fact_store.py
+# The in-memory store answers the extreme-states, district and insurance views in place of SQL,
+# so its results must have the columns, order and shares of the queries it replaces.
+
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fact_store import (DISTRICT_BENCHMARK_COLUMNS, build_fact_store, district_benchmark,
+                        insurance_states, period_extremes, rank_extremes, state_totals)
+
+
+# Columns of SQL_QUERY_STATE_TOTALS_BY_PERIOD and SQL_QUERY_DISTRICT_VS_STATE (dashboard_core.py)
+STATE_TOTALS_COLUMNS = ['state', 'total_volume', 'total_value']
+DISTRICT_VS_STATE_COLUMNS = ['state', 'district', 'district_total_volume', 'district_total_value',
+                             'state_total_volume', 'state_total_value', 'volume_share', 'value_share']
+
+
+@pytest.fixture
+def store():
+    dim_state = pd.DataFrame({'state_id': [1, 2, 3], 'state': ['goa', 'assam', 'delhi']})
+    dim_district = pd.DataFrame({'district_id': [1, 2, 3], 'district': ['north goa', 'south goa', 'kamrup']})
+    # Two transaction types per state and quarter, summed by the store
+    transactions = pd.DataFrame({
+        'state_id': [1, 1, 2, 2, 1, 3],
+        'year': [2021, 2021, 2021, 2021, 2021, 2021],
+        'quarter': [1, 1, 1, 1, 2, 2],
+        'transactioncount': [10, 30, 5, 5, 7, 0],
+        'transactionamount': [100.0, 300.0, 80.0, 20.0, 70.0, 0.0],
+    })
+    district_transactions = pd.DataFrame({
+        'state_id': [1, 1, 2, 3],
+        'year': [2021, 2021, 2021, 2021],
+        'quarter': [1, 1, 1, 2],
+        'district_id': [1, 2, 3, 3],
+        'transactioncount': [10, 30, 10, 0],
+        'transactionamount': [300.0, 100.0, 100.0, 0.0],
+    })
+    insurance = pd.DataFrame({
+        'state_id': [1, 2, 3, 2],
+        'year': [2021, 2021, 2021, 2021],
+        'quarter': [1, 1, 1, 2],
+        'insurancecount': [4, 9, 4, 1],
+    })
+    return build_fact_store(transactions, district_transactions, insurance, dim_state, dim_district)
+
+
+def test_state_totals_match_the_period_query(store):
+    totals = state_totals(store, 2021, 1)
+    assert list(totals.columns) == STATE_TOTALS_COLUMNS
+    assert totals.values.tolist() == [['goa', 40, 400.0], ['assam', 10, 100.0]]
+
+
+def test_period_extremes(store):
+    extremes = period_extremes(store, 2021, 1)
+    assert extremes[('total_volume', 'highest')]['state'].tolist() == ['goa']
+    assert extremes[('total_volume', 'lowest')]['state'].tolist() == ['assam']
+    assert extremes[('total_value', 'lowest')].values.tolist() == [['assam', 10, 100.0]]
+
+
+def test_district_benchmark_matches_the_district_vs_state_query(store):
+    benchmark = district_benchmark(store, 2021, 1, 'goa')
+    assert DISTRICT_BENCHMARK_COLUMNS == DISTRICT_VS_STATE_COLUMNS
+    assert list(benchmark.columns) == DISTRICT_VS_STATE_COLUMNS
+    # ORDER BY district_total_volume DESC
+    assert benchmark['district'].tolist() == ['south goa', 'north goa']
+    assert benchmark[['state_total_volume', 'state_total_value']].values.tolist() == [[40, 400.0], [40, 400.0]]
+    assert benchmark['volume_share'].tolist() == [0.75, 0.25]
+    assert benchmark['value_share'].tolist() == [0.25, 0.75]
+
+
+def test_district_benchmark_with_zero_state_totals_has_no_shares(store):
+    # NULLIF(total, 0) in the query: the share is NULL, not a division by zero
+    benchmark = district_benchmark(store, 2021, 2, 'delhi')
+    assert benchmark['district'].tolist() == ['kamrup']
+    assert benchmark['volume_share'].isna().all()
+    assert benchmark['value_share'].isna().all()
+
+
+@pytest.mark.parametrize('year, quarter, state', [
+    (2021, 1, 'kerala'), # State never loaded
+    (2020, 1, 'goa'),    # Period not loaded
+    (2021, 2, 'assam'),  # State without data in that period
+])
+def test_district_benchmark_without_data_is_empty(store, year, quarter, state):
+    benchmark = district_benchmark(store, year, quarter, state)
+    assert benchmark.empty
+    assert list(benchmark.columns) == DISTRICT_VS_STATE_COLUMNS
+
+
+def test_insurance_states_highest_first(store):
+    states = insurance_states(store, 2021, 1)
+    assert list(states.columns) == ['state', 'total_insurance_transactions']
+    # Ties keep the state_id order, as the stable sort does
+    assert states.values.tolist() == [['assam', 9], ['goa', 4], ['delhi', 4]]
+
+
+def test_unknown_period_is_empty(store):
+    assert state_totals(store, 2019, 4).empty
+    assert list(state_totals(store, 2019, 4).columns) == STATE_TOTALS_COLUMNS
+    assert insurance_states(store, 2019, 4).empty
+    assert period_extremes(store, 2019, 4)[('total_volume', 'highest')].empty
+
+
+# --- rank_extremes (extreme states, app open rates, user ratios) ---
+
+def test_rank_extremes_ties_keep_the_first_row():
+    totals = pd.DataFrame({'state': ['goa', 'assam', 'delhi', 'bihar'], 'total_volume': [5, 9, 9, 5]})
+    extremes = rank_extremes(totals, ['total_volume'])
+    assert extremes[('total_volume', 'highest')]['state'].tolist() == ['assam']
+    assert extremes[('total_volume', 'lowest')]['state'].tolist() == ['goa']
+    # A tie at the cut-off still gives exactly n rows
+    extremes = rank_extremes(totals, ['total_volume'], n=3)
+    assert extremes[('total_volume', 'highest')]['state'].tolist() == ['assam', 'delhi', 'goa']
+    assert extremes[('total_volume', 'lowest')]['state'].tolist() == ['goa', 'bihar', 'assam']
+
+
+def test_rank_extremes_n_larger_than_the_rows():
+    totals = pd.DataFrame({'state': ['goa', 'assam'], 'app_open_rate_per_user': [0.5, 2.0]})
+    extremes = rank_extremes(totals, ['app_open_rate_per_user'], n=5)
+    assert extremes[('app_open_rate_per_user', 'highest')]['state'].tolist() == ['assam', 'goa']
+    assert extremes[('app_open_rate_per_user', 'lowest')]['state'].tolist() == ['goa', 'assam']
+    assert extremes[('app_open_rate_per_user', 'highest')].index.tolist() == [0, 1]
+
+
+def test_rank_extremes_leaves_out_missing_ratios():
+    # A ratio over a zero denominator is NULL (NULLIF in the query): None from MySQL, NaN from DuckDB
+    totals = pd.DataFrame({
+        'state': ['goa', 'assam', 'delhi', 'bihar'],
+        'total_registered_users': [0, 10, 0, 4],
+        'transaction_to_user_ratio': [None, Decimal('2.5'), np.nan, Decimal('0.5')],
+    })
+    extremes = rank_extremes(totals, ['transaction_to_user_ratio'], n=5)
+    highest = extremes[('transaction_to_user_ratio', 'highest')]
+    assert highest['state'].tolist() == ['assam', 'bihar']
+    assert highest['transaction_to_user_ratio'].tolist() == [2.5, 0.5]
+    assert list(highest.columns) == list(totals.columns)
+    assert extremes[('transaction_to_user_ratio', 'lowest')]['state'].tolist() == ['bihar', 'assam']
+    # The input is left as it was
+    assert totals['transaction_to_user_ratio'].isna().sum() == 2
+
+
+def test_rank_extremes_every_ratio_missing_or_nothing_loaded():
+    totals = pd.DataFrame({'state': ['goa'], 'app_open_rate_per_user': [None]})
+    extremes = rank_extremes(totals, ['app_open_rate_per_user'])
+    assert extremes[('app_open_rate_per_user', 'highest')].empty
+    # A failed load gives an empty frame without the metric column
+    extremes = rank_extremes(pd.DataFrame(), ['total_volume', 'total_value'])
+    assert set(extremes) == {('total_volume', 'highest'), ('total_volume', 'lowest'),
+                             ('total_value', 'highest'), ('total_value', 'lowest')}
+    assert all(frame.empty for frame in extremes.values())
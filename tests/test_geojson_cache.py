@@ -0,0 +1,41 @@
+# test_geojson_cache.py
+# Douglas-Peucker simplification of the state borders.
+
+from geojson_cache import MIN_RING_POINTS, simplify_line, simplify_ring
+
+
+def test_simplify_line_drops_points_within_tolerance():
+    line = [[0, 0], [1, 0.001], [2, -0.001], [3, 0]]
+    assert simplify_line(line, 0.01) == [[0, 0], [3, 0]]
+
+
+def test_simplify_line_keeps_points_beyond_tolerance():
+    line = [[0, 0], [1, 1], [2, 0], [3, 0.001], [4, 0]]
+    assert simplify_line(line, 0.01) == [[0, 0], [1, 1], [2, 0], [4, 0]]
+
+
+def test_simplify_line_keeps_short_lines_and_zero_tolerance():
+    assert simplify_line([[0, 0], [1, 1]], 1) == [[0, 0], [1, 1]]
+    line = [[0, 0], [1, 0.001], [2, 0]]
+    assert simplify_line(line, 0) == line
+
+
+def test_simplify_line_handles_long_lines():
+    # Iterative, so a long border does not hit the recursion limit
+    line = [[i, (i % 2) * 0.5] for i in range(1500)]
+    assert simplify_line(line, 0.1) == line
+
+
+def test_simplify_ring_stays_closed():
+    ring = [[0, 0], [1, 0.0001], [2, 0], [2, 2], [1, 2.0001], [0, 2], [0, 0]]
+    simplified = simplify_ring(ring, 0.01, 3)
+    assert simplified == [[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]
+    assert simplified[0] == simplified[-1]
+
+
+def test_simplify_ring_keeps_small_islands():
+    # A tiny triangle would collapse below MIN_RING_POINTS when simplified - it is only quantized
+    ring = [[0, 0], [0.0004, 0.0001], [0.0001, 0.0004], [0, 0]]
+    simplified = simplify_ring(ring, 0.01, 4)
+    assert len(simplified) >= MIN_RING_POINTS
+    assert simplified == [[0, 0], [0.0004, 0.0001], [0.0001, 0.0004], [0, 0]]
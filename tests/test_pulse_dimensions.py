@@ -0,0 +1,90 @@
+# test_pulse_dimensions.py
+# Surrogate keys must stay the same across incremental loads, also when the dimensions are read back from MySQL.
+
+import pandas as pd
+import pytest
+
+from pulse_dimensions import DIMENSIONS, update_dimensions, encode_dimension_keys, encode_slices
+
+
+def transactions(rows):
+    # aggregated_transaction as extracted (names, mixed-case columns)
+    return pd.DataFrame(rows, columns=['State', 'Year', 'Quarter', 'TransactionType', 'TransactionCount', 'TransactionAmount'])
+
+
+def districts(rows):
+    return pd.DataFrame(rows, columns=['State', 'Year', 'Quarter', 'District', 'TransactionCount', 'TransactionAmount'])
+
+
+def read_back(dims):
+    # What pd.read_sql gives for the dimension tables: int64 keys, object strings
+    return {name: pd.DataFrame({col: df[col].astype('int64') if col.endswith('_id') or col in ('year', 'quarter')
+                                else df[col].astype(object) for col in df.columns})
+            for name, df in dims.items()}
+
+
+FIRST = {
+    'aggregated_transaction': transactions([('goa', 2021, 1, 'Recharge', 5, 1.5), ('delhi', 2021, 1, 'Recharge', 7, 2.5)]),
+    'map_transactions': districts([('goa', 2021, 1, 'north goa', 3, 1.0), ('delhi', 2021, 1, 'new delhi', 4, 2.0)]),
+}
+SECOND = {
+    'aggregated_transaction': transactions([('assam', 2021, 2, 'Merchant', 1, 0.5), ('goa', 2021, 2, 'Recharge', 2, 0.5)]),
+    'map_transactions': districts([('assam', 2021, 2, 'kamrup', 1, 0.5), ('goa', 2021, 2, 'north goa', 1, 0.5)]),
+}
+
+
+def test_first_load_numbers_members_in_order():
+    dims, changed = update_dimensions({}, FIRST)
+    assert set(changed) == {'dim_state', 'dim_district', 'dim_transaction_type', 'dim_period'}
+    assert dims['dim_state'][['state_id', 'state']].values.tolist() == [[1, 'delhi'], [2, 'goa']]
+    assert dims['dim_state']['state_name'].tolist() == ['NCT of Delhi', 'Goa']
+    assert dims['dim_period'][['period_id', 'period']].values.tolist() == [[20211, '2021-Q1']]
+    assert dims['dim_brand'].empty
+
+
+def test_keys_are_stable_across_runs():
+    first, _ = update_dimensions({}, FIRST)
+    second, changed = update_dimensions(read_back(first), SECOND)
+    # Existing members keep their keys, new ones are appended after the largest key
+    assert second['dim_state'][['state_id', 'state']].values.tolist() == [[1, 'delhi'], [2, 'goa'], [3, 'assam']]
+    assert second['dim_district'][['district_id', 'state_id', 'district']].values.tolist() == [
+        [1, 1, 'new delhi'], [2, 2, 'north goa'], [3, 3, 'kamrup']]
+    assert set(changed) == {'dim_state', 'dim_district', 'dim_transaction_type', 'dim_period'}
+
+    # Loading the same data again adds nothing
+    third, changed = update_dimensions(read_back(second), SECOND)
+    assert changed == []
+    assert third['dim_state']['state_id'].tolist() == [1, 2, 3]
+
+
+def test_encode_with_int64_ids_read_back():
+    first, _ = update_dimensions({}, FIRST)
+    dims, _ = update_dimensions(read_back(first), SECOND)
+    dims = read_back(dims)
+    encoded = encode_dimension_keys(SECOND['map_transactions'], 'map_transactions', dims)
+    assert list(encoded.columns) == ['state_id', 'Year', 'Quarter', 'district_id', 'TransactionCount', 'TransactionAmount']
+    assert encoded[['state_id', 'district_id']].values.tolist() == [[3, 3], [2, 2]]
+    assert encoded['state_id'].dtype == 'int32'
+    # The extracted frame itself is left as it was
+    assert 'State' in SECOND['map_transactions'].columns
+
+    encoded = encode_dimension_keys(SECOND['aggregated_transaction'], 'aggregated_transaction', dims)
+    names = dims['dim_transaction_type'].set_index('transaction_type_id')['transactiontype']
+    assert encoded['transaction_type_id'].map(names).tolist() == ['Merchant', 'Recharge']
+
+
+def test_encode_rejects_unknown_members():
+    dims, _ = update_dimensions({}, FIRST)
+    with pytest.raises(ValueError):
+        encode_dimension_keys(SECOND['aggregated_transaction'], 'aggregated_transaction', dims)
+
+
+def test_encode_slices_leaves_out_states_never_loaded():
+    dims, _ = update_dimensions({}, FIRST)
+    assert encode_slices({('goa', 2021, 1), ('assam', 2021, 1)}, read_back(dims)) == {(2, 2021, 1)}
+
+
+def test_every_dimension_column_is_built():
+    dims, _ = update_dimensions({}, FIRST)
+    for name, spec in DIMENSIONS.items():
+        assert list(dims[name].columns) == list(spec['columns'])
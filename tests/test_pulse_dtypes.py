@@ -0,0 +1,58 @@
+# test_pulse_dtypes.py
+# The dtype contract shared by the ETL (extracted columns) and the dashboard (lowercase SQL result columns).
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pulse_dtypes import apply_dtype_contract, column_dtype
+
+
+@pytest.mark.parametrize('column, dtype', [
+    ('State', 'category'), ('state', 'category'), ('TransactionType', 'category'), ('insurancetype', 'category'),
+    ('Year', 'int16'), ('year', 'int16'),
+    ('Quarter', 'int8'), ('QUARTER', 'int8'),
+    ('state_id', 'int32'), ('District_ID', 'int32'), ('transaction_type_id', 'int32'),
+    ('TransactionCount', 'int64'), ('insurancecount', 'int64'), ('RegisteredUsers', 'int64'), ('appOpens', 'int64'),
+    ('TransactionAmount', 'float64'), ('Percentage', 'float64'),
+    ('pincode', None), ('total_value', None), ('state_name', None),
+])
+def test_column_dtype_matches_names_case_insensitively(column, dtype):
+    assert column_dtype(column) == dtype
+
+
+def test_apply_dtype_contract_converts_the_covered_columns():
+    df = pd.DataFrame({
+        'State': ['goa', 'assam', 'goa'],
+        'Year': [2021, 2021, 2022],
+        'Quarter': [1, 2, 3],
+        'state_id': [1, 2, 1],
+        'TransactionCount': ['5', '6', '7'], # e.g. parsed as text
+        'TransactionAmount': [1, 2, 3],
+        'pincode': ['403001', '781001', '403002'],
+    })
+    result = apply_dtype_contract(df)
+    assert result is df # In place
+    assert isinstance(df['State'].dtype, pd.CategoricalDtype)
+    assert df.dtypes[['Year', 'Quarter', 'state_id', 'TransactionCount', 'TransactionAmount']].tolist() == [
+        np.dtype('int16'), np.dtype('int8'), np.dtype('int32'), np.dtype('int64'), np.dtype('float64')]
+    assert df['TransactionCount'].tolist() == [5, 6, 7]
+    assert df['pincode'].tolist() == ['403001', '781001', '403002'] # Not covered, left as it was
+
+
+def test_integer_columns_with_missing_values_stay_float():
+    df = apply_dtype_contract(pd.DataFrame({
+        'RegisteredUsers': [10, None],
+        'year': [2021.0, np.nan],
+        'district_id': [3, None],
+    }))
+    assert df.dtypes.tolist() == [np.dtype('float64')] * 3
+    assert df['RegisteredUsers'].iloc[0] == 10
+    assert df['RegisteredUsers'].isna().iloc[1]
+
+
+def test_apply_dtype_contract_on_an_empty_frame():
+    df = apply_dtype_contract(pd.DataFrame(columns=['state', 'year', 'transactioncount']))
+    assert isinstance(df['state'].dtype, pd.CategoricalDtype)
+    assert df['year'].dtype == 'int16'
+    assert df['transactioncount'].dtype == 'int64'
@@ -0,0 +1,83 @@
+# test_pulse_snapshots.py
+# Partial snapshot rewrites must only touch the affected year/quarter partitions, and reads must prune
+# partitions and columns.
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow') # Snapshots are optional and need pyarrow
+
+from pulse_snapshots import read_table_snapshot, update_table_snapshot, write_table_snapshot
+
+
+TABLE = 'map_transactions'
+OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+
+def rows(df):
+    return sorted(map(tuple, df[['State', 'Year', 'Quarter', 'TransactionCount']].values.tolist()))
+
+
+def partition_file(snapshot_dir, year, quarter):
+    return os.path.join(snapshot_dir, TABLE, f"year={year}", f"quarter={quarter}", 'data.parquet')
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    df = pd.DataFrame({
+        'State': ['goa', 'assam', 'goa', 'assam', 'goa'],
+        'Year': [2021, 2021, 2021, 2021, 2022],
+        'Quarter': [1, 1, 2, 2, 1],
+        'TransactionCount': [1, 2, 3, 4, 5],
+    })
+    write_table_snapshot(df, TABLE, snapshot_dir=str(tmp_path))
+    # Marks every partition as old, so a rewrite shows up as a new modification time
+    for year, quarter in [(2021, 1), (2021, 2), (2022, 1)]:
+        os.utime(partition_file(str(tmp_path), year, quarter), ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+    return str(tmp_path)
+
+
+def test_update_only_rewrites_the_affected_partitions(snapshot_dir):
+    new_rows = pd.DataFrame({'State': ['goa'], 'Year': [2021], 'Quarter': [1], 'TransactionCount': [10]})
+    update_table_snapshot(new_rows, TABLE, {('goa', 2021, 1)}, snapshot_dir=snapshot_dir)
+    assert os.stat(partition_file(snapshot_dir, 2021, 1)).st_mtime_ns != OLD_MTIME_NS
+    assert os.stat(partition_file(snapshot_dir, 2021, 2)).st_mtime_ns == OLD_MTIME_NS
+    assert os.stat(partition_file(snapshot_dir, 2022, 1)).st_mtime_ns == OLD_MTIME_NS
+    # Only goa's rows of 2021 Q1 are replaced, assam's stay
+    assert rows(read_table_snapshot(TABLE, snapshot_dir=snapshot_dir)) == [
+        ('assam', 2021, 1, 2), ('assam', 2021, 2, 4), ('goa', 2021, 1, 10), ('goa', 2021, 2, 3), ('goa', 2022, 1, 5)]
+
+
+def test_update_removes_slices_and_empty_partitions(snapshot_dir):
+    # A removed file: its slice is listed but has no new rows
+    empty = pd.DataFrame(columns=['State', 'Year', 'Quarter', 'TransactionCount'])
+    update_table_snapshot(empty, TABLE, {('assam', 2021, 2), ('goa', 2022, 1)}, snapshot_dir=snapshot_dir)
+    assert not os.path.exists(partition_file(snapshot_dir, 2022, 1))
+    assert rows(read_table_snapshot(TABLE, snapshot_dir=snapshot_dir)) == [
+        ('assam', 2021, 1, 2), ('goa', 2021, 1, 1), ('goa', 2021, 2, 3)]
+
+
+def test_update_adds_new_partitions(snapshot_dir):
+    new_rows = pd.DataFrame({'State': ['goa'], 'Year': [2022], 'Quarter': [2], 'TransactionCount': [7]})
+    update_table_snapshot(new_rows, TABLE, {('goa', 2022, 2)}, snapshot_dir=snapshot_dir)
+    assert os.stat(partition_file(snapshot_dir, 2021, 1)).st_mtime_ns == OLD_MTIME_NS
+    assert rows(read_table_snapshot(TABLE, periods=[(2022, 2)], snapshot_dir=snapshot_dir)) == [('goa', 2022, 2, 7)]
+
+
+def test_read_prunes_periods_and_columns(snapshot_dir):
+    df = read_table_snapshot(TABLE, periods=[(2021, 2), (2022, 1)], snapshot_dir=snapshot_dir)
+    assert rows(df) == [('assam', 2021, 2, 4), ('goa', 2021, 2, 3), ('goa', 2022, 1, 5)]
+
+    df = read_table_snapshot(TABLE, columns=['State', 'TransactionCount'], periods=[(2021, 1)],
+                             snapshot_dir=snapshot_dir)
+    assert list(df.columns) == ['State', 'TransactionCount']
+    assert sorted(df.values.tolist()) == [['assam', 2], ['goa', 1]]
+
+
+def test_read_without_matching_partitions_or_snapshot(snapshot_dir):
+    df = read_table_snapshot(TABLE, columns=['State'], periods=[(2019, 1)], snapshot_dir=snapshot_dir)
+    assert df.empty
+    assert list(df.columns) == ['State']
+    assert read_table_snapshot('aggregated_user', snapshot_dir=snapshot_dir) is None
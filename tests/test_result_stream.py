@@ -0,0 +1,56 @@
+# test_result_stream.py
+# Chunked query results must come out as one frame with the same dtypes as a single fetch.
+
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from result_stream import concat_chunks, downcast_chunk, read_duckdb_result
+
+
+def test_concat_chunks_merges_categories():
+    first = downcast_chunk(pd.DataFrame({'state': ['goa', 'delhi'], 'transactioncount': [1, 2]}))
+    second = downcast_chunk(pd.DataFrame({'state': ['assam', 'goa'], 'transactioncount': [3, 4]}))
+    merged = concat_chunks([first, second], ['state', 'transactioncount'])
+    assert isinstance(merged['state'].dtype, pd.CategoricalDtype)
+    assert list(merged['state'].cat.categories) == ['assam', 'delhi', 'goa']
+    assert merged['state'].tolist() == ['goa', 'delhi', 'assam', 'goa']
+    assert merged['transactioncount'].tolist() == [1, 2, 3, 4]
+    assert merged.index.tolist() == [0, 1, 2, 3]
+
+
+def test_concat_chunks_without_rows_keeps_the_columns():
+    empty = concat_chunks([], ['state', 'transactioncount'])
+    assert empty.empty
+    assert list(empty.columns) == ['state', 'transactioncount']
+
+
+def test_concat_chunks_single_chunk_is_returned_as_is():
+    chunk = downcast_chunk(pd.DataFrame({'state': ['goa']}))
+    assert concat_chunks([chunk], ['state']) is chunk
+
+
+def test_integral_decimal_sums_become_int64():
+    chunk = pd.DataFrame({'total_volume': [Decimal('1234567'), Decimal('8')],
+                          'total_value': [Decimal('12.50'), Decimal('3.25')]})
+    downcast_chunk(chunk)
+    assert chunk['total_volume'].dtype == 'int64'
+    assert chunk['total_volume'].tolist() == [1234567, 8]
+    assert chunk['total_value'].dtype == 'float64'
+
+
+def test_decimal_sums_with_missing_values_stay_float():
+    chunk = downcast_chunk(pd.DataFrame({'total_volume': [Decimal('5'), None]}))
+    assert chunk['total_volume'].dtype == 'float64'
+
+
+def test_duckdb_integer_sums_become_int64():
+    duckdb = pytest.importorskip('duckdb')
+    result = duckdb.connect().execute(
+        "SELECT SUM(x) AS total_volume, SUM(x * 0.5) AS total_value, COUNT(*) AS n FROM range(5) t(x)")
+    df = read_duckdb_result(result)
+    assert df['total_volume'].dtype == 'int64'
+    assert df['total_volume'].tolist() == [10]
+    assert df['total_value'].dtype == 'float64'
+    assert df['n'].dtype == 'int64'
@@ -0,0 +1,46 @@
+# test_summary_tables.py
+# Which summaries are rebuilt after a load: those built from a changed table, plus any that do not exist yet.
+
+import re
+
+import pytest
+
+from summary_tables import SUMMARY_TABLES, summaries_to_refresh
+
+
+ALL_SUMMARIES = list(SUMMARY_TABLES)
+
+
+@pytest.mark.parametrize('changed_tables, expected', [
+    (['aggregated_transaction'], ['summary_transaction_by_period_type', 'summary_transaction_by_state_period',
+                                  'summary_state_engagement', 'summary_dimension_values']),
+    (['map_users'], ['summary_state_engagement']),
+    (['map_transactions'], ['summary_map_transaction_by_state', 'summary_dimension_values']),
+    (['aggregated_user'], ['summary_users_by_state', 'summary_users_by_brand']),
+    (['aggregated_insurance'], ['summary_insurance_by_state_year']),
+    (['dim_district'], ['summary_dimension_values']),
+    (['top_user_pincode'], []), # No summary reads it
+    ([], []),
+])
+def test_only_summaries_of_changed_tables_are_rebuilt(changed_tables, expected):
+    assert summaries_to_refresh(changed_tables, ALL_SUMMARIES) == expected
+
+
+def test_state_engagement_depends_on_users_and_transactions():
+    assert set(SUMMARY_TABLES['summary_state_engagement']['sources']) == {'map_users', 'aggregated_transaction'}
+    for changed in ('map_users', 'aggregated_transaction'):
+        assert 'summary_state_engagement' in summaries_to_refresh({changed}, ALL_SUMMARIES)
+
+
+def test_missing_summaries_are_built_even_without_changes():
+    existing = [name for name in ALL_SUMMARIES if name != 'summary_users_by_brand']
+    assert summaries_to_refresh([], existing) == ['summary_users_by_brand']
+    assert summaries_to_refresh([], []) == ALL_SUMMARIES
+
+
+def test_sources_list_every_table_a_summary_reads():
+    # A table read but missing from 'sources' would leave the summary stale after that table is reloaded
+    for name, summary in SUMMARY_TABLES.items():
+        select = re.sub(r'--[^\n]*', '', summary['select'])
+        tables = set(re.findall(r'\b(?:FROM|JOIN)\s+`?(\w+)', select, re.IGNORECASE))
+        assert tables == set(summary['sources']), name